@@ -0,0 +1,7 @@
+"""引擎热点路径的基准测试(python -m benchmarks)"""
+from .corpus import Corpus, build_corpus
+from .suite import BENCHMARKS, Benchmark, benchmark
+from .runner import Comparison, compare, load, measure, run, save
+
+__all__ = ['Corpus', 'build_corpus', 'BENCHMARKS', 'Benchmark', 'benchmark', 'Comparison', 'compare',
+           'load', 'measure', 'run', 'save']
@@ -0,0 +1,71 @@
+"""命令行
+
+    python -m benchmarks list
+    python -m benchmarks run [-o result.json] [--kind micro] [hand. yaku.judge ...]
+    python -m benchmarks compare baseline.json result.json [--threshold 0.1]
+    python -m benchmarks run --baseline baseline.json   # 运行后直接与基线比较
+
+compare(以及指定 --baseline 的 run)在出现退化时以状态码1退出。
+"""
+import argparse
+import sys
+from typing import List, Optional
+from . import runner
+from .suite import BENCHMARKS
+
+
+def _report(baseline, current, args) -> int:
+    for warning in runner.warn_config(baseline, current):
+        print(f"注意: {warning}", file=sys.stderr)
+    comparisons = runner.compare(baseline, current, args.threshold, args.metric)
+    print(runner.format_comparison(comparisons))
+    return 1 if any(item.status == 'regression' for item in comparisons) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="引擎热点路径的基准测试")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="列出所有项目")
+
+    run = commands.add_parser('run', help="运行基准测试")
+    run.add_argument('names', nargs='*', help="项目名称或以 . 结尾的前缀")
+    run.add_argument('--kind', choices=('micro', 'macro'))
+    run.add_argument('-o', '--output', help="结果 JSON 的路径")
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--corpus-size', type=int, default=200)
+    run.add_argument('--repeat', type=int, default=5)
+    run.add_argument('--min-time', type=float, default=0.2, help="每次采样的最短时间(秒)")
+    run.add_argument('--baseline', help="运行后与该基线比较")
+
+    compare = commands.add_parser('compare', help="与基线比较")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+
+    for command in (run, compare):
+        command.add_argument('--threshold', type=float, default=runner.DEFAULT_THRESHOLD,
+                             help="视为退化的相对变慢比例")
+        command.add_argument('--metric', choices=runner.METRICS, default='median_ns')
+
+    args = parser.parse_args(argv)
+    if args.command == 'list':
+        for name, item in BENCHMARKS.items():
+            print(f"{name:<20} {item.kind:<6} {item.description}")
+        return 0
+    if args.command == 'compare':
+        return _report(runner.load(args.baseline), runner.load(args.current), args)
+
+    try:
+        result = runner.run(args.names or None, args.kind, args.seed, args.corpus_size, args.repeat,
+                            args.min_time, progress=runner.print_progress)
+    except KeyError as error:
+        parser.error(error.args[0])
+    if args.output:
+        runner.save(result, args.output)
+    if args.baseline:
+        return _report(runner.load(args.baseline), result, args)
+    print(runner.format_results(result))
+    return 0
+
+
+sys.exit(main())
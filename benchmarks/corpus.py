@@ -0,0 +1,162 @@
+"""基准测试用的手牌语料
+
+所有手牌都从按种子洗好的牌山中取出,同一种子在任何机器上得到相同的语料:
+    random   牌山顶部的14张(向听数计算)
+    winning  从牌山中按顺序凑出的和牌型(4面子1雀头,约1/8为七对子)
+    tenpai   和牌型去掉和牌张后的13张(听牌检查)
+"""
+import random
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from src.core.tile import Tile, TileSuit
+from src.core.wall import Wall
+
+_TILES: Optional[List[Tile]] = None
+
+
+def _all_tiles() -> List[Tile]:
+    """未洗牌的136张牌(与 Wall 相同的组成,含赤五)"""
+    global _TILES
+    if _TILES is None:
+        _TILES = Wall()._create_tiles()
+    return _TILES
+
+
+def seeded_wall(rng: random.Random) -> List[Tile]:
+    """按 rng 洗好的一副牌山"""
+    tiles = list(_all_tiles())
+    rng.shuffle(tiles)
+    return tiles
+
+
+def wall_orders(count: int, seed: int) -> List[List[Tile]]:
+    """count 副按种子洗好的牌山(用作 Game.wall_order)"""
+    rng = random.Random(seed)
+    return [seeded_wall(rng) for _ in range(count)]
+
+
+def _take(pool: List[Tile], suit: TileSuit, value: int) -> Optional[Tile]:
+    """从牌池中取出第一张指定花色与数值的牌(不区分赤五)"""
+    for index, tile in enumerate(pool):
+        if tile.suit == suit and tile.value == value:
+            return pool.pop(index)
+    return None
+
+
+def _take_all(pool: List[Tile], wanted: List[Tuple[TileSuit, int]]) -> Optional[List[Tile]]:
+    """取出 wanted 中的全部牌,缺任何一张时不改变牌池"""
+    taken = []
+    for suit, value in wanted:
+        tile = _take(pool, suit, value)
+        if tile is None:
+            pool.extend(taken)
+            return None
+        taken.append(tile)
+    return taken
+
+
+def _take_group(pool: List[Tile], rng: random.Random) -> Optional[List[Tile]]:
+    """以牌池中靠前的牌为起点取出一个面子(顺子或刻子)"""
+    for index in range(len(pool)):
+        tile = pool.pop(index)
+        suit, value = tile.suit, tile.value
+        shapes = [[(suit, value), (suit, value)]]
+        if suit != TileSuit.HONOR and value <= 7:
+            sequence = [(suit, value + 1), (suit, value + 2)]
+            shapes.insert(0 if rng.random() < 0.75 else 1, sequence)
+        for shape in shapes:
+            rest = _take_all(pool, shape)
+            if rest is not None:
+                return [tile] + rest
+        pool.insert(index, tile)
+    return None
+
+
+def _take_pair(pool: List[Tile], exclude: Tuple = ()) -> Optional[List[Tile]]:
+    for index in range(len(pool)):
+        tile = pool[index]
+        if (tile.suit, tile.value) in exclude:
+            continue
+        pool.pop(index)
+        other = _take(pool, tile.suit, tile.value)
+        if other is not None:
+            return [tile, other]
+        pool.insert(index, tile)
+    return None
+
+
+def winning_hand(wall: List[Tile], rng: random.Random) -> Optional[List[Tile]]:
+    """从牌山中按顺序凑出14张的和牌型(凑不出时为 None)"""
+    pool = list(wall)
+    hand: List[Tile] = []
+    if rng.random() < 0.125:  # 七对子
+        kinds = ()
+        for _ in range(7):
+            pair = _take_pair(pool, kinds)
+            if pair is None:
+                return None
+            kinds += ((pair[0].suit, pair[0].value),)
+            hand += pair
+        return hand
+    for _ in range(4):
+        group = _take_group(pool, rng)
+        if group is None:
+            return None
+        hand += group
+    pair = _take_pair(pool)
+    if pair is None:
+        return None
+    return hand + pair
+
+
+@dataclass
+class WinningHand:
+    """和牌语料"""
+    tiles: List[Tile]        # 含和牌张的14张
+    win_tile: Tile
+    is_tsumo: bool
+    is_riichi: bool
+    dora_tiles: List[Tile]   # 宝牌指示牌
+
+    @property
+    def tenpai(self) -> List[Tile]:
+        """去掉和牌张后的13张"""
+        tiles = list(self.tiles)
+        tiles.remove(self.win_tile)
+        return tiles
+
+
+@dataclass
+class Corpus:
+    """由种子决定的手牌语料"""
+    seed: int
+    size: int
+    random: List[List[Tile]] = field(default_factory=list)
+    winning: List[WinningHand] = field(default_factory=list)
+
+    @property
+    def tenpai(self) -> List[List[Tile]]:
+        return [hand.tenpai for hand in self.winning]
+
+
+def build_corpus(seed: int = 0, size: int = 200) -> Corpus:
+    """生成语料
+
+    Args:
+        seed: 随机种子
+        size: 每类手牌的数量
+    """
+    rng = random.Random(seed)
+    corpus = Corpus(seed, size)
+    while len(corpus.random) < size:
+        corpus.random.append(seeded_wall(rng)[:14])
+    while len(corpus.winning) < size:
+        wall = seeded_wall(rng)
+        tiles = winning_hand(wall, rng)
+        if tiles is None:
+            continue
+        used = set(map(id, tiles))
+        indicator = next(tile for tile in reversed(wall) if id(tile) not in used)
+        corpus.winning.append(WinningHand(tiles, rng.choice(tiles), rng.random() < 0.5,
+                                          rng.random() < 0.5, [indicator]))
+    return corpus
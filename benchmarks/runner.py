@@ -0,0 +1,277 @@
+"""运行基准测试并与基线比较
+
+结果为 JSON:
+    {"version": 1, "metadata": {...机器与版本信息}, "config": {...},
+     "benchmarks": {名称: {"kind", "ops", "loops", "repeat", "min_ns", "median_ns", ...}}}
+其中耗时均为每次操作的纳秒数。
+"""
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+from .corpus import build_corpus
+from .suite import BENCHMARKS
+
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.10  # 变慢超过10%视为退化
+METRICS = ('min_ns', 'median_ns', 'mean_ns')
+
+
+def _git_revision() -> Optional[str]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True,
+                                text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def metadata() -> Dict[str, object]:
+    """机器与软件版本信息"""
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'hostname': platform.node(),
+        'mahjong': _package_version('mahjong'),
+        'git_revision': _git_revision(),
+    }
+
+
+def _time(run: Callable[[], int], loops: int) -> tuple:
+    """连续执行 loops 轮,返回 (耗时纳秒, 操作数)"""
+    ops = 0
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            ops += run()
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        if enabled:
+            gc.enable()
+    return elapsed, ops
+
+
+def measure(run: Callable[[], int], repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    """测量每次操作的耗时
+
+    先预热一轮,再把每次采样的轮数加倍到耗时不少于 min_time 秒,
+    然后采样 repeat 次。
+
+    Args:
+        run: 执行一轮并返回操作数的函数
+        repeat: 采样次数
+        min_time: 每次采样的最短时间(秒)
+    """
+    run()
+    loops = 1
+    while True:
+        elapsed, ops = _time(run, loops)
+        if elapsed >= min_time * 1e9 or loops >= 1 << 20:
+            break
+        loops *= 2
+    samples = [elapsed / ops]
+    for _ in range(repeat - 1):
+        elapsed, ops = _time(run, loops)
+        samples.append(elapsed / ops)
+    median = statistics.median(samples)
+    return {
+        'ops': ops,
+        'loops': loops,
+        'repeat': repeat,
+        'min_ns': min(samples),
+        'median_ns': median,
+        'mean_ns': statistics.fmean(samples),
+        'stdev_ns': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'ops_per_sec': 1e9 / median if median else 0.0,
+    }
+
+
+def select(names: Optional[Iterable[str]] = None, kind: Optional[str] = None) -> List[str]:
+    """按名称(可为前缀,如 'hand.')与类型选择项目"""
+    selected = []
+    for name, item in BENCHMARKS.items():
+        if kind is not None and item.kind != kind:
+            continue
+        if names and not any(name == wanted or (wanted.endswith('.') and name.startswith(wanted))
+                             for wanted in names):
+            continue
+        selected.append(name)
+    return selected
+
+
+def run(names: Optional[Iterable[str]] = None, kind: Optional[str] = None, seed: int = 0,
+        corpus_size: int = 200, repeat: int = 5, min_time: float = 0.2,
+        progress: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, object]:
+    """运行基准测试
+
+    Args:
+        names: 项目名称或前缀,为 None 时运行全部
+        kind: 'micro' 或 'macro',为 None 时不限
+        seed: 语料与对局的随机种子
+        corpus_size: 每类手牌的数量
+        repeat: 每个项目的采样次数
+        min_time: 每次采样的最短时间(秒)
+        progress: 每完成一个项目时的回调 (名称, 结果)
+
+    Raises:
+        KeyError: 指定的项目不存在
+    """
+    if names:
+        unknown = [name for name in names if not select([name])]
+        if unknown:
+            raise KeyError(f"未知的基准测试: {', '.join(unknown)}")
+    corpus = build_corpus(seed, corpus_size)
+    results = {}
+    for name in select(names, kind):
+        item = BENCHMARKS[name]
+        result = {'kind': item.kind, **measure(item.setup(corpus), repeat, min_time)}
+        results[name] = result
+        if progress is not None:
+            progress(name, result)
+    return {
+        'version': FORMAT_VERSION,
+        'metadata': metadata(),
+        'config': {'seed': seed, 'corpus_size': corpus_size, 'repeat': repeat, 'min_time': min_time},
+        'benchmarks': results,
+    }
+
+
+def save(result: Dict[str, object], path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def load(path: str) -> Dict[str, object]:
+    """读取结果文件
+
+    Raises:
+        ValueError: 格式版本不支持
+    """
+    with open(path, encoding='utf-8') as f:
+        result = json.load(f)
+    if result.get('version') != FORMAT_VERSION:
+        raise ValueError(f"不支持的结果格式版本: {result.get('version')}")
+    return result
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """单个项目的比较结果"""
+    name: str
+    baseline_ns: Optional[float]
+    current_ns: Optional[float]
+    status: str  # 'regression' | 'improvement' | 'same' | 'missing' | 'new'
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """当前/基线,大于1表示变慢"""
+        if not self.baseline_ns or self.current_ns is None:
+            return None
+        return self.current_ns / self.baseline_ns
+
+
+def compare(baseline: Dict[str, object], current: Dict[str, object], threshold: float = DEFAULT_THRESHOLD,
+            metric: str = 'median_ns') -> List[Comparison]:
+    """与基线比较
+
+    Args:
+        baseline: 基线结果
+        current: 当前结果
+        threshold: 相对变化超过该比例时视为退化或改进
+        metric: 比较的统计量
+    """
+    if metric not in METRICS:
+        raise ValueError(f"未知的统计量: {metric}")
+    old, new = baseline['benchmarks'], current['benchmarks']
+    comparisons = []
+    for name in list(old) + [name for name in new if name not in old]:
+        before = old[name][metric] if name in old else None
+        after = new[name][metric] if name in new else None
+        if after is None:
+            status = 'missing'
+        elif before is None:
+            status = 'new'
+        elif after > before * (1 + threshold):
+            status = 'regression'
+        elif after < before * (1 - threshold):
+            status = 'improvement'
+        else:
+            status = 'same'
+        comparisons.append(Comparison(name, before, after, status))
+    return comparisons
+
+
+def _format_ns(value: Optional[float]) -> str:
+    if value is None:
+        return '-'
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('us', 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f}{unit}"
+    return f"{value:.0f}ns"
+
+
+def format_results(result: Dict[str, object]) -> str:
+    """结果的文本表格"""
+    rows = [("项目", "类型", "中位数", "最小", "标准差", "次/秒")]
+    for name, item in result['benchmarks'].items():
+        rows.append((name, item['kind'], _format_ns(item['median_ns']), _format_ns(item['min_ns']),
+                     _format_ns(item['stdev_ns']), f"{item['ops_per_sec']:.0f}"))
+    return _table(rows)
+
+
+def format_comparison(comparisons: List[Comparison]) -> str:
+    """比较结果的文本表格"""
+    labels = {'regression': '退化', 'improvement': '改进', 'same': '', 'missing': '缺失', 'new': '新增'}
+    rows = [("项目", "基线", "当前", "变化", "")]
+    for item in comparisons:
+        change = f"{(item.ratio - 1) * 100:+.1f}%" if item.ratio is not None else '-'
+        rows.append((item.name, _format_ns(item.baseline_ns), _format_ns(item.current_ns), change,
+                     labels[item.status]))
+    return _table(rows)
+
+
+def _table(rows: List[tuple]) -> str:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(cell.ljust(width) if i == 0 else cell.rjust(width)
+                               for i, (cell, width) in enumerate(zip(row, widths))).rstrip()
+                     for row in rows)
+
+
+def warn_config(baseline: Dict[str, object], current: Dict[str, object]) -> List[str]:
+    """两次运行的配置或环境不同时的提示"""
+    warnings = []
+    for key in ('seed', 'corpus_size'):
+        if baseline['config'].get(key) != current['config'].get(key):
+            warnings.append(f"语料配置不同: {key} {baseline['config'].get(key)} -> {current['config'].get(key)}")
+    for key in ('python', 'implementation', 'machine', 'hostname'):
+        if baseline['metadata'].get(key) != current['metadata'].get(key):
+            warnings.append(f"运行环境不同: {key} {baseline['metadata'].get(key)} -> {current['metadata'].get(key)}")
+    return warnings
+
+
+def print_progress(name: str, result: Dict) -> None:
+    print(f"{name}: {_format_ns(result['median_ns'])}", file=sys.stderr)
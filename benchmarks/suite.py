@@ -0,0 +1,206 @@
+"""基准测试项目
+
+每个项目是一个 setup 函数: 接收语料,返回执行一轮的函数,该函数返回
+本轮包含的操作数(结果按每次操作的耗时报告)。
+    micro  引擎热点函数,每轮遍历一遍语料
+    macro  无界面的完整对局,每轮一局(round)或连续8局(hanchan),
+           以及新进程导入引擎并创建对局(工作进程的启动开销)
+"""
+import os
+import random
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+from src.core.game import Game, play_round
+from src.core.hand import Hand
+from src.core.tile import Tile
+from src.core.utils.converter import TileConverter
+from src.core.wall import Wall
+from src.core.yaku.judger import YakuJudger
+from .corpus import Corpus, wall_orders
+
+Run = Callable[[], int]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    kind: str  # 'micro' 或 'macro'
+    setup: Callable[[Corpus], Run]
+    description: str
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, kind: str = 'micro'):
+    """注册基准测试项目(说明取自函数文档)"""
+    def register(setup: Callable[[Corpus], Run]) -> Callable[[Corpus], Run]:
+        BENCHMARKS[name] = Benchmark(name, kind, setup, (setup.__doc__ or '').strip())
+        return setup
+    return register
+
+
+def _hand(tiles: List[Tile]) -> Hand:
+    hand = Hand()
+    for tile in tiles:
+        hand.add_tile(tile)
+    return hand
+
+
+@benchmark('tile.construct')
+def tile_construct(corpus: Corpus) -> Run:
+    """构造一副136张牌"""
+    specs = [(tile.suit, tile.value, tile.is_red) for tile in Wall()._create_tiles()]
+
+    def run() -> int:
+        for suit, value, is_red in specs:
+            Tile(suit, value, is_red)
+        return len(specs)
+    return run
+
+
+@benchmark('convert.34')
+def convert_34(corpus: Corpus) -> Run:
+    """14张手牌 -> 34编码数组"""
+    convert = Hand()._convert_tiles_to_34_array
+    hands = corpus.random
+
+    def run() -> int:
+        for tiles in hands:
+            convert(tiles)
+        return len(hands)
+    return run
+
+
+@benchmark('convert.136')
+def convert_136(corpus: Corpus) -> Run:
+    """14张手牌 -> 136编码数组(含赤五)"""
+    convert = TileConverter.to_136_array
+    hands = corpus.random
+
+    def run() -> int:
+        for tiles in hands:
+            convert(tiles, True)
+        return len(hands)
+    return run
+
+
+@benchmark('hand.shanten')
+def hand_shanten(corpus: Corpus) -> Run:
+    """随机14张的向听数"""
+    hands = [_hand(tiles) for tiles in corpus.random]
+
+    def run() -> int:
+        for hand in hands:
+            hand.get_shanten()
+        return len(hands)
+    return run
+
+
+@benchmark('hand.check_win')
+def hand_check_win(corpus: Corpus) -> Run:
+    """听牌手牌加和牌张的和牌判定"""
+    cases = [(_hand(hand.tenpai), hand.win_tile) for hand in corpus.winning]
+
+    def run() -> int:
+        for hand, tile in cases:
+            hand.check_win(tile)
+        return len(cases)
+    return run
+
+
+@benchmark('hand.check_tenpai')
+def hand_check_tenpai(corpus: Corpus) -> Run:
+    """听牌手牌的进张检查"""
+    hands = [_hand(tiles) for tiles in corpus.tenpai]
+
+    def run() -> int:
+        for hand in hands:
+            hand.check_tenpai()
+        return len(hands)
+    return run
+
+
+@benchmark('yaku.judge')
+def yaku_judge(corpus: Corpus) -> Run:
+    """和牌型的役种与点数判定"""
+    judge = YakuJudger().judge
+    hands = corpus.winning
+
+    def run() -> int:
+        for hand in hands:
+            judge(tiles=hand.tiles, win_tile=hand.win_tile, is_tsumo=hand.is_tsumo,
+                  is_riichi=hand.is_riichi, dora_tiles=hand.dora_tiles)
+        return len(hands)
+    return run
+
+
+@benchmark('wall.initialize')
+def wall_initialize(corpus: Corpus) -> Run:
+    """按预设牌序初始化牌山"""
+    wall = Wall()
+    orders = wall_orders(16, corpus.seed)
+
+    def run() -> int:
+        for order in orders:
+            wall.initialize(order)
+        return len(orders)
+    return run
+
+
+@benchmark('wall.draw')
+def wall_draw(corpus: Corpus) -> Run:
+    """摸完整个牌山(每轮含一次按预设牌序的初始化)"""
+    wall = Wall()
+    order = wall_orders(1, corpus.seed)[0]
+
+    def run() -> int:
+        wall.initialize(order)
+        draws = 0
+        while wall.draw() is not None:
+            draws += 1
+        return draws
+    return run
+
+
+def _games(corpus: Corpus, rounds: int) -> Run:
+    orders = wall_orders(rounds, corpus.seed)
+
+    def run() -> int:
+        random.seed(corpus.seed)
+        rng = random.Random(corpus.seed)
+        game = Game()
+        for order in orders:
+            game.wall_order = order
+            play_round(game, rng=rng)
+        return 1
+    return run
+
+
+@benchmark('game.round', kind='macro')
+def game_round(corpus: Corpus) -> Run:
+    """无界面的一局(随机合法操作)"""
+    return _games(corpus, 1)
+
+
+@benchmark('game.hanchan', kind='macro')
+def game_hanchan(corpus: Corpus) -> Run:
+    """无界面的连续8局(东南两圈的最少局数)"""
+    return _games(corpus, 8)
+
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SPAWN = "from src.core.game import Game; Game()"
+
+
+@benchmark('import.spawn', kind='macro')
+def import_spawn(corpus: Corpus) -> Run:
+    """新的解释器进程导入引擎并创建对局(含解释器启动)"""
+    command = [sys.executable, '-c', _SPAWN]
+
+    def run() -> int:
+        subprocess.run(command, cwd=_ROOT, check=True)
+        return 1
+    return run
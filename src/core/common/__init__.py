@@ -1,3 +1,4 @@
 from .wind import Wind
+from .config import Config, FrozenDict, get_config, reload_config
 
-__all__ = ['Wind']
\ No newline at end of file
+__all__ = ['Wind', 'Config', 'FrozenDict', 'get_config', 'reload_config']
@@ -0,0 +1,247 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 配置文件的查找目录(按顺序,先找到的优先)
+_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+CONFIG_DIRS: Tuple[Path, ...] = (
+    _ROOT / 'src' / 'assets' / 'config',
+    _ROOT / 'assets' / 'config',
+)
+
+# game.json 的默认值
+GAME_DEFAULTS: Dict[str, Any] = {
+    "version": "1.0.0",
+    "player_count": 4,
+    "initial_points": 25000,
+    "min_points": 0,
+    "riichi_cost": 1000,
+    "honba_value": 300,
+    "uma_values": [15000, 5000, -5000, -15000],
+    "round_names": ["東", "南", "西", "北"],
+    "max_rounds": 4,
+    "max_games_per_round": 4,
+    "min_players": 4,
+    "max_players": 4,
+    "wall_tiles": 136,
+    "dead_wall_tiles": 14,
+    "hand_size": 13,
+    "dora_indicators": 1,
+    "max_dora_indicators": 5,
+    "max_kan": 4,
+    "rules": {
+        "has_aka_dora": True,
+        "has_open_tanyao": True,
+        "has_double_yakuman": False,
+    },
+}
+
+# rule.json 的默认值
+RULE_DEFAULTS: Dict[str, Any] = {
+    "tile_count": 136,
+    "min_points": 1,
+    "max_points": 13,
+}
+
+
+class FrozenDict(dict):
+    """只读字典: 加载后的配置在所有使用者之间共享,禁止修改"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("配置为只读,请通过 reload_config() 重新加载")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __hash__(self):
+        return hash(tuple(sorted(self.items())))
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """递归冻结: dict -> FrozenDict, list -> tuple"""
+    if isinstance(value, Mapping):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class Config:
+    """进程级共享的只读配置
+
+    通过 get_config() 获取,首次访问时读取并校验配置文件,之后不再访问文件系统。
+    """
+
+    __slots__ = ('game', 'rule', 'sources')
+
+    def __init__(self, game: Mapping[str, Any], rule: Mapping[str, Any],
+                 sources: Sequence[Path] = ()):
+        self.game: FrozenDict = freeze(game)
+        self.rule: FrozenDict = freeze(rule)
+        self.sources: Tuple[Path, ...] = tuple(sources)  # 实际读取的文件
+
+    def __setattr__(self, name, value):
+        if hasattr(self, 'sources'):
+            raise AttributeError("配置为只读")
+        object.__setattr__(self, name, value)
+
+    @property
+    def version(self) -> str:
+        return self.game["version"]
+
+    @property
+    def player_count(self) -> int:
+        return self.game["player_count"]
+
+    @property
+    def initial_points(self) -> int:
+        return self.game["initial_points"]
+
+    @property
+    def riichi_cost(self) -> int:
+        return self.game["riichi_cost"]
+
+    @property
+    def honba_value(self) -> int:
+        return self.game["honba_value"]
+
+    @property
+    def uma_values(self) -> Tuple[int, ...]:
+        return self.game["uma_values"]
+
+    @property
+    def wall_tiles(self) -> int:
+        return self.game["wall_tiles"]
+
+    @property
+    def dead_wall_tiles(self) -> int:
+        return self.game["dead_wall_tiles"]
+
+    @property
+    def hand_size(self) -> int:
+        return self.game["hand_size"]
+
+    @property
+    def max_dora_indicators(self) -> int:
+        return self.game["max_dora_indicators"]
+
+    @property
+    def rules(self) -> FrozenDict:
+        """可选规则开关"""
+        return self.game["rules"]
+
+    @property
+    def tile_count(self) -> int:
+        return self.rule["tile_count"]
+
+    @property
+    def min_han(self) -> int:
+        return self.rule["min_points"]
+
+    @property
+    def max_han(self) -> int:
+        return self.rule["max_points"]
+
+
+def _read(name: str, directories: Sequence[Path]) -> Tuple[Dict[str, Any], Optional[Path]]:
+    """按目录顺序查找并解析配置文件"""
+    for directory in directories:
+        path = Path(directory) / name
+        if not path.is_file():
+            continue
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning("加载配置失败 %s: %s", path, e)
+            return {}, None
+        if not isinstance(data, dict):
+            logger.warning("配置文件 %s 的顶层必须是对象", path)
+            return {}, None
+        return data, path
+    logger.warning("未找到配置文件 %s,使用默认配置", name)
+    return {}, None
+
+
+def _merge(defaults: Dict[str, Any], data: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """以默认值为模板合并配置,类型不符的项回退为默认值"""
+    merged = dict(defaults)
+    for key, value in data.items():
+        default = defaults.get(key)
+        if default is None:
+            merged[key] = value
+        elif isinstance(default, dict):
+            if isinstance(value, dict):
+                merged[key] = _merge(default, value, f"{name}.{key}")
+            else:
+                logger.warning("配置项 %s.%s 应为对象,使用默认值", name, key)
+        elif isinstance(default, bool) != isinstance(value, bool) or \
+                not isinstance(value, type(default)):
+            logger.warning("配置项 %s.%s 类型错误(%r),使用默认值", name, key, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def validate(game: Dict[str, Any], rule: Dict[str, Any]) -> None:
+    """校验配置项之间的约束,不满足时回退为默认值"""
+    def reset(config, defaults, key, reason):
+        logger.warning("配置项 %s %s,使用默认值", key, reason)
+        config[key] = defaults[key]
+
+    for key in ("player_count", "initial_points", "wall_tiles", "hand_size"):
+        if game[key] <= 0:
+            reset(game, GAME_DEFAULTS, key, "必须为正数")
+    uma = game["uma_values"]
+    if len(uma) != game["player_count"] or not all(isinstance(v, int) for v in uma) or sum(uma) != 0:
+        reset(game, GAME_DEFAULTS, "uma_values", "需为与人数相同且和为0的整数列表")
+    if not 10 <= game["dead_wall_tiles"] < game["wall_tiles"]:
+        reset(game, GAME_DEFAULTS, "dead_wall_tiles", "超出牌山范围")
+    if not 0 < rule["min_points"] <= rule["max_points"]:
+        reset(rule, RULE_DEFAULTS, "min_points", "必须在1到最大番数之间")
+        reset(rule, RULE_DEFAULTS, "max_points", "必须不小于最小番数")
+
+
+def load_config(directories: Sequence[Path] = CONFIG_DIRS) -> Config:
+    """从磁盘读取、校验并冻结配置(不使用缓存)"""
+    game_data, game_path = _read('game.json', directories)
+    rule_data, rule_path = _read('rule.json', directories)
+    game = _merge(GAME_DEFAULTS, game_data, 'game')
+    rule = _merge(RULE_DEFAULTS, rule_data, 'rule')
+    validate(game, rule)
+    return Config(game, rule, [p for p in (game_path, rule_path) if p is not None])
+
+
+_config: Optional[Config] = None
+_directories: Sequence[Path] = CONFIG_DIRS
+
+
+def get_config() -> Config:
+    """获取进程级共享配置(首次调用时加载)"""
+    global _config
+    if _config is None:
+        _config = load_config(_directories)
+    return _config
+
+
+def reload_config(directories: Optional[Sequence[Path]] = None) -> Config:
+    """重新加载配置
+
+    之后创建的对象使用新配置,已创建的对象保留各自持有的旧配置。
+
+    Args:
+        directories: 配置文件目录,为 None 时沿用上次的目录
+    Returns:
+        Config: 新的配置
+    """
+    global _config, _directories
+    if directories is not None:
+        _directories = tuple(directories)
+    _config = load_config(_directories)
+    return _config
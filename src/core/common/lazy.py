@@ -0,0 +1,37 @@
+"""包的按需导入(PEP 562)
+
+包的 __init__ 中:
+
+    __getattr__, __dir__ = lazy_exports(__name__, globals(), {
+        'MetricsExporter': '.prometheus',
+    })
+
+首次访问 package.MetricsExporter(或 from package import MetricsExporter)时
+才导入 .prometheus,之后该名称写入包的命名空间,不再经过 __getattr__。
+"""
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, namespace: dict, names: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Args:
+        package: 包名(__name__)
+        namespace: 包的 globals()
+        names: 名称 -> 所在的(相对)模块
+
+    Returns:
+        (__getattr__, __dir__)
+    """
+    def __getattr__(name: str):
+        module = names.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(names))
+
+    return __getattr__, __dir__
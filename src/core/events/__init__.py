@@ -1,3 +1,5 @@
-from .emitter import EventEmitter
+from .emitter import EventEmitter, Event, ListenerStats, WILDCARD
+from .ring import EventRing, EventLog, Cursor, Overflow, RECORD, RECORD_SIZE
 
-__all__ = ['EventEmitter']
\ No newline at end of file
+__all__ = ['EventEmitter', 'Event', 'ListenerStats', 'WILDCARD',
+           'EventRing', 'EventLog', 'Cursor', 'Overflow', 'RECORD', 'RECORD_SIZE']
@@ -1,35 +1,179 @@
-from typing import Any, Callable, Dict, List
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+WILDCARD = '*'  # 订阅所有事件
+
+
+class Event:
+    """事件记录"""
+    __slots__ = ('name', 'args', 'kwargs')
+
+    def __init__(self, name: str, args: Tuple = (), kwargs: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs or {}
+
+    def __iter__(self):
+        # 兼容 (事件名, 参数) 形式的解包
+        yield self.name
+        yield self.args
+
+    def __eq__(self, other):
+        if isinstance(other, Event):
+            return (self.name, self.args, self.kwargs) == (other.name, other.args, other.kwargs)
+        if isinstance(other, tuple):
+            return (self.name, self.args) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Event({self.name!r}, {self.args!r})"
+
+
+class ListenerStats:
+    """单个监听器的调用统计"""
+    __slots__ = ('calls', 'total_time', 'max_time')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0  # 累计耗时(秒)
+        self.max_time = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def __repr__(self):
+        return f"ListenerStats(calls={self.calls}, total={self.total_time:.6f}s, max={self.max_time:.6f}s)"
+
 
 class EventEmitter:
-    """事件发射器类,用于处理游戏中的事件系统"""
-    
-    
+    """事件发射器类,用于处理游戏中的事件系统
+
+    挂接 EventLog 后,每个事件在分发前先写入其环形缓冲区。
+    监听器按事件名保存为元组(注册时复制),触发时直接遍历,
+    监听器在回调中注销自身也不影响本次分发。
+    没有监听器的事件只记录 last_event,不做其他工作。
+    通过 on('*', sink) 注册的通配监听器以 Event 记录接收所有事件。
+    """
+
     def __init__(self):
-        self._events: Dict[str, List[Callable[..., None]]] = {}
-        self._last_event = None  # 添加last_event属性
-        
+        self._events: Dict[str, Tuple[Callable[..., None], ...]] = {}
+        self._wildcard: Tuple[Callable[[Event], None], ...] = ()
+        self._last: Optional[Tuple[str, Tuple, Dict[str, Any]]] = None
+        self._metrics: Optional[Dict[Tuple[str, Callable], ListenerStats]] = None
+        self._log = None  # 事件日志(EventLog),所有事件先写入日志再分发
+
     def on(self, event_name: str, callback: Callable[..., None]) -> None:
-        """注册事件监听器"""
-        if event_name not in self._events:
-            self._events[event_name] = []
-        self._events[event_name].append(callback)
-        
+        """注册事件监听器(事件名为 '*' 时接收所有事件的 Event 记录)"""
+        if event_name == WILDCARD:
+            self._wildcard += (callback,)
+        else:
+            self._events[event_name] = self._events.get(event_name, ()) + (callback,)
+
+    def once(self, event_name: str, callback: Callable[..., None]) -> None:
+        """注册只触发一次的监听器"""
+        def wrapper(*args, **kwargs):
+            self.off(event_name, wrapper)
+            callback(*args, **kwargs)
+        self.on(event_name, wrapper)
+
     def off(self, event_name: str, callback: Callable[..., None]) -> None:
         """移除事件监听器"""
-        if event_name in self._events:
-            self._events[event_name].remove(callback)
-            if not self._events[event_name]:
-                del self._events[event_name]
-                
+        if event_name == WILDCARD:
+            self._wildcard = _without(self._wildcard, callback)
+            return
+        listeners = self._events.get(event_name)
+        if listeners is None:
+            return
+        listeners = _without(listeners, callback)
+        if listeners:
+            self._events[event_name] = listeners
+        else:
+            del self._events[event_name]
+
+    def has_listeners(self, event_name: str) -> bool:
+        """事件是否有监听器(包括通配监听器)"""
+        return bool(self._wildcard) or event_name in self._events
+
     def emit(self, event_name: str, *args, **kwargs) -> None:
-        if event_name in self._events:
-            for callback in self._events[event_name]:
-                callback(*args, **kwargs) 
+        """触发事件"""
+        self._last = (event_name, args, kwargs)
+        if self._log is not None:
+            self._log.record(event_name, args)
+        listeners = self._events.get(event_name)
+        wildcard = self._wildcard
+        if listeners is None and not wildcard:
+            return
+        if self._metrics is not None:
+            self._emit_timed(event_name, listeners or (), wildcard, args, kwargs)
+            return
+        if listeners is not None:
+            for callback in listeners:
+                callback(*args, **kwargs)
+        if wildcard:
+            event = Event(event_name, args, kwargs)
+            for sink in wildcard:
+                sink(event)
+
+    def _emit_timed(self, event_name, listeners, wildcard, args, kwargs) -> None:
+        """统计每个监听器耗时的分发"""
+        metrics = self._metrics
+        clock = time.perf_counter
+        for callback in listeners:
+            start = clock()
+            callback(*args, **kwargs)
+            _record(metrics, event_name, callback, clock() - start)
+        if wildcard:
+            event = Event(event_name, args, kwargs)
+            for sink in wildcard:
+                start = clock()
+                sink(event)
+                _record(metrics, WILDCARD, sink, clock() - start)
+
+    def attach_log(self, log) -> None:
+        """挂接事件日志: 之后的每个事件都编码写入日志的环形缓冲区
+
+        多个读者通过日志的游标读取,不再各自注册回调。
+        """
+        self._log = log
+
+    def detach_log(self) -> None:
+        """移除事件日志"""
+        self._log = None
+
+    # ---- 统计 ----
+
+    def enable_metrics(self, enabled: bool = True) -> None:
+        """开启或关闭监听器统计(开启时清空已有统计)"""
+        self._metrics = {} if enabled else None
+
+    @property
+    def metrics(self) -> Dict[Tuple[str, Callable], ListenerStats]:
+        """各监听器的统计: (事件名, 监听器) -> ListenerStats"""
+        return dict(self._metrics or {})
 
     @property
-    def last_event(self):
+    def last_event(self) -> Optional[Event]:
         """获取最后一次触发的事件
         Returns:
-            tuple: (事件名, 参数) 或 None
+            Event: 事件记录(可解包为 (事件名, 参数)) 或 None
         """
-        return self._last_event
\ No newline at end of file
+        if self._last is None:
+            return None
+        return Event(*self._last)
+
+
+def _without(listeners: Tuple, callback: Callable) -> Tuple:
+    """移除第一个匹配的监听器"""
+    index = listeners.index(callback)  # 与 list.remove 相同,不存在时抛出 ValueError
+    return listeners[:index] + listeners[index + 1:]
+
+
+def _record(metrics, event_name: str, callback: Callable, elapsed: float) -> None:
+    stats = metrics.get((event_name, callback))
+    if stats is None:
+        stats = metrics[(event_name, callback)] = ListenerStats()
+    stats.calls += 1
+    stats.total_time += elapsed
+    if elapsed > stats.max_time:
+        stats.max_time = elapsed
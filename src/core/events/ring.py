@@ -0,0 +1,208 @@
+import struct
+from enum import Enum
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.core.tile import Tile
+from src.core.tile.codec import NO_TILE, pack_tiles, tile_code
+
+# 定长事件记录(16字节):
+#   序号 uint32 | 事件代码 uint8 | 座位 int8 | 牌 int8 | 标志 uint8 | 整数a int16 | 整数b int32 | 填充
+RECORD = struct.Struct('<IBbbBhi2x')
+RECORD_SIZE = RECORD.size
+MAX_FLAGS = 8                      # 标志字段可容纳的布尔参数个数
+A_MIN, A_MAX = -(1 << 15), (1 << 15) - 1
+B_MIN, B_MAX = -(1 << 31), (1 << 31) - 1
+
+
+class Overflow(Enum):
+    """写入速度超过最慢读者时的处理策略"""
+    OVERWRITE = "overwrite"  # 覆盖最旧的记录,落后的读者跳过被覆盖的部分
+    DROP = "drop"            # 丢弃新记录,保证读者不丢失已写入的记录
+
+
+class EventRing:
+    """预分配的定长记录环形缓冲区
+
+    写入方用 struct.pack_into 直接写入 bytearray,不为每个事件分配对象;
+    各读者持有独立的游标,以 memoryview 切片读取连续的记录。
+    """
+
+    def __init__(self, capacity: int = 4096, overflow: Overflow = Overflow.OVERWRITE):
+        """
+        Args:
+            capacity: 可容纳的记录数
+            overflow: 缓冲区被写满时的处理策略
+        """
+        if capacity <= 0:
+            raise ValueError("capacity必须为正数")
+        self.capacity = capacity
+        self.overflow = Overflow(overflow)
+        self.buffer = bytearray(capacity * RECORD_SIZE)
+        self.view = memoryview(self.buffer)
+        self.written = 0   # 已写入的记录总数
+        self.dropped = 0   # DROP 策略下被丢弃的记录数
+        self.cursors: List['Cursor'] = []
+        self._oldest = 0   # 各游标中最小的读取位置(游标前进或注销时更新)
+
+    def append(self, code: int, seat: int = -1, tile: int = NO_TILE, flags: int = 0,
+               a: int = 0, b: int = 0) -> bool:
+        """写入一条记录
+        Returns:
+            bool: 是否写入(DROP 策略下缓冲区已满时返回 False)
+        """
+        written = self.written
+        if self.overflow is Overflow.DROP and self.cursors and written - self._oldest >= self.capacity:
+            self.dropped += 1
+            return False
+        RECORD.pack_into(self.buffer, (written % self.capacity) * RECORD_SIZE,
+                         written & 0xFFFFFFFF, code, seat, tile, flags, a, b)
+        self.written = written + 1
+        return True
+
+    def cursor(self, from_start: bool = False) -> 'Cursor':
+        """创建读者游标
+        Args:
+            from_start: 是否从缓冲区中最旧的记录开始读取(默认只读取之后写入的记录)
+        """
+        position = max(0, self.written - self.capacity) if from_start else self.written
+        cursor = Cursor(self, position)
+        self.cursors.append(cursor)
+        self._update_oldest()
+        return cursor
+
+    def close_cursor(self, cursor: 'Cursor') -> None:
+        """注销游标(DROP 策略下不再等待该读者)"""
+        if cursor in self.cursors:
+            self.cursors.remove(cursor)
+            self._update_oldest()
+
+    def _update_oldest(self) -> None:
+        self._oldest = min((cursor.position for cursor in self.cursors), default=self.written)
+
+
+class Cursor:
+    """环形缓冲区的读者游标"""
+
+    def __init__(self, ring: EventRing, position: int):
+        self.ring = ring
+        self.position = position  # 下一条要读取的记录序号
+        self.dropped = 0          # 因被覆盖而跳过的记录数
+
+    @property
+    def lag(self) -> int:
+        """尚未读取的记录数"""
+        return self.ring.written - self.position
+
+    def _catch_up(self) -> None:
+        ring = self.ring
+        oldest = ring.written - ring.capacity
+        if self.position < oldest:
+            self.dropped += oldest - self.position
+            self.position = oldest
+
+    def read(self, limit: Optional[int] = None) -> memoryview:
+        """读取一段连续的记录(零拷贝)
+
+        返回的视图在缓冲区末尾处截断,需循环调用直到返回空视图。
+        视图在下次写入覆盖前有效。
+        """
+        self._catch_up()
+        ring = self.ring
+        count = ring.written - self.position
+        if limit is not None:
+            count = min(count, limit)
+        start = self.position % ring.capacity
+        count = min(count, ring.capacity - start)
+        if count:
+            position = self.position
+            self.position = position + count
+            if position == ring._oldest:
+                ring._update_oldest()
+        return ring.view[start * RECORD_SIZE:(start + count) * RECORD_SIZE]
+
+    def __iter__(self) -> Iterator[Tuple]:
+        """逐条解码未读的记录"""
+        while True:
+            chunk = self.read()
+            if not chunk:
+                return
+            yield from RECORD.iter_unpack(chunk)
+
+
+class EventLog:
+    """把事件总线上的事件编码为定长记录写入环形缓冲区
+
+    事件参数按类型映射到记录字段: 玩家 -> 座位, 牌 -> 牌代码,
+    布尔值 -> 标志位, 整数 -> a/b, 牌列表 -> 打包到 b。
+    事件名在首次出现时分配代码,可通过 names 解码。
+    超出字段范围的值被截断到边界(布尔值只保留前 MAX_FLAGS 个),
+    并计入 clamped。
+    """
+
+    def __init__(self, ring: Optional[EventRing] = None, players: Sequence = ()):
+        self.ring = ring or EventRing()
+        self.players = players  # 用于把玩家对象转换为座位号
+        self.codes: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.clamped = 0  # 有字段被截断的事件数
+
+    def attach(self, game) -> 'EventLog':
+        """挂接到游戏的事件总线"""
+        self.players = game.table.players
+        game.events.attach_log(self)
+        return self
+
+    def code(self, name: str) -> int:
+        """事件名对应的代码"""
+        code = self.codes.get(name)
+        if code is None:
+            if len(self.names) >= 255:
+                raise ValueError("事件种类过多")
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def record(self, name: str, args: Tuple) -> None:
+        """编码并写入一个事件"""
+        code = self.codes.get(name)
+        if code is None:
+            code = self.code(name)
+        seat = -1
+        tile = NO_TILE
+        flags = bits = 0
+        ints = 0  # 整数参数个数(只保留前3个)
+        i0 = i1 = i2 = 0
+        packed = None
+        for arg in args:
+            if isinstance(arg, Tile):
+                tile = tile_code(arg)
+            elif isinstance(arg, bool):
+                bits += 1
+                if bits <= MAX_FLAGS:
+                    flags = flags << 1 | arg
+            elif isinstance(arg, int):
+                if ints == 0:
+                    i0 = arg
+                elif ints == 1:
+                    i1 = arg
+                elif ints == 2:
+                    i2 = arg
+                ints += 1
+            elif isinstance(arg, (list, tuple)):
+                if arg and isinstance(arg[0], Tile):
+                    packed = pack_tiles(arg)
+            elif seat < 0 and arg in self.players:
+                seat = self.players.index(arg)
+        if ints and seat < 0 and 0 <= i0 < 8:
+            seat, a, b = i0, i1, i2  # 第一个小整数视为座位号
+        else:
+            a, b = i0, i1
+        if packed is not None:
+            b = packed
+        if bits > MAX_FLAGS or not A_MIN <= a <= A_MAX or not B_MIN <= b <= B_MAX:
+            self.clamped += 1
+            a = min(max(a, A_MIN), A_MAX)
+            b = min(max(b, B_MIN), B_MAX)
+        self.ring.append(code, seat, tile, flags, a, b)
+
+    def name_of(self, code: int) -> str:
+        return self.names[code]
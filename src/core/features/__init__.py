@@ -0,0 +1,7 @@
+from .encoder import (CHANNELS, TILE_KINDS, BatchEncoder, FeatureEncoder, encode_into)
+from .actions import ACTIONS, action_index, legal_mask
+from .dataset import ShardDataset, ShardWriter, export_game
+
+__all__ = ['CHANNELS', 'TILE_KINDS', 'BatchEncoder', 'FeatureEncoder', 'encode_into',
+           'ACTIONS', 'action_index', 'legal_mask',
+           'ShardDataset', 'ShardWriter', 'export_game']
@@ -0,0 +1,70 @@
+"""操作的固定编号
+
+把 DecisionRequest 中的合法操作映射到固定大小的操作空间,
+用于训练数据中的合法操作掩码与所选操作:
+    0-33   打出该种牌(非赤)
+    34-36  打出赤五(万/筒/索)
+    37     立直    38 自摸    39 荣和
+    40-42  吃(被吃的牌为顺子中最小/中间/最大的一张)
+    43     碰      44 杠      45 放弃
+"""
+from typing import Optional, Sequence
+import numpy as np
+from ..game.driver import Action, ActionType, DecisionRequest
+from ..tile import Tile, tile_code
+from ..tile.codec import RED_FLAG
+
+RED_DISCARD = 34
+RIICHI = 37
+TSUMO = 38
+RON = 39
+CHI = 40
+PON = 43
+KAN = 44
+PASS = 45
+ACTIONS = 46
+
+_FIXED = {
+    ActionType.RIICHI: RIICHI,
+    ActionType.TSUMO: TSUMO,
+    ActionType.RON: RON,
+    ActionType.PON: PON,
+    ActionType.KAN: KAN,
+    ActionType.PASS: PASS,
+}
+
+
+def discard_index(tile: Tile) -> int:
+    """打出 tile 的编号"""
+    code = tile_code(tile)
+    if code & RED_FLAG:
+        return RED_DISCARD + (code & ~RED_FLAG) // 9
+    return code
+
+
+def action_index(action: Action, hand: Sequence[Tile]) -> int:
+    """操作的编号
+
+    Args:
+        action: 操作
+        hand: 决策时的手牌(出牌操作按其中的索引取牌)
+    """
+    kind = action.type
+    if kind == ActionType.DISCARD:
+        return discard_index(hand[action.tile_index])
+    if kind == ActionType.CHI:
+        called = action.tiles[-1].value
+        return CHI + sum(tile.value < called for tile in action.tiles[:-1])
+    return _FIXED[kind]
+
+
+def legal_mask(request: DecisionRequest, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """合法操作的掩码(长度 ACTIONS 的布尔数组)"""
+    if out is None:
+        out = np.zeros(ACTIONS, dtype=bool)
+    else:
+        out.fill(False)
+    hand = request.player.hand.tiles
+    for action in request.legal_actions:
+        out[action_index(action, hand)] = True
+    return out
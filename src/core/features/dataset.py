@@ -0,0 +1,218 @@
+"""自对弈训练数据的分片导出
+
+观测、合法操作掩码与所选操作按行流式写入固定行数的 .npy 分片
+(numpy.lib.format.open_memmap),同一时间只打开当前分片,内存占用
+与已写入的行数无关。目录结构:
+    manifest.json              分片索引(每写满一个分片即原子更新)
+    {prefix}-00000.obs.npy     (shard_size, CHANNELS, 34) 观测
+    {prefix}-00000.mask.npy    (shard_size, ACTIONS) 合法操作掩码
+    {prefix}-00000.action.npy  (shard_size,) 所选操作编号
+分片按 shard_size 预先分配,只有清单中记录的前 rows 行有效(最后一个分片
+通常未写满)。ShardDataset 以内存映射方式读取,不把分片载入内存。
+"""
+import json
+import os
+import random
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from numpy.lib.format import open_memmap
+from ..game.driver import Action, DecisionRequest, play_round, random_policy
+from .actions import ACTIONS, action_index, legal_mask
+from .encoder import CHANNELS, TILE_KINDS, FeatureEncoder
+
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+_FIELDS = ("obs", "mask", "action")
+
+
+class ShardWriter:
+    """把训练样本流式写入内存映射的 .npy 分片"""
+
+    def __init__(self, directory: str, shard_size: int = 65536, dtype=np.float32,
+                 prefix: str = "shard"):
+        """
+        Args:
+            directory: 输出目录(不存在时创建)
+            shard_size: 每个分片的行数
+            dtype: 观测的数据类型(如 np.float16 可减半磁盘占用)
+            prefix: 分片文件名前缀
+        """
+        if shard_size <= 0:
+            raise ValueError(f"分片行数必须为正数: {shard_size}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard_size = shard_size
+        self.dtype = np.dtype(dtype)
+        self.prefix = prefix
+        self.rows = 0  # 已写入的总行数
+        self.shards: List[Dict] = []
+        self.closed = False
+        self._obs = self._mask = self._action = None
+        self._row = 0  # 当前分片中的下一行
+
+    def __enter__(self) -> 'ShardWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, obs: np.ndarray, mask: np.ndarray, action: int) -> None:
+        """写入一行
+
+        Args:
+            obs: (CHANNELS, 34) 观测
+            mask: (ACTIONS,) 合法操作掩码
+            action: 所选操作编号
+        """
+        self._next_row()[:] = mask
+        self._commit(obs, action)
+
+    def add(self, obs: np.ndarray, request: DecisionRequest, action: Action) -> None:
+        """写入一个决策: 由请求计算掩码与操作编号(掩码直接写入分片)"""
+        legal_mask(request, self._next_row())
+        self._commit(obs, action_index(action, request.player.hand.tiles))
+
+    def _next_row(self) -> np.ndarray:
+        """准备写入下一行,返回该行的掩码"""
+        if self.closed:
+            raise ValueError("ShardWriter 已关闭")
+        if self._obs is None:
+            self._open()
+        return self._mask[self._row]
+
+    def _commit(self, obs: np.ndarray, action: int) -> None:
+        row = self._row
+        self._obs[row] = obs
+        self._action[row] = action
+        self._row = row + 1
+        self.rows += 1
+        self.shards[-1]["rows"] = self._row
+        if self._row == self.shard_size:
+            self._finish()
+
+    def close(self) -> None:
+        """刷新当前分片并写入清单"""
+        if self.closed:
+            return
+        if self._obs is not None:
+            self._finish()
+        else:
+            self._write_manifest()
+        self.closed = True
+
+    def _open(self) -> None:
+        """创建下一个分片"""
+        name = f"{self.prefix}-{len(self.shards):05d}"
+        shard = {"rows": 0}
+        shapes = {
+            "obs": ((self.shard_size, CHANNELS, TILE_KINDS), self.dtype),
+            "mask": ((self.shard_size, ACTIONS), np.bool_),
+            "action": ((self.shard_size,), np.int16),
+        }
+        arrays = []
+        for field in _FIELDS:
+            shape, dtype = shapes[field]
+            shard[field] = f"{name}.{field}.npy"
+            arrays.append(open_memmap(os.path.join(self.directory, shard[field]), mode="w+",
+                                      dtype=dtype, shape=shape))
+        self._obs, self._mask, self._action = arrays
+        self._row = 0
+        self.shards.append(shard)
+
+    def _finish(self) -> None:
+        """刷新并关闭当前分片,更新清单"""
+        for array in (self._obs, self._mask, self._action):
+            array.flush()
+        self._obs = self._mask = self._action = None
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "channels": CHANNELS,
+            "tiles": TILE_KINDS,
+            "actions": ACTIONS,
+            "dtype": self.dtype.str,
+            "shard_size": self.shard_size,
+            "rows": self.rows,
+            "shards": self.shards,
+        }
+        path = os.path.join(self.directory, MANIFEST)
+        temp = path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(temp, path)  # 原子替换,读取方不会看到写了一半的清单
+
+
+class ShardDataset:
+    """以内存映射方式读取 ShardWriter 导出的数据"""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"不支持的清单版本: {manifest.get('version')}")
+        self.directory = directory
+        self.manifest = manifest
+        self.shards = [shard for shard in manifest["shards"] if shard["rows"]]
+        self._starts = np.cumsum([0] + [shard["rows"] for shard in self.shards])
+        self._cache: Dict[int, Tuple[np.ndarray, ...]] = {}
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def shard(self, index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """第 index 个分片的 (观测, 掩码, 操作),只含有效行的内存映射视图"""
+        arrays = self._cache.get(index)
+        if arrays is None:
+            shard = self.shards[index]
+            rows = shard["rows"]
+            arrays = tuple(np.load(os.path.join(self.directory, shard[field]), mmap_mode="r")[:rows]
+                           for field in _FIELDS)
+            self._cache[index] = arrays
+        return arrays
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """按分片迭代"""
+        for index in range(len(self.shards)):
+            yield self.shard(index)
+
+    def __getitem__(self, row: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        index = int(np.searchsorted(self._starts, row, side="right")) - 1
+        obs, mask, action = self.shard(index)
+        offset = row - int(self._starts[index])
+        return obs[offset], mask[offset], int(action[offset])
+
+
+def export_game(game, writer: ShardWriter,
+                policy: Optional[Callable[[DecisionRequest], Action]] = None,
+                rng: Optional[random.Random] = None) -> Dict[str, int]:
+    """进行一局自对弈并把每个决策写入 writer
+
+    Args:
+        game: 对局
+        writer: 分片写入器
+        policy: 决策函数,为 None 时在合法操作中随机选择
+        rng: 随机策略使用的随机数生成器
+
+    Returns:
+        Dict[str, int]: 各玩家点数
+    """
+    if policy is None:
+        policy = random_policy(rng)
+    encoders = [FeatureEncoder(game, seat, dtype=writer.dtype) for seat in range(game.get_player_count())]
+
+    def record(request: DecisionRequest) -> Action:
+        action = policy(request) or request.legal_actions[0]
+        writer.add(encoders[request.seat].planes, request, action)
+        return action
+
+    try:
+        return play_round(game, record)
+    finally:
+        for encoder in encoders:
+            encoder.detach()
@@ -0,0 +1,345 @@
+"""观测特征编码
+
+把某个座位看到的对局编码为 (C, 34) 的 NumPy 特征平面,列为34种牌
+(万0-8 筒9-17 索18-26 字27-33,与 tile.codec 的编号一致)。
+其他座位按相对位置排列(0=本人,1=下家,2=对家,3=上家),
+只使用公开信息与本人手牌,不泄露其他玩家的手牌。
+
+平面布局(计数类使用阈值编码: 第 k 层表示"至少 k+1 张"):
+    HAND        4  本人手牌张数
+    AKA         1  本人手牌中的赤五
+    DISCARD    16  各座位牌河张数 [相对座位 * 4 + k]
+    TSUMOGIRI   4  各座位摸切的张数
+    RIICHI_TILE 4  各座位的立直宣言牌
+    MELD       16  各座位副露张数 [相对座位 * 4 + k]
+    DORA        1  宝牌指示牌张数
+    ROUND_WIND  1  场风(字牌列的独热)
+    SEAT_WIND   1  本人自风
+    SCORE       4  各座位点数 / SCORE_SCALE(整行相同,下同)
+    RIICHI      4  各座位是否立直
+    DEALER      4  庄家所在的相对座位
+    REMAINING   1  牌山剩余张数 / REMAINING_SCALE
+    HONBA       1  本场数 / STICK_SCALE
+    STICKS      1  供托立直棒数 / STICK_SCALE
+
+FeatureEncoder 挂在对局的事件总线上,摸牌、出牌、鸣牌时只改动受影响的
+单元,新的一局(deal)或和牌/流局时整体重建。BatchEncoder 把多张牌桌的
+编码器写入同一个 (N, C, 34) 数组,整体重建时对所有牌桌一次性向量化计算。
+"""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from ..tile import Tile, tile_code, tiles_to_bytes
+from ..tile.codec import RED_FLAG
+
+TILE_KINDS = 34
+SEATS = 4
+LEVELS = 4  # 阈值编码的层数(同种牌最多4张)
+
+HAND = 0
+AKA = HAND + LEVELS
+DISCARD = AKA + 1
+TSUMOGIRI = DISCARD + SEATS * LEVELS
+RIICHI_TILE = TSUMOGIRI + SEATS
+MELD = RIICHI_TILE + SEATS
+DORA = MELD + SEATS * LEVELS
+ROUND_WIND = DORA + 1
+SEAT_WIND = ROUND_WIND + 1
+SCORE = SEAT_WIND + 1
+RIICHI = SCORE + SEATS
+DEALER = RIICHI + SEATS
+REMAINING = DEALER + SEATS
+HONBA = REMAINING + 1
+STICKS = HONBA + 1
+CHANNELS = STICKS + 1
+
+SCORE_SCALE = 100000.0
+REMAINING_SCALE = 70.0
+STICK_SCALE = 10.0
+
+_WIND_BASE = 27  # 东风在字牌列中的编号
+_KIND_MASK = RED_FLAG - 1
+_THRESHOLDS = np.arange(LEVELS).reshape(LEVELS, 1)
+
+# 只改动本人手牌的事件与鸣牌事件
+_CALL_EVENTS = ("chi", "pon", "kan")
+# 点数或供托可能变化、需要整体重建的事件
+_REBUILD_EVENTS = ("deal", "ron", "tsumo", "round_end")
+
+
+def _counts(rows: List[int], codes: bytearray, size: int) -> np.ndarray:
+    """按行统计各种牌的张数,返回 (size, 34)"""
+    kinds = np.frombuffer(codes, dtype=np.uint8) & _KIND_MASK
+    index = np.asarray(rows, dtype=np.intp) * TILE_KINDS + kinds
+    return np.bincount(index, minlength=size * TILE_KINDS).reshape(size, TILE_KINDS)
+
+
+def _thermometer(counts: np.ndarray) -> np.ndarray:
+    """(..., 34) 的张数 -> (..., LEVELS, 34) 的阈值编码"""
+    return counts[..., None, :] > _THRESHOLDS
+
+
+def encode_into(out: np.ndarray, sources: Sequence[Tuple[object, int]]) -> np.ndarray:
+    """从头编码多张牌桌,写入 out
+
+    Args:
+        out: (N, CHANNELS, 34) 的数组,原有内容被覆盖
+        sources: N 个 (对局, 座位)
+
+    Returns:
+        np.ndarray: out
+    """
+    size = len(sources)
+    out.fill(0)
+    hand_rows, hand_codes = [], bytearray()
+    river_rows, river_codes = [], bytearray()
+    tsumogiri_rows, tsumogiri_codes = [], bytearray()
+    meld_rows, meld_codes = [], bytearray()
+    dora_rows, dora_codes = [], bytearray()
+    scalars = np.zeros((size, 6, SEATS))  # 点数/立直/庄家 + 剩余/本场/供托(只用第0列)
+    riichi_tiles = []  # (行, 相对座位, 牌代码)
+    winds = []  # (行, 场风列, 自风列)
+
+    for row, (game, seat) in enumerate(sources):
+        table = game.table
+        players = table.players
+        if not players:
+            continue
+        count = len(players)
+        me = players[seat]
+        codes = tiles_to_bytes(me.hand.tiles)
+        hand_codes += codes
+        hand_rows += [row] * len(codes)
+
+        for index, player in enumerate(players):
+            relative = (index - seat) % count
+            target = row * SEATS + relative
+            river = player.river
+            codes = tiles_to_bytes(river.tiles)
+            river_codes += codes
+            river_rows += [target] * len(codes)
+            if river.riichi_tile_index >= 0:
+                riichi_tiles.append((row, relative, codes[river.riichi_tile_index]))
+            picked = bytes(code for code, flag in zip(codes, river.tsumogiri) if flag)
+            tsumogiri_codes += picked
+            tsumogiri_rows += [target] * len(picked)
+            for meld in player.hand.melds:
+                codes = tiles_to_bytes(meld)
+                meld_codes += codes
+                meld_rows += [target] * len(codes)
+            scalars[row, 0, relative] = player.points
+            scalars[row, 1, relative] = player.is_riichi
+        scalars[row, 2, (table.dealer_index - seat) % count] = 1
+
+        wall = table.wall
+        codes = tiles_to_bytes(wall.dora_indicators)
+        dora_codes += codes
+        dora_rows += [row] * len(codes)
+        sticks = game.flow.score_calculator
+        scalars[row, 3:, 0] = wall.remaining_count, sticks.honba_sticks, sticks.riichi_sticks
+        wind = me.seat_wind
+        winds.append((row, _WIND_BASE + table.round_wind, -1 if wind is None else int(wind)))
+
+    if hand_codes:
+        out[:, HAND:AKA] = _thermometer(_counts(hand_rows, hand_codes, size))
+        red = [code & RED_FLAG != 0 for code in hand_codes]
+        np.add.at(out[:, AKA], (np.asarray(hand_rows)[red],
+                                np.frombuffer(hand_codes, np.uint8)[red] & _KIND_MASK), 1)
+    planes = SEATS * LEVELS
+    if river_codes:
+        rivers = _thermometer(_counts(river_rows, river_codes, size * SEATS))
+        out[:, DISCARD:TSUMOGIRI] = rivers.reshape(size, planes, TILE_KINDS)
+    if tsumogiri_codes:
+        out[:, TSUMOGIRI:RIICHI_TILE] = _counts(tsumogiri_rows, tsumogiri_codes, size * SEATS) \
+            .reshape(size, SEATS, TILE_KINDS)
+    for row, relative, code in riichi_tiles:
+        out[row, RIICHI_TILE + relative, code & _KIND_MASK] = 1
+    if meld_codes:
+        melds = _thermometer(_counts(meld_rows, meld_codes, size * SEATS))
+        out[:, MELD:DORA] = melds.reshape(size, planes, TILE_KINDS)
+    if dora_codes:
+        out[:, DORA] = _counts(dora_rows, dora_codes, size)
+    for row, round_wind, seat_wind in winds:
+        out[row, ROUND_WIND, round_wind] = 1
+        if seat_wind >= 0:
+            out[row, SEAT_WIND, seat_wind] = 1
+
+    scalars[:, 0] /= SCORE_SCALE
+    scalars[:, 3, 0] /= REMAINING_SCALE
+    scalars[:, 4:, 0] /= STICK_SCALE
+    out[:, SCORE:REMAINING] = scalars[:, :3].reshape(size, 3 * SEATS, 1)
+    out[:, REMAINING:CHANNELS] = scalars[:, 3:, :1]
+    return out
+
+
+class FeatureEncoder:
+    """单个座位的增量特征编码器
+
+    挂在 game.events 上,随对局事件更新预先分配的 (C, 34) 缓冲区。
+    直接修改对局状态(如 Game.restore)后需调用 encode() 重建。
+    """
+
+    def __init__(self, game, seat: int, out: Optional[np.ndarray] = None, dtype=np.float32):
+        """
+        Args:
+            game: 对局
+            seat: 观察者座位
+            out: 写入的 (CHANNELS, 34) 缓冲区(可以是批量数组的一个切片),
+                 为 None 时新分配
+            dtype: 新分配缓冲区的数据类型
+        """
+        if out is None:
+            out = np.zeros((CHANNELS, TILE_KINDS), dtype=dtype)
+        elif out.shape != (CHANNELS, TILE_KINDS):
+            raise ValueError(f"特征缓冲区形状应为 {(CHANNELS, TILE_KINDS)},实际为 {out.shape}")
+        self.game = game
+        self.seat = seat
+        self.planes = out
+        self._hand: List[int] = []       # 本人手牌各种牌的张数
+        self._rivers: List[List[int]] = []  # 各相对座位牌河的张数
+        self._melds: List[List[int]] = []   # 各相对座位副露的张数
+        events = game.events
+        for name in _REBUILD_EVENTS:
+            events.on(name, self._on_rebuild)
+        events.on("draw", self._on_draw)
+        events.on("discard", self._on_discard)
+        events.on("riichi", self._on_riichi)
+        for name in _CALL_EVENTS:
+            events.on(name, self._on_call)
+        self.encode()
+
+    def detach(self) -> None:
+        """从事件总线移除"""
+        events = self.game.events
+        for name in _REBUILD_EVENTS:
+            events.off(name, self._on_rebuild)
+        events.off("draw", self._on_draw)
+        events.off("discard", self._on_discard)
+        events.off("riichi", self._on_riichi)
+        for name in _CALL_EVENTS:
+            events.off(name, self._on_call)
+
+    def encode(self) -> np.ndarray:
+        """从对局状态整体重建,返回缓冲区"""
+        encode_into(self.planes[None], [(self.game, self.seat)])
+        self._sync()
+        return self.planes
+
+    def _sync(self) -> None:
+        """从平面恢复增量更新用的张数"""
+        planes = self.planes
+        self._hand = planes[HAND:AKA].sum(axis=0).astype(int).tolist()
+        shape = (SEATS, LEVELS, TILE_KINDS)
+        self._rivers = planes[DISCARD:TSUMOGIRI].reshape(shape).sum(axis=1).astype(int).tolist()
+        self._melds = planes[MELD:DORA].reshape(shape).sum(axis=1).astype(int).tolist()
+
+    def _relative(self, seat: int) -> int:
+        return (seat - self.seat) % len(self.game.table.players)
+
+    def _add(self, counts: List[int], base: int, tile: Tile) -> int:
+        """阈值编码中加入一张牌,返回牌的列"""
+        kind = tile_code(tile) & _KIND_MASK
+        count = counts[kind]
+        if count < LEVELS:
+            self.planes[base + count, kind] = 1
+        counts[kind] = count + 1
+        return kind
+
+    def _remove(self, tile: Tile) -> None:
+        """本人手牌中移除一张牌"""
+        code = tile_code(tile)
+        kind = code & _KIND_MASK
+        count = self._hand[kind] - 1
+        if count < 0:
+            return
+        if count < LEVELS:
+            self.planes[HAND + count, kind] = 0
+        self._hand[kind] = count
+        if code & RED_FLAG:
+            self.planes[AKA, kind] -= 1
+
+    def _add_hand(self, tile: Tile) -> None:
+        kind = self._add(self._hand, HAND, tile)
+        if tile.is_red:
+            self.planes[AKA, kind] += 1
+
+    def _update_scalars(self) -> None:
+        """刷新点数、立直、牌山剩余与供托"""
+        game = self.game
+        players = game.table.players
+        planes = self.planes
+        for index, player in enumerate(players):
+            relative = self._relative(index)
+            planes[SCORE + relative] = player.points / SCORE_SCALE
+            planes[RIICHI + relative] = player.is_riichi
+        planes[REMAINING] = game.table.wall.remaining_count / REMAINING_SCALE
+        planes[STICKS] = game.flow.score_calculator.riichi_sticks / STICK_SCALE
+
+    def _on_rebuild(self, *args) -> None:
+        self.encode()
+
+    def _on_draw(self, seat: int, tile: Tile) -> None:
+        if seat == self.seat:
+            self._add_hand(tile)
+        self.planes[REMAINING] = self.game.table.wall.remaining_count / REMAINING_SCALE
+
+    def _on_discard(self, seat: int, tile: Tile, tsumogiri: bool) -> None:
+        if seat == self.seat:
+            self._remove(tile)
+        relative = self._relative(seat)
+        kind = self._add(self._rivers[relative], DISCARD + relative * LEVELS, tile)
+        if tsumogiri:
+            self.planes[TSUMOGIRI + relative, kind] += 1
+        river = self.game.table.players[seat].river
+        if river.riichi_tile_index >= 0 and river.riichi_tile_index == len(river.tiles) - 1:
+            self.planes[RIICHI_TILE + relative, kind] = 1
+
+    def _on_riichi(self, seat: int) -> None:
+        self._update_scalars()
+
+    def _on_call(self, seat: int, tiles: List[Tile]) -> None:
+        relative = self._relative(seat)
+        base = MELD + relative * LEVELS
+        melds = self._melds[relative]
+        for tile in tiles:
+            self._add(melds, base, tile)
+        if seat == self.seat:
+            for tile in tiles[:-1]:  # 最后一张为鸣入的牌
+                self._remove(tile)
+        wall = self.game.table.wall
+        dora = self.planes[DORA]
+        dora.fill(0)
+        for code in tiles_to_bytes(wall.dora_indicators):
+            dora[code & _KIND_MASK] += 1
+
+
+class BatchEncoder:
+    """多张牌桌的特征编码器
+
+    所有编码器写入同一个 (N, C, 34) 数组的切片,各自随事件增量更新;
+    encode() 对所有牌桌一次性向量化重建。
+    """
+
+    def __init__(self, sources: Sequence[Tuple[object, int]], dtype=np.float32):
+        """
+        Args:
+            sources: (对局, 座位) 列表
+            dtype: 数组的数据类型
+        """
+        self.array = np.zeros((len(sources), CHANNELS, TILE_KINDS), dtype=dtype)
+        self.encoders = [FeatureEncoder(game, seat, out=self.array[row])
+                         for row, (game, seat) in enumerate(sources)]
+
+    def __len__(self) -> int:
+        return len(self.encoders)
+
+    def encode(self) -> np.ndarray:
+        """整体重建所有牌桌,返回 (N, C, 34) 数组"""
+        encode_into(self.array, [(encoder.game, encoder.seat) for encoder in self.encoders])
+        for encoder in self.encoders:
+            encoder._sync()
+        return self.array
+
+    def detach(self) -> None:
+        """所有编码器从事件总线移除"""
+        for encoder in self.encoders:
+            encoder.detach()
@@ -1,16 +1,31 @@
 from .game import Game
-from .state import GameState, ActionPriority
+from .state import GameState, ActionPriority, TurnPhase
+from .machine import GameStateMachine
 from .controller import GameController
 from .flow import GameFlow
 from .config import GameConfig
 from .score import ScoreCalculator
+from .driver import GameDriver, Action, ActionType, DecisionRequest, GameEvent, play_round, random_policy
+from .view import GameView, PlayerView, ViewCache
 
 __all__ = [
     'Game',
     'GameState',
     'ActionPriority',
+    'TurnPhase',
+    'GameStateMachine',
     'GameController', 
     'GameFlow',
     'GameConfig',
-    'ScoreCalculator'
+    'ScoreCalculator',
+    'GameDriver',
+    'Action',
+    'ActionType',
+    'DecisionRequest',
+    'GameEvent',
+    'play_round',
+    'random_policy',
+    'GameView',
+    'PlayerView',
+    'ViewCache'
 ]
\ No newline at end of file
@@ -1,3 +1,6 @@
+from typing import Optional
+from src.core.rules.profile import RuleProfile, STANDARD
+
 class GameConfig:
     """游戏配置类"""
     def __init__(self):
@@ -5,4 +8,14 @@ class GameConfig:
         self.aka_dora = True     # 是否启用赤宝牌
         self.uradora = False     # 是否启用里宝牌
         self.open_tanyao = True  # 是否允许副露断幺 
-        self.dead_wall_count = 14  # 王牌数（14张）
\ No newline at end of file
+        self.dead_wall_count = 14  # 王牌数（14张）
+
+    def to_profile(self, base: Optional[RuleProfile] = None) -> RuleProfile:
+        """编译为规则配置
+        Args:
+            base: 其余规则沿用的配置,默认为内置标准规则
+        Returns:
+            RuleProfile: 编译后的规则
+        """
+        return (base or STANDARD).variant(aka_dora=self.aka_dora, uradora=self.uradora,
+                                          open_tanyao=self.open_tanyao)
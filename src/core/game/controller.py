@@ -9,15 +9,41 @@ from src.core.hand import Hand
 from src.core.game.score import ScoreCalculator
 import logging
 from src.core.game.state import ActionPriority
+from src.core.game.machine import GameStateMachine
+from src.core.rules.profile import RuleProfile, STANDARD
 
 class GameController:
-    def __init__(self, table):
+    def __init__(self, table, profile: Optional[RuleProfile] = None):
         self.table = table
-        self.state = GameState.WAITING
+        self.profile = profile or STANDARD
+        self.machine = GameStateMachine(table)
         self.events = EventEmitter()
-        self.waiting_players: Dict[Player, Set[ActionPriority]] = {}
         self.logger = logging.getLogger(__name__)
-        self.score_calculator = ScoreCalculator()
+        self.score_calculator = ScoreCalculator(self.profile)
+        
+    def fork(self, table) -> 'GameController':
+        """复制控制器并绑定到复制出的牌桌(事件总线为新的空总线)"""
+        clone = GameController.__new__(GameController)
+        clone.__dict__.update(self.__dict__)
+        clone.table = table
+        clone.machine = self.machine.fork(table, self.table.players)
+        clone.events = EventEmitter()
+        clone.score_calculator = self.score_calculator.fork()
+        return clone
+        
+    @property
+    def state(self) -> GameState:
+        """游戏状态(保存在状态机中)"""
+        return self.machine.state
+        
+    @state.setter
+    def state(self, state: GameState) -> None:
+        self.machine.state = state
+        
+    @property
+    def waiting_players(self) -> Dict[Player, Set[ActionPriority]]:
+        """等待响应的玩家及其可选操作"""
+        return self.machine.available_actions
         
     def start_game(self) -> bool:
         """开始游戏"""
@@ -38,6 +64,7 @@ class GameController:
         if tile:
             player.hand.add_tile(tile)
             player.set_state(PlayerState.THINKING)
+            self.machine.fire('draw')
         else:
             # 牌山摸完,进入流局
             self.state = GameState.FINISHED
@@ -53,6 +80,7 @@ class GameController:
             return False
             
         player.discards.append(discarded)
+        self.machine.fire('discard')
         self.events.emit("tile_discarded", player, discarded)
         
         # 检查其他玩家是否可以响应
@@ -143,11 +171,11 @@ class GameController:
             return False
             
         # 检查点数是否足够
-        if player.points < 1000:
+        if player.points < self.profile.riichi_cost:
             return False
             
         # 扣除立直点数
-        player.points -= 1000
+        player.points -= self.profile.riichi_cost
         player.is_riichi = True
         self.score_calculator.add_riichi_stick()
         
@@ -199,6 +227,7 @@ class GameController:
         # 获取下一个玩家
         next_player = self.table.next_player()
         if next_player:
+            self.machine.fire('next')
             self.process_turn(next_player)
             
         return next_player
@@ -220,12 +249,12 @@ class GameController:
         
         # 2. 检查玩家状态
         if player.state != PlayerState.WAITING_CHI:
-            self.logger.debug(f"Player not in WAITING_CHI state, current state: {player.state}")
+            self.logger.debug("Player not in WAITING_CHI state, current state: %s", player.state)
             return False
         
         # 3. 检查牌组是否合法
         if len(tiles) != 3:
-            self.logger.debug(f"Invalid tiles count: {len(tiles)}")
+            self.logger.debug("Invalid tiles count: %d", len(tiles))
             return False
         
         # 4. 检查是否是顺子
@@ -243,7 +272,7 @@ class GameController:
         player_tiles = player.hand.tiles
         for tile in tiles[:-1]:  # 最后一张是其他玩家打出的牌
             if tile not in player_tiles:
-                self.logger.debug(f"Player does not have tile: {tile}")
+                self.logger.debug("Player does not have tile: %s", tile)
                 return False
         # 6. 添加吃牌到玩家副露
         for tile in tiles[:-1]:
@@ -0,0 +1,326 @@
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, Generator, List, Mapping, Optional, Tuple, Union
+from src.core.game.state import GameState, TurnPhase, ActionPriority
+from src.core.player import Player
+from src.core.player.state import PlayerState
+from src.core.tile import Tile, TileSuit
+
+class ActionType(IntEnum):
+    """玩家操作类型"""
+    DISCARD = 0  # 出牌
+    RIICHI = 1   # 立直宣言
+    TSUMO = 2    # 自摸
+    RON = 3      # 荣和
+    CHI = 4      # 吃
+    PON = 5      # 碰
+    KAN = 6      # 杠
+    PASS = 7     # 放弃响应
+
+@dataclass(frozen=True)
+class Action:
+    """玩家操作"""
+    type: ActionType
+    tile_index: int = -1              # 出牌时手牌中的索引
+    tiles: Tuple[Tile, ...] = ()      # 鸣牌时组成副露的牌(最后一张为被鸣的牌)
+
+@dataclass
+class DecisionRequest:
+    """决策请求: 由 Game.play() 产出,调用方通过 send() 回传 Action"""
+    seat: int
+    player: Player
+    phase: TurnPhase
+    legal_actions: List[Action]
+    observation: Mapping[str, Any] = field(default_factory=dict)  # 座位视图,反映访问时的状态
+
+@dataclass
+class GameEvent:
+    """对局事件: 由 Game.play() 按发生顺序产出"""
+    name: str
+    args: Tuple = ()
+
+PASS = Action(ActionType.PASS)
+
+# 等待响应状态对应的操作优先级
+_CALL_PRIORITY = {
+    ActionType.CHI: ActionPriority.CHI,
+    ActionType.PON: ActionPriority.PON,
+    ActionType.KAN: ActionPriority.KAN,
+    ActionType.RON: ActionPriority.RON,
+}
+
+
+class GameDriver:
+    """生成器式对局驱动
+
+    将一局游戏展开为事件与决策请求的序列。产出 DecisionRequest 时暂停,
+    调用方通过 send(action) 回传操作(发送 None 则采用第一个合法操作,
+    发送不在合法操作中的操作时抛出 ValueError);
+    产出 GameEvent 时回传值被忽略。生成器结束时返回各玩家点数。
+    驱动产生的事件(摸牌、出牌、鸣牌等)同时发布到 game.events。
+    """
+
+    # 透传到事件流中的引擎事件
+    EVENT_NAMES = ("ron_available", "nine_terminals_check", "special_draw",
+                   "exhaustive_draw", "game_end")
+    # 开启追踪(game.trace)时计时、开启剖析(game.profiling)时剖析的方法
+    TRACED = ("_step", "_handle_discard", "_handle_win", "discard_actions", "response_actions", "_apply_call")
+
+    def __init__(self, game):
+        self.game = game
+        self.flow = game.flow
+        self.machine = game.controller.machine
+        self._pending: deque = deque()
+        # 引擎入口
+        self._step = self.flow.step
+        self._handle_discard = self.flow.handle_discard
+        self._handle_win = self.flow.handle_win
+        profiling = game.profiling
+        if profiling is not None:
+            profiling.instrument(self, self.TRACED)
+        trace = game.trace
+        if trace is not None:
+            trace.instrument(self, self.TRACED)
+
+    def run(self) -> Generator[Union[GameEvent, DecisionRequest], Optional[Action], Dict[str, int]]:
+        """运行对局"""
+        game = self.game
+        listeners = []
+        for emitter in dict.fromkeys((game.events, game.controller.events)):
+            for name in self.EVENT_NAMES:
+                callback = self._recorder(name)
+                emitter.on(name, callback)
+                listeners.append((emitter, name, callback))
+        try:
+            if game.get_state() != GameState.PLAYING and not self._start():
+                return {}
+            while game.get_state() == GameState.PLAYING:
+                yield from self._flush()
+                phase = self.machine.phase
+                if phase == TurnPhase.DISCARD:
+                    yield from self._discard_decision()
+                elif phase == TurnPhase.RESPONSE and self.machine.has_responders:
+                    yield from self._response_decisions()
+                elif phase == TurnPhase.DRAW:
+                    player = game.table.get_current_player()
+                    self._step()
+                    if self.flow.last_drawn_tile is not None:
+                        self._push("draw", self._seat(player), self.flow.last_drawn_tile)
+                elif not self._step():
+                    break
+            yield from self._flush()
+            winner = next((p for p in game.players if p.state == PlayerState.WIN), None)
+            self._push("round_end", self._seat(winner) if winner else -1)
+            yield from self._flush()
+            return {p.name: p.points for p in game.players}
+        finally:
+            for emitter, name, callback in listeners:
+                emitter.off(name, callback)
+            if game.profiling is not None:
+                game.profiling.finish_game()
+
+    def _start(self) -> bool:
+        """开始新的一局: 发牌后由庄家摸牌"""
+        if not self.game.start():
+            return False
+        self.game.set_state(GameState.PLAYING)
+        self.machine.reset_round()
+        self._push("deal")
+        return self.machine.fire('start')
+
+    def _recorder(self, name: str):
+        def record(*args):
+            self._pending.append(GameEvent(name, args))
+        return record
+
+    def _push(self, name: str, *args) -> None:
+        """记录驱动产生的事件,并发布到游戏事件总线"""
+        self._pending.append(GameEvent(name, args))
+        self.game.events.emit(name, *args)
+
+    def _flush(self):
+        while self._pending:
+            yield self._pending.popleft()
+
+    def _seat(self, player: Player) -> int:
+        return self.game.table.players.index(player)
+
+    def _decide(self, player: Player, actions: List[Action]):
+        """产出决策请求并返回收到的操作
+
+        Raises:
+            ValueError: 收到的操作不在合法操作中
+        """
+        request = DecisionRequest(self._seat(player), player, self.machine.phase,
+                                  actions, self.observe(player))
+        action = yield request
+        if action is None:
+            index = 0
+        elif action in actions:
+            index = actions.index(action)
+        else:
+            raise ValueError(f"座位{request.seat}的操作不合法: {action}")
+        # 只发布到总线(不进入事件流),供回放记录合法操作中的序号
+        self.game.events.emit("decision", request.seat, index, actions[index].type)
+        return actions[index]
+
+    # ---- 合法操作 ----
+
+    def discard_actions(self, player: Player) -> List[Action]:
+        """出牌阶段的合法操作"""
+        hand = player.hand
+        actions = []
+        if self.machine.riichi_declared is not player:
+            if hand.check_win():
+                actions.append(Action(ActionType.TSUMO))
+            if (not player.is_riichi and not hand.melds and player.points >= self.game.profile.riichi_cost
+                    and hand.get_shanten() <= 0):
+                actions.append(Action(ActionType.RIICHI))
+        drawn = self.flow.last_drawn_tile
+        if player.is_riichi and self.machine.riichi_declared is not player and drawn in hand.tiles:
+            # 立直后只能摸切
+            actions.append(Action(ActionType.DISCARD, hand.tiles.index(drawn)))
+            return actions
+        seen = set()
+        for index, tile in enumerate(hand.tiles):
+            if tile not in seen:
+                seen.add(tile)
+                actions.append(Action(ActionType.DISCARD, index))
+        return actions
+
+    def response_actions(self, player: Player, tile: Tile) -> List[Action]:
+        """响应阶段的合法操作"""
+        state = player.state
+        matching = tuple(t for t in player.hand.tiles if t == tile)
+        actions = []
+        if state == PlayerState.WAITING_RON:
+            actions.append(Action(ActionType.RON, tiles=(tile,)))
+        elif state == PlayerState.WAITING_KAN:
+            actions.append(Action(ActionType.KAN, tiles=matching[:3] + (tile,)))
+        elif state == PlayerState.WAITING_PON:
+            actions.append(Action(ActionType.PON, tiles=matching[:2] + (tile,)))
+        elif state == PlayerState.WAITING_CHI and tile.suit != TileSuit.HONOR:
+            by_value = {t.value: t for t in player.hand.tiles if t.suit == tile.suit}
+            for low, high in ((-2, -1), (-1, 1), (1, 2)):
+                a = by_value.get(tile.value + low)
+                b = by_value.get(tile.value + high)
+                if a is not None and b is not None:
+                    actions.append(Action(ActionType.CHI, tiles=(a, b, tile)))
+        actions.append(PASS)
+        return actions
+
+    def observe(self, player: Player) -> Mapping[str, Any]:
+        """玩家可见的观测(按座位缓存的只读视图,不复制对局数据)"""
+        return self.game.view(self._seat(player))
+
+    # ---- 决策处理 ----
+
+    def _discard_decision(self):
+        player = self.game.table.get_current_player()
+        actions = self.discard_actions(player)
+        while True:
+            action = yield from self._decide(player, actions)
+            if action.type == ActionType.TSUMO:
+                if self._handle_win(player, self.flow.last_drawn_tile or player.hand.tiles[-1], is_tsumo=True):
+                    self._push("tsumo", self._seat(player))
+                    return
+                # 无役等原因无法和牌
+                actions = [a for a in actions if a.type != ActionType.TSUMO]
+            elif action.type == ActionType.RIICHI:
+                if self.flow.handle_riichi(player):
+                    self.machine.riichi_declared = player
+                    self._push("riichi", self._seat(player))
+                    if self.game.get_state() != GameState.PLAYING:
+                        return
+                    yield from self._flush()
+                    actions = self.discard_actions(player)
+                else:
+                    actions = [a for a in actions if a.type != ActionType.RIICHI]
+            else:
+                break
+        tile = player.hand.tiles[action.tile_index]
+        tsumogiri = tile == self.flow.last_drawn_tile
+        self.machine.riichi_declared = None
+        self._handle_discard(player, tile)
+        player.set_state(PlayerState.WAITING)
+        self._push("discard", self._seat(player), tile, tsumogiri)
+
+    def _response_decisions(self):
+        discarder = self.game.table.get_current_player()
+        tile = discarder.discards[-1]
+        responders = self.machine.responders
+        for player in sorted(responders, key=responders.get, reverse=True):
+            if player not in responders:
+                continue
+            action = yield from self._decide(player, self.response_actions(player, tile))
+            if action.type != ActionType.PASS and self._apply_call(player, action, tile):
+                seat = self._seat(player)
+                self._push(action.type.name.lower(), seat, action.tiles)
+                if action.type == ActionType.KAN and self.flow.last_drawn_tile is not None:
+                    self._push("draw", seat, self.flow.last_drawn_tile)  # 岭上牌
+                return
+            player.set_state(PlayerState.WAITING)
+
+    def _apply_call(self, player: Player, action: Action, tile: Tile) -> bool:
+        """执行鸣牌或荣和"""
+        flow = self.flow
+        if action.type == ActionType.RON:
+            player.hand.add_tile(tile)
+            if self._handle_win(player, tile):
+                return True
+            player.hand.remove_tile(tile)
+            return False
+        if not flow.handle_player_action(player, _CALL_PRIORITY[action.type]):
+            return False
+        if action.type == ActionType.CHI:
+            return flow.handle_chi(player, list(action.tiles))
+        for own_tile in action.tiles[:-1]:
+            player.hand.remove_tile(own_tile)
+        if action.type == ActionType.PON:
+            return flow.handle_pon(player, list(action.tiles))
+        if flow.handle_kan(player, list(action.tiles)):
+            flow.start_turn(player)  # 岭上摸牌
+            return True
+        return False
+
+
+def random_policy(rng: Optional[random.Random] = None) -> Callable[[DecisionRequest], Action]:
+    """在合法操作中随机选择的决策函数
+
+    Args:
+        rng: 随机数生成器,为 None 时新建
+    """
+    choice = (rng or random.Random()).choice
+    return lambda request: choice(request.legal_actions)
+
+
+def play_round(game, policy: Optional[Callable[[DecisionRequest], Optional[Action]]] = None,
+               rng: Optional[random.Random] = None,
+               on_event: Optional[Callable[[GameEvent], None]] = None) -> Dict[str, int]:
+    """无界面地进行一局(game.play())
+
+    Args:
+        game: 对局
+        policy: 决策函数(返回 None 时采用第一个合法操作),为 None 时在合法操作中随机选择
+        rng: 随机策略使用的随机数生成器
+        on_event: 对每个对局事件调用,为 None 时忽略事件
+
+    Returns:
+        Dict[str, int]: 各玩家点数
+    """
+    if policy is None:
+        policy = random_policy(rng)
+    gen = game.play()
+    try:
+        item = next(gen)
+        while True:
+            if isinstance(item, DecisionRequest):
+                item = gen.send(policy(item))
+            else:
+                if on_event is not None:
+                    on_event(item)
+                item = gen.send(None)
+    except StopIteration as stop:
+        return stop.value
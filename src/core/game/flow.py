@@ -2,13 +2,11 @@ from typing import Optional, List, Set, Dict
 from src.core.game.state import ActionPriority
 from src.core.player import Player
 from src.core.player.state import PlayerState
-from src.core.game.state import GameState
+from src.core.game.state import GameState, TurnPhase
 from src.core.tile import Tile, TileSuit
 from src.core.game.score import ScoreCalculator
 from src.core.yaku.judger import YakuJudger
 from src.core.common.wind import Wind
-import os
-import json
 
 class GameFlow:
     """游戏流程控制类"""
@@ -20,30 +18,106 @@ class GameFlow:
             raise TypeError("game must be an instance of Game")
         self.game = game
         self.controller = game.controller
-        self.score_calculator = ScoreCalculator()
-        self.yaku_judger = YakuJudger()
-        self.ippatsu_players: Set[Player] = set()  # 新增：跟踪一发状态的玩家
-        self.first_turn = True  # 标记是否第一巡
-        self.first_draw = True  # 标记是否第一次摸牌
+        self.machine = game.controller.machine  # 与控制器共享的状态机
+        self.last_drawn_tile: Optional[Tile] = None  # 最近一次摸到的牌
+        self.profile = game.profile
+        self.score_calculator = ScoreCalculator(self.profile)
+        self.yaku_judger = YakuJudger(self.profile)
         # 特殊和牌状态
         self.is_tenhou = False  # 天和
         self.is_chiihou = False  # 地和
         self.is_renhou = False  # 人和
         
-        # 加载配置文件
-        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                  'assets', 'config', 'game.json')
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
-        except FileNotFoundError:
-            print(f"配置文件不存在: {config_path}")
-            self.config = {}
-            
-        # 添加事件监听
+        # 与 Game 共享的只读配置
+        self.config = game.config
+        self._bind()
+    
+    def _bind(self) -> None:
+        """添加事件监听并建立各阶段的处理函数"""
         self.game.controller.events.on("win", self.handle_win)
         self.game.controller.events.on("exhaustive_draw", self.handle_exhaustive_draw)
         self.game.controller.events.on("special_draw", self.handle_special_draw)
+        
+        # 各回合阶段的自动推进处理(DISCARD阶段需要玩家决策)
+        self._phase_handlers = {
+            TurnPhase.DRAW: self._step_draw,
+            TurnPhase.RESPONSE: self._step_response,
+            TurnPhase.END: self._step_end,
+        }
+    
+    def fork(self, game) -> 'GameFlow':
+        """复制流程状态并绑定到复制出的对局(役种判定器与规则共享)"""
+        clone = GameFlow.__new__(GameFlow)
+        clone.__dict__.update(self.__dict__)
+        clone.game = game
+        clone.controller = game.controller
+        clone.machine = game.controller.machine
+        clone.score_calculator = self.score_calculator.fork()
+        clone._bind()
+        return clone
+    
+    @property
+    def ippatsu_players(self) -> Set[Player]:
+        """处于一发状态的玩家"""
+        return self.machine.ippatsu
+    
+    @property
+    def first_turn(self) -> bool:
+        """是否第一巡"""
+        return self.machine.first_turn
+    
+    @first_turn.setter
+    def first_turn(self, value: bool) -> None:
+        self.machine.first_turn = value
+    
+    @property
+    def first_draw(self) -> bool:
+        """是否第一次摸牌"""
+        return self.machine.first_draw
+    
+    @first_draw.setter
+    def first_draw(self, value: bool) -> None:
+        self.machine.first_draw = value
+    
+    def step(self) -> bool:
+        """推进一次回合阶段转换
+        Returns:
+            bool: 是否发生了转换(需要玩家决策或对局未进行时返回False)
+        """
+        if self.machine.state != GameState.PLAYING:
+            return False
+        handler = self._phase_handlers.get(self.machine.phase)
+        if handler is None:
+            return False
+        return handler()
+    
+    def _step_draw(self) -> bool:
+        """DRAW阶段: 当前玩家摸牌"""
+        player = self.game.table.get_current_player()
+        if not player:
+            return False
+        self.start_turn(player)
+        return True
+    
+    def _step_response(self) -> bool:
+        """RESPONSE阶段: 无人响应时结束回合"""
+        if self.machine.has_responders:
+            return False
+        return self.machine.fire('pass')
+    
+    def _step_end(self) -> bool:
+        """END阶段: 更新巡目标记并轮到下家"""
+        self._update_turn_flags()
+        if self.check_exhaustive_draw():
+            return True
+        self.game.table.next_player()
+        return self.machine.fire('next')
+    
+    def _update_turn_flags(self) -> None:
+        """更新第一巡和第一次摸牌状态"""
+        self.machine.first_draw = False
+        if self.machine.first_turn and all(len(p.discards) > 0 for p in self.game.table.players):
+            self.machine.first_turn = False
     
     def start_turn(self, player: Player) -> None:
         """开始玩家回合"""
@@ -52,9 +126,11 @@ class GameFlow:
             
         # 摸牌
         tile = self.game.table.wall.draw()
+        self.last_drawn_tile = tile
         if tile:
             player.hand.add_tile(tile)
             player.set_state(PlayerState.THINKING)
+            self.machine.fire('draw')
         else:
             # 牌山摸完,进入流局
             self.game.set_state(GameState.FINISHED)
@@ -81,10 +157,11 @@ class GameFlow:
             return
         
         # 添加到玩家的打牌记录
-        player.discards.append(discarded_tile)
+        self._record_discard(player, discarded_tile)
         
         # 设置玩家状态为等待
         player.set_state(PlayerState.WAITING)
+        self.machine.fire('discard')
         
         # 检查其他玩家是否可以吃碰杠
         self.check_other_players_response(player, discarded_tile)
@@ -115,8 +192,7 @@ class GameFlow:
     
     def has_waiting_players(self) -> bool:
         """检查是否有玩家在等待响应"""
-        return any(player.state in [PlayerState.WAITING_CHI, PlayerState.WAITING_PON, PlayerState.WAITING_KAN] 
-                  for player in self.game.table.players)
+        return self.machine.has_responders
     
     def can_pon(self, player: Player, tile: Tile) -> bool:
         """检查玩家是否可以碰"""
@@ -156,6 +232,7 @@ class GameFlow:
             
         # 清除所有玩家的一发状态
         self.clear_ippatsu()
+        self._take_turn(player, 'call')
         return True
     
     def handle_pon(self, player: Player, tiles: List[Tile]) -> bool:
@@ -177,6 +254,7 @@ class GameFlow:
         
         # 清除所有玩家的一发状态
         self.clear_ippatsu()
+        self._take_turn(player, 'call')
         return True
     
     def handle_kan(self, player: Player, tiles: List[Tile]) -> bool:
@@ -200,8 +278,15 @@ class GameFlow:
         if len(self.game.table.wall.dora_indicators) < 5:  # 最多5个宝牌指示牌
             self.game.table.wall.add_dora_indicator()
         
+        self._take_turn(player, 'kan')
         return True
     
+    def _take_turn(self, player: Player, event: str) -> None:
+        """鸣牌后将回合交给鸣牌玩家"""
+        if self.machine.phase == TurnPhase.RESPONSE and player in self.game.table.players:
+            self.game.table.current_player_index = self.game.table.players.index(player)
+        self.machine.fire(event)
+    
     def is_next_player(self, current: Player, target: Player) -> bool:
         """检查target是否是current的下家"""
         current_idx = self.game.table.players.index(current)
@@ -217,11 +302,11 @@ class GameFlow:
             return False
         
         # 检查点数是否足够
-        if player.points < 1000:
+        if player.points < self.profile.riichi_cost:
             return False
         
         # 扣除立直点数
-        player.points -= 1000
+        player.points -= self.profile.riichi_cost
         player.is_riichi = True
         self.score_calculator.add_riichi_stick()
         
@@ -257,6 +342,7 @@ class GameFlow:
         # 获取下一个玩家
         next_player = self.game.table.next_player()
         if next_player:
+            self.machine.fire('next')
             self.start_turn(next_player)
         
         return next_player
@@ -278,17 +364,7 @@ class GameFlow:
     
     def _get_current_priority(self) -> ActionPriority:
         """获取当前最高优先级操作"""
-        highest_priority = ActionPriority.NONE
-        for player in self.game.table.players:
-            if player.state == PlayerState.WAITING_RON:
-                highest_priority = max(highest_priority, ActionPriority.RON)
-            elif player.state == PlayerState.WAITING_KAN:
-                highest_priority = max(highest_priority, ActionPriority.KAN)
-            elif player.state == PlayerState.WAITING_PON:
-                highest_priority = max(highest_priority, ActionPriority.PON)
-            elif player.state == PlayerState.WAITING_CHI:
-                highest_priority = max(highest_priority, ActionPriority.CHI)
-        return highest_priority
+        return self.machine.current_priority
     
     def can_kan(self, player: Player, tile: Tile) -> bool:
         """检查玩家是否可以杠"""
@@ -373,17 +449,14 @@ class GameFlow:
     
     def _clear_waiting_players(self, except_player: Optional[Player] = None) -> None:
         """清除等待玩家状态"""
-        for player in self.game.table.players:
-            if player != except_player and player.state in [
-                PlayerState.WAITING_CHI, 
-                PlayerState.WAITING_PON,
-                PlayerState.WAITING_KAN,
-                PlayerState.WAITING_RON
-            ]:
+        for player in list(self.machine.responders):
+            if player != except_player:
                 player.set_state(PlayerState.WAITING)
     
     def start_dealing(self) -> None:
         """开始发牌"""
+        self.machine.reset_round()
+        
         # 发牌
         for player in self.game.table.players:
             for _ in range(13):
@@ -406,6 +479,7 @@ class GameFlow:
         # 设置游戏状态
         self.game.set_state(GameState.PLAYING)
         self.game.table.get_current_player().set_state(PlayerState.THINKING)
+        self.machine.fire('deal')
     
     def _validate_discard(self, player: Player, tile: Tile) -> bool:
         """验证出牌是否合法
@@ -439,8 +513,9 @@ class GameFlow:
         
         # 移除手牌并添加到弃牌
         player.hand.discard_tile(tile)
-        player.discards.append(tile)
+        self._record_discard(player, tile)
         player.set_state(PlayerState.DISCARDING)
+        self.machine.fire('discard')
         
         # 如果是立直玩家的第二次切牌，清除其一发状态
         if player in self.ippatsu_players:
@@ -451,6 +526,14 @@ class GameFlow:
         self.check_other_players_response(player, tile)
         return True
     
+    def _record_discard(self, player: Player, tile: Tile) -> None:
+        """把打出的牌记入打牌记录与牌河(含摸切与立直宣言牌标记)"""
+        player.discards.append(tile)
+        river = player.river
+        river.add_tile(tile, tile == self.last_drawn_tile)
+        if player.is_riichi and river.riichi_tile_index == -1:
+            river.mark_riichi()
+
     def end_discard_phase(self, player: Player) -> None:
         """结束出牌阶段"""
         if player.state != PlayerState.DISCARDING:
@@ -468,9 +551,8 @@ class GameFlow:
             return
         
         # 更新第一巡和第一次摸牌状态
-        self.first_draw = False
-        if all(len(p.discards) > 0 for p in self.game.table.players):
-            self.first_turn = False
+        self.machine.fire('pass')
+        self._update_turn_flags()
         
         # 切换到下一个玩家
         next_player = self.next_turn()
@@ -648,7 +730,7 @@ class GameFlow:
             player.points += sum(scores.values())
             
             # 验证点数
-            initial_points = sum(p.points for p in players) + self.score_calculator.honba_sticks * 300 + self.score_calculator.riichi_sticks * 1000
+            initial_points = sum(p.points for p in players) + self.score_calculator.honba_sticks * self.profile.honba_value + self.score_calculator.riichi_sticks * self.profile.riichi_cost
             self.score_calculator.validate_points(players, initial_points, result['score'])
             
             # 处理连庄
@@ -843,7 +925,7 @@ class GameFlow:
                 player.points += sum(scores.values())
                 
                 # 验证点数
-                initial_points = sum(p.points for p in self.game.table.players) + self.score_calculator.honba_sticks * 300 + self.score_calculator.riichi_sticks * 1000
+                initial_points = sum(p.points for p in self.game.table.players) + self.score_calculator.honba_sticks * self.profile.honba_value + self.score_calculator.riichi_sticks * self.profile.riichi_cost
                 self.score_calculator.validate_points(self.game.table.players, initial_points, result['score'])
                 
                 # 处理连庄
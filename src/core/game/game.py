@@ -1,64 +1,57 @@
-import json
-from pathlib import Path
 from typing import List, Dict, Any, Optional
 from ..player import Player
+from ..tile import Tile
 from ..rules import Rules
 from .state import GameState
 from ..table import Table
 from .controller import GameController
 from .flow import GameFlow
 from ..player.state import PlayerState
-from ..events import EventEmitter
-import os
+from ..common.config import get_config
+from ..rules.profile import RuleProfile, default_profile
+from .driver import GameDriver
+from ..tile.zobrist import PHASE as PHASE_KEYS
+from .view import GameView, ViewCache
+from . import snapshot as _snapshot
+from .. import metrics as _metrics
+from .. import profiling as _profiling
 
 class Game:
-    def __init__(self):
+    def __init__(self, profile: Optional[RuleProfile] = None):
+        """
+        Args:
+            profile: 规则配置,为 None 时使用配置文件编译的默认规则
+        """
+        self.profile = profile or default_profile()
         self.table = Table()
-        self.controller = GameController(self.table)
+        self.controller = GameController(self.table, self.profile)
         self.rules = Rules()
-        self.config: Dict[str, Any] = {}
-        self._load_config()
+        self.settings = get_config()  # 进程级共享的只读配置
+        self.config: Dict[str, Any] = self.settings.game
         self.flow = GameFlow(self)
-        self.events = EventEmitter()
+        self.events = self.controller.events  # 与控制器共用同一事件总线
+        self.wall_order: Optional[List[Tile]] = None  # 预设牌序(回放时使用),为 None 时随机洗牌
+        self._views: Optional[ViewCache] = None  # 各座位视图(首次使用时创建)
+        self.trace = None  # 追踪句柄(trace.TableTrace),为 None 时不计时
+        profiler = _profiling.from_environment()
+        self.profiling = profiler.table() if profiler else None  # 剖析句柄(profiling.TableProfile,各对局共用默认牌桌)
         
     @property
     def players(self):
         """获取玩家列表"""
         return self.table.players
         
-    def _load_config(self) -> None:
-        """加载游戏配置"""
-        try:
-            # 获取assets/config目录的路径
-            config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                      'assets', 'config', 'rule.json')
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
-        except Exception as e:
-            print(f"加载游戏配置失败: {e}")
-            # 使用默认配置
-            self.config = {
-                "version": "1.0.0",
-                "player_count": 4,
-                "initial_points": 25000,
-                "rules": {
-                    "has_aka_dora": True,
-                    "has_open_tanyao": True,
-                    "has_double_yakuman": False
-                }
-            }
-            
     def get_player_count(self) -> int:
         """获取玩家数量"""
-        return self.config.get("player_count", 4)
+        return self.profile.player_count
         
     def get_initial_points(self) -> int:
         """获取初始点数"""
-        return self.config.get("initial_points", 25000)
+        return self.profile.initial_points
         
     def get_version(self) -> str:
         """获取游戏版本"""
-        return self.config.get("version", "1.0.0")
+        return self.settings.version
         
     def initialize(self) -> bool:
         """初始化游戏"""
@@ -74,7 +67,7 @@ class Game:
                 self.table.add_player(player)
             
             # 初始化牌山并发牌
-            self.table.wall.initialize()
+            self.table.wall.initialize(self.wall_order)
             for player in self.players:
                 for _ in range(13):  # 每个玩家发13张牌
                     tile = self.table.wall.draw()
@@ -101,6 +94,74 @@ class Game:
         if current_player and current_player.state == PlayerState.WAITING:
             self.flow.start_turn(current_player)
         
+    def play(self):
+        """以生成器方式驱动一局游戏
+        
+        产出 GameEvent(对局事件)与 DecisionRequest(需要玩家决策),
+        对 DecisionRequest 通过 send(Action) 回传操作。
+        
+        Returns:
+            Generator: 结束时返回各玩家点数
+        """
+        return GameDriver(self).run()
+        
+    def stats(self) -> _metrics.MetricsSnapshot:
+        """热点路径的计数与耗时直方图(进程级,需先调用 metrics.enable())"""
+        return _metrics.snapshot()
+        
+    def view(self, seat: int) -> GameView:
+        """座位 seat 可见的对局视图(缓存,读取时按状态键刷新,不依赖 GameDriver 的事件)"""
+        if self._views is None:
+            self._views = ViewCache(self)
+        return self._views.view(seat)
+        
+    @property
+    def zobrist(self) -> int:
+        """局面的64位 Zobrist 哈希(牌桌状态加回合阶段),可作为置换表的键"""
+        return self.table.zobrist ^ PHASE_KEYS[self.controller.machine.phase]
+        
+    def snapshot(self, include_order: bool = True) -> bytes:
+        """编码对局状态(不含事件总线、日志等运行时对象,通常几百字节)
+        
+        Args:
+            include_order: 是否包含完整牌序
+        Returns:
+            bytes: 状态编码,可通过 restore() 恢复
+        """
+        return _snapshot.snapshot(self, include_order)
+        
+    def fork(self) -> 'Game':
+        """复制对局用于搜索等场景
+        
+        规则、配置、役种判定器、牌对象与牌序等不可变部分与原对局共享,
+        只复制牌山、手牌、牌河、点数等可变状态。复制出的对局有独立的
+        事件总线(不带原对局的外部监听),之后双方的修改互不影响。
+        
+        Returns:
+            Game: 复制出的对局,可通过 play() 从当前状态继续
+        """
+        clone = Game.__new__(Game)
+        clone.__dict__.update(self.__dict__)
+        clone.table = self.table.fork()
+        clone.controller = self.controller.fork(clone.table)
+        clone.events = clone.controller.events
+        clone.flow = self.flow.fork(clone)
+        clone._views = None
+        clone.trace = None
+        clone.profiling = None
+        return clone
+        
+    def restore(self, data: bytes, order: Optional[List[Tile]] = None) -> None:
+        """从 snapshot() 的编码原地恢复对局状态
+        
+        Args:
+            data: 状态编码
+            order: 编码不含牌序时使用的牌序
+        """
+        _snapshot.restore(self, data, order)
+        if self._views is not None:
+            self._views.invalidate()
+        
     def get_state(self) -> GameState:
         """获取当前游戏状态"""
         return self.controller.state
@@ -0,0 +1,140 @@
+from typing import Dict, Optional, Set, Tuple
+from src.core.game.state import GameState, TurnPhase, ActionPriority
+from src.core.player.state import PlayerState
+
+# 回合阶段转换表: (当前阶段, 事件) -> 下一阶段
+TRANSITIONS: Dict[Tuple[TurnPhase, str], TurnPhase] = {
+    (TurnPhase.IDLE, 'deal'): TurnPhase.DISCARD,        # 发牌完成,庄家出牌
+    (TurnPhase.IDLE, 'start'): TurnPhase.DRAW,          # 对局开始,庄家摸牌
+    (TurnPhase.DRAW, 'draw'): TurnPhase.DISCARD,        # 摸牌后等待出牌
+    (TurnPhase.DISCARD, 'discard'): TurnPhase.RESPONSE, # 出牌后等待响应
+    (TurnPhase.DISCARD, 'kan'): TurnPhase.DISCARD,      # 暗杠/加杠后继续出牌
+    (TurnPhase.RESPONSE, 'call'): TurnPhase.DISCARD,    # 吃碰后由鸣牌者出牌
+    (TurnPhase.RESPONSE, 'kan'): TurnPhase.DISCARD,     # 大明杠后由鸣牌者出牌
+    (TurnPhase.RESPONSE, 'pass'): TurnPhase.END,        # 无人响应
+    (TurnPhase.END, 'next'): TurnPhase.DRAW,            # 轮到下家摸牌
+}
+
+# 等待响应的玩家状态对应的操作优先级
+RESPONSE_PRIORITY: Dict[PlayerState, ActionPriority] = {
+    PlayerState.WAITING_CHI: ActionPriority.CHI,
+    PlayerState.WAITING_PON: ActionPriority.PON,
+    PlayerState.WAITING_KAN: ActionPriority.KAN,
+    PlayerState.WAITING_RON: ActionPriority.RON,
+}
+
+
+class GameStateMachine:
+    """游戏状态机
+
+    统一保存对局状态、回合阶段、一发/第一巡标记以及等待响应的玩家,
+    GameController 与 GameFlow 共享同一个实例。
+    等待响应的玩家通过玩家状态回调增量维护,查询为 O(1)。
+    """
+
+    def __init__(self, table=None):
+        self._state = GameState.WAITING
+        self.phase = TurnPhase.IDLE
+        self.first_turn = True   # 是否第一巡
+        self.first_draw = True   # 是否第一次摸牌
+        self.ippatsu: Set = set()  # 处于一发状态的玩家
+        self.riichi_declared = None  # 已宣言立直、尚未打出宣言牌的玩家
+        self.responders: Dict = {}  # 等待响应的玩家 -> 操作优先级
+        self.available_actions: Dict = {}  # 等待响应的玩家 -> 可选操作集合
+        self._priority_counts = [0] * len(ActionPriority)
+        if table is not None:
+            self.attach(table)
+
+    def attach(self, table) -> None:
+        """挂接到牌桌,跟踪所有玩家的状态变化"""
+        table.player_state_observer = self.on_player_state
+        for player in table.players:
+            player.state_observer = self.on_player_state
+            self.on_player_state(player, None, player.state)
+
+    def fork(self, table, players) -> 'GameStateMachine':
+        """复制状态机并挂接到复制出的牌桌
+
+        Args:
+            table: 复制出的牌桌
+            players: 原牌桌上的玩家,与 table.players 按座位一一对应
+        """
+        clone = GameStateMachine.__new__(GameStateMachine)
+        clone.__dict__.update(self.__dict__)
+        seats = dict(zip(map(id, players), table.players))
+        seats[id(None)] = None
+        clone.ippatsu = {seats[id(player)] for player in self.ippatsu}
+        clone.riichi_declared = seats[id(self.riichi_declared)]
+        clone.responders = {seats[id(player)]: priority for player, priority in self.responders.items()}
+        clone.available_actions = {seats[id(player)]: set(actions)
+                                   for player, actions in self.available_actions.items()}
+        clone._priority_counts = list(self._priority_counts)
+        table.player_state_observer = clone.on_player_state
+        for player in table.players:
+            player.state_observer = clone.on_player_state
+        return clone
+
+    @property
+    def state(self) -> GameState:
+        """对局状态"""
+        return self._state
+
+    @state.setter
+    def state(self, state: GameState) -> None:
+        self._state = state
+        if state != GameState.PLAYING:
+            self.phase = TurnPhase.IDLE
+
+    def can_fire(self, event: str) -> bool:
+        """检查当前阶段是否接受该事件"""
+        return (self.phase, event) in TRANSITIONS
+
+    def fire(self, event: str) -> bool:
+        """触发阶段转换
+
+        Args:
+            event: 转换事件名
+        Returns:
+            bool: 是否发生了转换(当前阶段不接受该事件时保持不变)
+        """
+        next_phase = TRANSITIONS.get((self.phase, event))
+        if next_phase is None:
+            return False
+        self.phase = next_phase
+        return True
+
+    def on_player_state(self, player, old: Optional[PlayerState], new: PlayerState) -> None:
+        """玩家状态变化回调,增量维护等待响应的玩家"""
+        previous = self.responders.pop(player, None)
+        if previous is not None:
+            self._priority_counts[previous] -= 1
+        priority = RESPONSE_PRIORITY.get(new)
+        if priority is not None:
+            self.responders[player] = priority
+            self._priority_counts[priority] += 1
+        else:
+            self.available_actions.pop(player, None)
+
+    @property
+    def has_responders(self) -> bool:
+        """是否有玩家在等待响应"""
+        return bool(self.responders)
+
+    @property
+    def current_priority(self) -> ActionPriority:
+        """当前等待响应中的最高优先级"""
+        counts = self._priority_counts
+        for priority in range(len(counts) - 1, 0, -1):
+            if counts[priority]:
+                return ActionPriority(priority)
+        return ActionPriority.NONE
+
+    def reset_round(self) -> None:
+        """重置一局内的状态标记"""
+        self.phase = TurnPhase.IDLE
+        self.first_turn = True
+        self.first_draw = True
+        self.ippatsu.clear()
+        self.riichi_declared = None
+        self.available_actions.clear()
+
@@ -1,13 +1,23 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from src.core.player import Player
+from src.core.rules.profile import RuleProfile, STANDARD
 
 class ScoreCalculator:
     """点数计算器"""
     
-    def __init__(self):
+    def __init__(self, profile: Optional[RuleProfile] = None):
         self.riichi_sticks = 0  # 立直棒数量
         self.honba_sticks = 0   # 本场数
         self.is_dealer_win = False  # 是否庄家和牌
+        self.profile = profile or STANDARD  # 未指定时使用内置标准规则
+        self.riichi_cost = self.profile.riichi_cost  # 立直棒点数
+        self.honba_value = self.profile.honba_value  # 每本场点数
+        
+    def fork(self) -> 'ScoreCalculator':
+        """复制供托与本场状态"""
+        clone = ScoreCalculator.__new__(ScoreCalculator)
+        clone.__dict__.update(self.__dict__)
+        return clone
         
     def calculate_win_score(self, total: int, is_dealer: bool, is_tsumo: bool, players: List[Player]) -> Dict[str, int]:
         """计算和牌点数
@@ -22,7 +32,7 @@ class ScoreCalculator:
                 - 'non_dealer': 闲家支付点数
                 - 'total': 总点数
         """
-        initial_points = sum(player.points for player in players) + self.honba_sticks * 300 + self.riichi_sticks * 1000
+        initial_points = sum(player.points for player in players) + self.honba_sticks * self.honba_value + self.riichi_sticks * self.riichi_cost
         print(f"计算初始点数: {initial_points}")  # 调试输出
         
         if is_tsumo:
@@ -30,7 +40,7 @@ class ScoreCalculator:
                 # 庄家自摸，所有人支付相同点数
                 payment = total / 3  # 三家支付相同的点数
                 # 收取立直棒并清零
-                total += self.collect_riichi_sticks() * 1000  # 收取立直棒
+                total += self.collect_riichi_sticks() * self.riichi_cost  # 收取立直棒
                 self.riichi_sticks = 0  # 清零立直棒
                 return {
                     'dealer': 0,
@@ -42,7 +52,7 @@ class ScoreCalculator:
                 dealer_payment = total / 2
                 non_dealer_payment = total / 4
                 # 收取立直棒并清零
-                total += self.collect_riichi_sticks() * 1000  # 收取立直棒
+                total += self.collect_riichi_sticks() * self.riichi_cost  # 收取立直棒
                 self.riichi_sticks = 0  # 清零立直棒
                 return {
                     'dealer': dealer_payment,
@@ -53,12 +63,12 @@ class ScoreCalculator:
             # 荣和，放铳者支付全部点数
             payment = total
             # 收取立直棒和场棒并清零
-            total += self.collect_riichi_sticks() * 1000  # 收取立直棒
-            total += self.honba_sticks * 300  # 收取场棒
+            total += self.collect_riichi_sticks() * self.riichi_cost  # 收取立直棒
+            total += self.honba_sticks * self.honba_value  # 收取场棒
             self.honba_sticks = 0  # 清零场棒
             
             # 计算点数
-            current_points = sum(player.points for player in players) + self.honba_sticks * 300 + self.riichi_sticks * 1000
+            current_points = sum(player.points for player in players) + self.honba_sticks * self.honba_value + self.riichi_sticks * self.riichi_cost
             print(f"计算当前点数: {current_points}")  # 调试输出
 
             # 返回点数
@@ -75,7 +85,7 @@ class ScoreCalculator:
             initial_points: 初始点数总和
             total: 当前点数总和
         """
-        current_points = sum(player.points for player in players) + self.honba_sticks * 300 + self.riichi_sticks * 1000
+        current_points = sum(player.points for player in players) + self.honba_sticks * self.honba_value + self.riichi_sticks * self.riichi_cost
         if current_points != initial_points:
             raise ValueError(f"点数验证失败: 初始点数总和 {initial_points} 与当前点数总和 {current_points} 不一致。计算点数{total}")
 
@@ -93,14 +103,7 @@ class ScoreCalculator:
         # 计算顺位点
         results = {}
         for i, player in enumerate(sorted_players):
-            if i == 0:  # 一位
-                results[player.name] = player.points + 30000
-            elif i == 1:  # 二位
-                results[player.name] = player.points + 10000
-            elif i == 2:  # 三位
-                results[player.name] = player.points - 10000
-            else:  # 四位
-                results[player.name] = player.points - 30000
+            results[player.name] = player.points + self.profile.uma_for_rank(i)
                 
             # 如果是庄家和牌,连庄
             if is_dealer_win and player == players[0]:
@@ -155,7 +158,7 @@ class ScoreCalculator:
             
         # 平分立直棒
         sticks = self.collect_riichi_sticks()
-        points_per_player = (sticks * 1000) // len(players)
+        points_per_player = (sticks * self.riichi_cost) // len(players)
         for player in players:
             player.points += points_per_player
         
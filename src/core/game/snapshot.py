@@ -0,0 +1,232 @@
+"""对局状态的紧凑二进制编码
+
+只编码对局相关的可变状态: 牌山位置、宝牌、手牌、副露、牌河、点数、供托、
+回合阶段与一发/第一巡等标记,不包含事件总线、日志、向听计算器等运行时对象。
+
+布局(各段依次排列):
+    _HEADER | _STICKS | _WALL | _PLAYER × 人数
+    牌序(可选): 长度 uint8 + 代码
+    等待响应的座位: 人数 uint8 + 座位(按响应顺序)
+    牌列表长度: 个数 uint8 + 长度 uint8 × N
+    牌代码: 其余所有牌列表依次拼接(每张1字节,见 tile.codec)
+    摸切标志: 每张河牌1字节
+牌列表依次为宝牌指示牌、里宝牌指示牌,以及每名玩家的手牌、各副露、
+舍牌、牌河(与舍牌相同时省略)、听牌、本巡打出的牌。所有牌一次解码后按长度切分。
+手牌按原顺序保存,恢复后赤五与普通五的相对位置不变。
+"""
+import struct
+from itertools import accumulate, chain
+from typing import List, Optional, Sequence
+from ..common.wind import Wind
+from ..player import Player
+from ..player.state import PlayerState
+from ..tile import Tile
+from ..tile.codec import tile_code, tile_from_code, tiles_from_bytes, tiles_to_bytes
+from .state import ActionPriority, GameState, TurnPhase
+
+VERSION = 2
+
+HAS_ORDER = 0x01         # 包含完整牌序
+URADORA_REVEALED = 0x02  # 已翻开里宝牌
+
+# 版本 | 标志 | 对局状态 | 回合阶段 | 巡目标记 | 一发座位掩码 | 当前座位 | 庄家 | 局数 | 场风 | 立直宣言座位(-1为无)
+_HEADER = struct.Struct('<BBBBBBBBBBb')
+# 立直棒与本场数(流程与控制器各持有一个计分器)
+_STICKS = struct.Struct('<HHHH')
+# 已摸牌数 | 牌山剩余张数 | 剩余计数 | 最近摸到的牌 | 人数
+_WALL = struct.Struct('<BBBbB')
+# 点数 | 玩家状态 | 风位(-1为未分配) | 标志 | 立直宣言牌位置 | 可选操作掩码 | 副露数
+_PLAYER = struct.Struct('<iBbBbBB')
+
+# 整数 -> 枚举(避免恢复时调用枚举构造)
+_GAME_STATES = {int(state): state for state in GameState}
+_PHASES = {int(phase): phase for phase in TurnPhase}
+_PLAYER_STATES = {int(state): state for state in PlayerState}
+_WINDS = {int(wind): wind for wind in Wind}
+_PRIORITIES = tuple(ActionPriority)
+
+
+def snapshot(game, include_order: bool = True) -> bytes:
+    """编码对局状态
+
+    Args:
+        game: 对局
+        include_order: 是否包含完整牌序(回放关键帧中牌序已知,可省略)
+    Returns:
+        bytes: 状态编码
+    """
+    table = game.table
+    wall = table.wall
+    machine = game.controller.machine
+    flow = game.flow
+    players = table.players
+    seats = {player: seat for seat, player in enumerate(players)}
+
+    flags = HAS_ORDER if include_order else 0
+    if wall.dora_manager.revealed_uradora:
+        flags |= URADORA_REVEALED
+    # 巡目标记位: 状态机的第一巡/第一次摸牌,流程的天和/地和/人和
+    turn = (machine.first_turn | machine.first_draw << 1 | flow.is_tenhou << 2
+            | flow.is_chiihou << 3 | flow.is_renhou << 4)
+    ippatsu = 0
+    for player in machine.ippatsu:
+        ippatsu |= 1 << seats[player]
+    declared = machine.riichi_declared
+
+    parts = [_HEADER.pack(VERSION, flags, machine.state, machine.phase, turn, ippatsu,
+                          table.current_player_index, table.dealer_index, table.round,
+                          table.round_wind, -1 if declared is None else seats[declared]),
+             _STICKS.pack(flow.score_calculator.riichi_sticks, flow.score_calculator.honba_sticks,
+                          game.controller.score_calculator.riichi_sticks,
+                          game.controller.score_calculator.honba_sticks),
+             _WALL.pack(wall.drawn, len(wall.tiles), wall.remaining_count,
+                        tile_code(flow.last_drawn_tile), len(players))]
+
+    lists = [wall.dora_indicators, wall.uradora_indicators]
+    tsumogiri = []
+    available = machine.available_actions
+    for player in players:
+        furiten = player.furiten
+        river = player.river
+        same_river = river.tiles == player.discards
+        pflags = (player.is_riichi | player.is_furiten << 1 | furiten.is_furiten << 2
+                  | furiten.is_riichi_furiten << 3 | furiten.is_temporary_furiten << 4
+                  | same_river << 5)
+        actions = 0
+        if player in available:
+            for action in available[player]:
+                actions |= 1 << action
+        wind = player.seat_wind
+        hand = player.hand
+        parts.append(_PLAYER.pack(player.points, player.state, -1 if wind is None else wind, pflags,
+                                  river.riichi_tile_index, actions, len(hand.melds)))
+        lists.append(hand.tiles)
+        lists += hand.melds
+        lists.append(player.discards)
+        if not same_river:
+            lists.append(river.tiles)
+        lists += (hand.waiting_tiles, furiten.current_turn_tiles)
+        tsumogiri += river.tsumogiri
+
+    if include_order:
+        order = wall.to_bytes()
+        parts += (bytes((len(order),)), order)
+    responders = [seats[player] for player in machine.responders]
+    lengths = list(map(len, lists))
+    parts += (bytes((len(responders),)), bytes(responders), bytes((len(lengths),)), bytes(lengths),
+              tiles_to_bytes(list(chain.from_iterable(lists))), bytes(tsumogiri))
+    return b''.join(parts)
+
+
+def restore(game, data: bytes, order: Optional[Sequence[Tile]] = None) -> None:
+    """把 snapshot() 的编码恢复到对局中(原地修改)
+
+    Args:
+        game: 对局(玩家数不一致时重新创建玩家)
+        data: 状态编码
+        order: 编码不含牌序时使用的牌序,为 None 时沿用牌山当前的牌序
+    Raises:
+        ValueError: 编码版本不支持或已损坏
+    """
+    (version, flags, state, phase, turn, ippatsu, current, dealer,
+     round_number, round_wind, declared) = _HEADER.unpack_from(data, 0)
+    if version != VERSION:
+        raise ValueError(f"不支持的状态编码版本: {version}")
+    pos = _HEADER.size
+    sticks = _STICKS.unpack_from(data, pos)
+    pos += _STICKS.size
+    drawn, count, remaining, last_drawn, player_count = _WALL.unpack_from(data, pos)
+    pos += _WALL.size
+    fields = list(struct.iter_unpack(_PLAYER.format, data[pos:pos + _PLAYER.size * player_count]))
+    pos += _PLAYER.size * player_count
+
+    table = game.table
+    wall = table.wall
+    machine = game.controller.machine
+    flow = game.flow
+
+    if flags & HAS_ORDER:
+        end = pos + 1 + data[pos]
+        codes = data[pos + 1:end]
+        pos = end
+        order = wall.order if codes == wall.to_bytes() else tiles_from_bytes(codes)
+    elif order is None:
+        order = wall.order
+    end = pos + 1 + data[pos]
+    responders = data[pos + 1:end]
+    pos = end + 1
+    end = pos + data[end]
+    bounds = list(accumulate(data[pos:end], initial=0))
+    pos = end + bounds[-1]
+    tiles = tiles_from_bytes(data[end:pos])
+    if len(tiles) != bounds[-1]:
+        raise ValueError("状态编码已损坏")
+    lists = map(tiles.__getitem__, map(slice, bounds, bounds[1:]))
+
+    wall.restore(order, drawn, count, remaining)
+    dora = wall.dora_manager
+    dora.dora_indicators = next(lists)
+    dora.uradora_indicators = next(lists)
+    dora.revealed_uradora = bool(flags & URADORA_REVEALED)
+    dora.rehash()
+
+    players: List[Player] = table.players
+    if len(players) != player_count:
+        players.clear()
+        for i in range(player_count):
+            table.add_player(Player(f"Player_{i + 1}"))
+    for player in list(machine.responders):
+        player.state = PlayerState.WAITING  # 先清空等待响应的玩家
+
+    machine.state = _GAME_STATES[state]
+    machine.phase = _PHASES[phase]
+    machine.first_turn = bool(turn & 0x01)
+    machine.first_draw = bool(turn & 0x02)
+    flow.is_tenhou = bool(turn & 0x04)
+    flow.is_chiihou = bool(turn & 0x08)
+    flow.is_renhou = bool(turn & 0x10)
+    machine.ippatsu.clear()
+    if ippatsu:
+        machine.ippatsu.update(p for seat, p in enumerate(players) if ippatsu & (1 << seat))
+    machine.riichi_declared = None if declared < 0 else players[declared]
+    available = machine.available_actions
+    available.clear()
+    table.current_player_index = current
+    table.dealer_index = dealer
+    table.round = round_number
+    table.round_wind = round_wind
+    flow.last_drawn_tile = tile_from_code(last_drawn)
+    (flow.score_calculator.riichi_sticks, flow.score_calculator.honba_sticks,
+     game.controller.score_calculator.riichi_sticks,
+     game.controller.score_calculator.honba_sticks) = sticks
+
+    for seat, (player, (points, pstate, wind, pflags, riichi_index, actions, meld_count)) in enumerate(zip(players, fields)):
+        player.points = points
+        player.seat_wind = None if wind < 0 else _WINDS[wind]
+        player.is_riichi = bool(pflags & 0x01)
+        player.is_furiten = bool(pflags & 0x02)
+        furiten = player.furiten
+        furiten.is_furiten = bool(pflags & 0x04)
+        furiten.is_riichi_furiten = bool(pflags & 0x08)
+        furiten.is_temporary_furiten = bool(pflags & 0x10)
+        if actions:
+            available[player] = {p for p in _PRIORITIES if actions & (1 << p)}
+        hand = player.hand
+        hand.tiles = next(lists)
+        hand.melds = [next(lists) for _ in range(meld_count)]
+        hand.invalidate()
+        player.discards = next(lists)
+        river = player.river
+        river.tiles = list(player.discards) if pflags & 0x20 else next(lists)
+        end = pos + len(river.tiles)
+        river.tsumogiri = list(map(bool, data[pos:end]))
+        pos = end
+        river.riichi_tile_index = riichi_index
+        hand.waiting_tiles = next(lists)
+        furiten.current_turn_tiles = next(lists)
+        if seat not in responders:
+            player.state = _PLAYER_STATES[pstate]
+
+    # 等待响应的玩家按原顺序最后设置,保持状态机中的响应顺序
+    for seat in responders:
+        players[seat].state = _PLAYER_STATES[fields[seat][1]]
@@ -14,4 +14,12 @@ class ActionPriority(IntEnum):
     PON = 2    # 碰
     KAN = 3    # 杠
     RON = 4    # 荣和
-    TSUMO = 5  # 自摸
\ No newline at end of file
+    TSUMO = 5  # 自摸
+
+class TurnPhase(IntEnum):
+    """回合阶段(仅在 GameState.PLAYING 下有意义)"""
+    IDLE = 0        # 非对局中
+    DRAW = 1        # 当前玩家摸牌
+    DISCARD = 2     # 等待当前玩家出牌
+    RESPONSE = 3    # 等待其他玩家响应(吃碰杠荣)
+    END = 4         # 回合结束,轮到下家
@@ -0,0 +1,231 @@
+"""按座位裁剪的对局视图
+
+视图直接引用实时对局数据,只在访问时屏蔽其他玩家的手牌、听牌与振听等隐藏信息,
+不复制整个 Player。列表类数据以元组形式缓存(各座位共享同一份),
+每份缓存记下生成时的状态键(手牌的 Zobrist 哈希、牌河与宝牌指示牌的张数),
+键不变时在多次决策之间重复使用,因此不经过 GameDriver 直接推进引擎也不会读到旧数据。
+"""
+from collections.abc import Mapping
+from typing import Any, Iterator, List, Optional, Tuple
+from ..tile import Tile
+
+# 观测中的键(与 GameView 的属性同名)
+_KEYS = ('seat', 'hand', 'melds', 'discards', 'riichi', 'scores',
+         'dora_indicators', 'remaining', 'round_wind', 'drawn')
+
+
+class PlayerView:
+    """从某个座位看到的一名玩家
+
+    点数、立直、风位等公开信息直接读取实时数据; 手牌、听牌与振听
+    只对本人可见,对其他座位只公开手牌张数。
+    """
+    __slots__ = ('seat', 'visible', '_player', '_cache')
+
+    def __init__(self, player, seat: int, visible: bool, cache: 'ViewCache'):
+        self.seat = seat
+        self.visible = visible  # 是否为观察者本人
+        self._player = player
+        self._cache = cache
+
+    @property
+    def name(self) -> str:
+        return self._player.name
+
+    @property
+    def points(self) -> int:
+        return self._player.points
+
+    @property
+    def is_riichi(self) -> bool:
+        return self._player.is_riichi
+
+    @property
+    def seat_wind(self):
+        return self._player.seat_wind
+
+    @property
+    def hand_size(self) -> int:
+        """门内手牌张数(公开)"""
+        return len(self._player.hand.tiles)
+
+    @property
+    def hand(self) -> Optional[Tuple[Tile, ...]]:
+        """门内手牌(其他座位为 None)"""
+        if not self.visible:
+            return None
+        hand = self._player.hand
+        key = hand.zobrist
+        entry = self._cache.hands[self.seat]
+        if entry is None or entry[0] != key:
+            entry = self._cache.hands[self.seat] = (key, tuple(hand.tiles))
+        return entry[1]
+
+    @property
+    def melds(self) -> Tuple[Tuple[Tile, ...], ...]:
+        hand = self._player.hand
+        key = hand.zobrist
+        entry = self._cache.melds[self.seat]
+        if entry is None or entry[0] != key:
+            entry = self._cache.melds[self.seat] = (key, tuple(map(tuple, hand.melds)))
+        return entry[1]
+
+    @property
+    def discards(self) -> Tuple[Tile, ...]:
+        discards = self._player.discards
+        value = self._cache.discards[self.seat]
+        if value is None or len(value) != len(discards):  # 牌河在一局内只增不减
+            value = self._cache.discards[self.seat] = tuple(discards)
+        return value
+
+    @property
+    def waiting_tiles(self) -> Optional[Tuple[Tile, ...]]:
+        """听牌(其他座位为 None)"""
+        return tuple(self._player.hand.waiting_tiles) if self.visible else None
+
+    @property
+    def is_furiten(self) -> Optional[bool]:
+        """是否振听(其他座位为 None)"""
+        return self._player.is_furiten if self.visible else None
+
+    def __repr__(self):
+        return f"PlayerView(seat={self.seat}, visible={self.visible})"
+
+
+class GameView(Mapping):
+    """从某个座位看到的对局
+
+    同时是只读的 Mapping,键与旧的观测字典一致('hand'、'discards' 等),
+    可直接作为 DecisionRequest.observation 使用。值在访问时读取,
+    反映访问时的对局状态。
+    """
+    __slots__ = ('seat', 'players', '_game', '_cache')
+
+    def __init__(self, game, seat: int, players: Tuple[PlayerView, ...], cache: 'ViewCache'):
+        self.seat = seat
+        self.players = players  # 各座位的 PlayerView(只有本人可见手牌)
+        self._game = game
+        self._cache = cache
+
+    @property
+    def me(self) -> PlayerView:
+        return self.players[self.seat]
+
+    @property
+    def hand(self) -> Tuple[Tile, ...]:
+        return self.players[self.seat].hand
+
+    @property
+    def melds(self) -> Tuple[Tuple[Tile, ...], ...]:
+        return self.players[self.seat].melds
+
+    @property
+    def discards(self) -> Tuple[Tuple[Tile, ...], ...]:
+        return tuple(view.discards for view in self.players)
+
+    @property
+    def riichi(self) -> Tuple[bool, ...]:
+        return tuple(view.is_riichi for view in self.players)
+
+    @property
+    def scores(self) -> Tuple[int, ...]:
+        return tuple(view.points for view in self.players)
+
+    @property
+    def dora_indicators(self) -> Tuple[Tile, ...]:
+        indicators = self._game.table.wall.dora_indicators
+        cache = self._cache
+        if cache.dora is None or len(cache.dora) != len(indicators):
+            cache.dora = tuple(indicators)
+        return cache.dora
+
+    @property
+    def remaining(self) -> int:
+        return self._game.table.wall.remaining_count
+
+    @property
+    def round_wind(self) -> int:
+        return self._game.table.round_wind
+
+    @property
+    def turn(self) -> int:
+        """当前行动的座位"""
+        return self._game.table.current_player_index
+
+    @property
+    def drawn(self) -> Optional[Tile]:
+        """本人刚摸到的牌(不是本人的回合时为 None)"""
+        if self._game.table.current_player_index != self.seat:
+            return None
+        return self._game.flow.last_drawn_tile
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+    def __repr__(self):
+        return f"GameView(seat={self.seat})"
+
+
+class ViewCache:
+    """各座位视图的缓存
+
+    视图对象在一局内复用; 手牌/副露/舍牌/宝牌的元组缓存在读取时与状态键
+    比较,引擎经由 Hand、牌河与宝牌指示牌的正常修改都会使键变化。
+    新的一局(deal)时整体重建。绕过这些接口直接替换列表
+    (如 Game.restore)后需调用 invalidate()。
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self._views: List[Optional[GameView]] = []
+        self.hands: List[Optional[tuple]] = []     # (手牌哈希, 手牌元组)
+        self.melds: List[Optional[tuple]] = []     # (手牌哈希, 副露元组)
+        self.discards: List[Optional[tuple]] = []
+        self.dora: Optional[tuple] = None
+        events = game.events
+        events.on("deal", self._on_reset)
+        events.on("round_end", self._on_reset)
+        self.invalidate()
+
+    def detach(self) -> None:
+        """从事件总线移除"""
+        events = self.game.events
+        events.off("deal", self._on_reset)
+        events.off("round_end", self._on_reset)
+
+    def view(self, seat: int) -> GameView:
+        """座位 seat 的视图(缓存)"""
+        view = self._views[seat] if seat < len(self._views) else None
+        if view is None:
+            players = self.game.table.players
+            if len(self._views) != len(players):
+                self.invalidate()
+            view = GameView(self.game, seat, tuple(PlayerView(player, index, index == seat, self)
+                                                   for index, player in enumerate(players)), self)
+            self._views[seat] = view
+        return view
+
+    def invalidate(self, seat: Optional[int] = None) -> None:
+        """使缓存失效(seat 为 None 时连同视图对象一起重建)"""
+        if seat is None:
+            count = len(self.game.table.players)
+            self._views = [None] * count
+            self.hands = [None] * count
+            self.melds = [None] * count
+            self.discards = [None] * count
+            self.dora = None
+            return
+        self.hands[seat] = None
+        self.melds[seat] = None
+        self.discards[seat] = None
+
+    def _on_reset(self, *args) -> None:
+        self.invalidate()
@@ -1,32 +1,116 @@
 from typing import List, Optional, Union, Dict
 from ..tile import Tile, TileSuit
-from mahjong.shanten import Shanten
-from src.core.yaku.judger import YakuJudger
+from ..tile.codec import tile_code, tiles_to_bytes
+from ..tile import zobrist
 import logging
 
+_judger = None  # check_yaku 使用的判定器(首次使用时创建)
+
+
+class _SharedShanten:
+    """Hand.shanten: 首次访问时导入 mahjong 并创建共用的 Shanten(没有状态),
+    之后把类属性替换为该实例,不再经过描述符"""
+
+    def __get__(self, instance, owner):
+        from mahjong.shanten import Shanten
+        shanten = Shanten()
+        Hand.shanten = shanten
+        return shanten
+
+
 class Hand:
+    logger = logging.getLogger(__name__)
+    shanten = _SharedShanten()  # 向听计算器(所有手牌共用)
+
     def __init__(self, player=None):
         """初始化手牌"""
         self.tiles: List[Tile] = []
         self.melds: List[List[Tile]] = []  # 副露
         self.waiting_tiles: List[Tile] = []  # 听牌列表
-        self.shanten = Shanten()
         self.player = player
-        self.logger = logging.getLogger(__name__)
+        self._counts: Optional[bytearray] = bytearray(0x80)  # 各牌代码的张数(None表示哈希需要重算)
+        self._zobrist = 0
+        
+    @property
+    def zobrist(self) -> int:
+        """手牌(门内牌张数与副露)的64位 Zobrist 哈希,与牌的顺序无关"""
+        if self._counts is None:
+            self.rehash()
+        return self._zobrist
+        
+    def invalidate(self) -> None:
+        """直接修改 tiles/melds 列表后调用,下次读取 zobrist 时重新计算"""
+        self._counts = None
+        
+    def rehash(self) -> None:
+        """按当前的 tiles/melds 重新计算哈希"""
+        counts = bytearray(0x80)
+        value = 0
+        try:
+            codes = tiles_to_bytes(self.tiles)
+        except ValueError:  # 含非法牌(代码超出1字节)
+            codes = [tile_code(tile) & 0x7F for tile in self.tiles]
+        keys = zobrist.HAND
+        for code in codes:
+            count = counts[code]
+            value ^= keys[code << zobrist.COPY_BITS | count & zobrist.COPY_MASK]
+            counts[code] = count + 1 & 0xFF
+        if self.melds:
+            seen: Dict[bytes, int] = {}
+            for meld in self.melds:
+                codes = zobrist.meld_codes(meld)
+                occurrence = seen.get(codes, 0)
+                value ^= zobrist.meld_key(codes, occurrence)
+                seen[codes] = occurrence + 1
+        self._counts = counts
+        self._zobrist = value
+        
+    def _hash_in(self, tile: Tile) -> None:
+        counts = self._counts
+        if counts is None:  # 等待重算
+            return
+        code = tile_code(tile) & 0x7F
+        count = counts[code]
+        self._zobrist ^= zobrist.hand_key(code, count)
+        counts[code] = count + 1 & 0xFF
+        
+    def _hash_out(self, tile: Tile) -> None:
+        counts = self._counts
+        if counts is None:
+            return
+        code = tile_code(tile) & 0x7F
+        count = counts[code] - 1 & 0xFF
+        self._zobrist ^= zobrist.hand_key(code, count)
+        counts[code] = count
+        
+    def fork(self, player=None) -> 'Hand':
+        """复制手牌(牌对象与向听计算器共享,牌列表各自独立)"""
+        clone = Hand.__new__(Hand)
+        clone.__dict__.update(self.__dict__)
+        clone.tiles = list(self.tiles)
+        clone.melds = [list(meld) for meld in self.melds]
+        clone.waiting_tiles = list(self.waiting_tiles)
+        clone._counts = None if self._counts is None else bytearray(self._counts)
+        clone.player = player
+        return clone
         
     def add_tile(self, tile: Tile) -> None:
         """添加一张牌"""
         self.tiles.append(tile)
+        self._hash_in(tile)
         self._sort_tiles()
         
     def discard_tile(self, tile_or_index: Union[Tile, int]) -> Optional[Tile]:
         """打出一张牌"""
         if isinstance(tile_or_index, int):
             if 0 <= tile_or_index < len(self.tiles):
-                return self.tiles.pop(tile_or_index)
+                tile = self.tiles.pop(tile_or_index)
+                self._hash_out(tile)
+                return tile
         elif isinstance(tile_or_index, Tile):
             if tile_or_index in self.tiles:
                 self.tiles.remove(tile_or_index)
+                self._hash_out(tile_or_index)
                 return tile_or_index
         return None
         
@@ -37,6 +121,10 @@ class Hand:
     def add_meld(self, tiles: List[Tile]) -> None:
         """添加一组副露"""
         if len(tiles) >= 3:  # 副露至少需要3张牌
+            if self._counts is not None:
+                codes = zobrist.meld_codes(tiles)
+                occurrence = sum(zobrist.meld_codes(meld) == codes for meld in self.melds)
+                self._zobrist ^= zobrist.meld_key(codes, occurrence)
             self.melds.append(tiles)
             
     def remove_tile(self, tile: Tile) -> bool:
@@ -50,6 +138,7 @@ class Hand:
         """
         if tile in self.tiles:
             self.tiles.remove(tile)
+            self._hash_out(tile)
             return True
         return False
         
@@ -66,6 +155,10 @@ class Hand:
                 
         return False
         
+    def get_shanten(self) -> int:
+        """计算当前手牌的向听数(-1表示和牌, 0表示听牌)"""
+        return self.shanten.calculate_shanten(self._convert_tiles_to_34_array(self.tiles))
+        
     def _convert_tiles_to_34_array(self, tiles: List[Tile]) -> List[int]:
         """将手牌转换为34编码数组"""
         array = [0] * 34
@@ -78,20 +171,20 @@ class Hand:
     def check_tenpai(self) -> List[Tile]:
         """检查听牌，返回能让手牌听牌的进张"""
         waiting_tiles = []
-        self.logger.debug("开始检查听牌")
-        self.logger.debug(f"当前手牌: {[str(t) for t in self.tiles]}")
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug("开始检查听牌, 当前手牌: %s", [str(t) for t in self.tiles])
         
         # 转换手牌格式
         tiles_34 = self._convert_tiles_to_34_array(self.tiles)
-        self.logger.debug(f"转换后的34数组: {tiles_34}")
         
         # 计算当前向听数
         current_shanten = self.shanten.calculate_shanten(tiles_34)
-        self.logger.debug(f"当前向听数: {current_shanten}")
+        if debug:
+            self.logger.debug("转换后的34数组: %s, 当前向听数: %s", tiles_34, current_shanten)
         
         # 如果已经和牌或向听数大于1，则不是听牌状态
         if current_shanten < 0 or current_shanten > 1:
-            self.logger.debug(f"非听牌状态，当前向听数: {current_shanten}")
             return []
         
         # 检查所有可能的牌
@@ -111,10 +204,11 @@ class Hand:
                 # 如果当前是一向听，则找能让向听数变为0的牌
                 # 如果当前是听牌，则找能让向听数变为-1的牌
                 if test_shanten < current_shanten:
-                    self.logger.debug(f"找到有效进张: {test_tile}")
+                    if debug:
+                        self.logger.debug("找到有效进张: %s", test_tile)
                     waiting_tiles.append(test_tile)
         
-        self.logger.debug(f"听牌检查完成，进张数: {len(waiting_tiles)}")
+        self.logger.debug("听牌检查完成，进张数: %d", len(waiting_tiles))
         return waiting_tiles
     
 
@@ -128,8 +222,11 @@ class Hand:
         Returns:
             Dict: 役种列表，如果没有役种返回空字典
         """
-        judger = YakuJudger()
-        result = judger.judge(
+        global _judger
+        if _judger is None:
+            from src.core.yaku.judger import YakuJudger
+            _judger = YakuJudger()
+        result = _judger.judge(
             tiles=self.tiles,
             melds=self.melds,
             win_tile=win_tile,
@@ -0,0 +1,12 @@
+from .registry import BUCKETS, REGISTRY, Histogram, MetricsRegistry, MetricsSnapshot, snapshot
+from .instrument import disable, enable, enabled
+from ..common.lazy import lazy_exports
+
+# 导出器依赖 http.server,使用时才导入
+__getattr__, __dir__ = lazy_exports(__name__, globals(), {
+    'MetricsExporter': '.prometheus',
+    'render': '.prometheus',
+})
+
+__all__ = ['BUCKETS', 'REGISTRY', 'Histogram', 'MetricsRegistry', 'MetricsSnapshot', 'snapshot',
+           'enable', 'disable', 'enabled', 'MetricsExporter', 'render']
@@ -0,0 +1,190 @@
+"""引擎热点路径的计时
+
+enable() 把下列方法替换为记录耗时(纳秒)的包装,disable() 恢复原方法;
+未开启时引擎代码中没有任何计时相关的开销。替换作用于类,对进程内所有
+对局生效。
+    hand.shanten          Hand.get_shanten
+    hand.agari            Hand.check_win
+    hand.check_tenpai     Hand.check_tenpai
+    yaku.judge            YakuJudger.judge
+    wall.draw             Wall.draw(牌山摸完时计数 wall.exhausted)
+    flow.check_ron        GameFlow.check_other_players_win
+    flow.check_response   GameFlow.check_other_players_response(计数 flow.responders)
+    flow.turn             一个回合(从 GameFlow.start_turn 到下一次 start_turn 或本局结束)
+                          内引擎入口的耗时之和,入口与 GameDriver.TRACED 相同;
+                          等待玩家决策、局间的时间不计入
+"""
+import time
+import weakref
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+from .registry import REGISTRY, MetricsRegistry
+
+_perf_counter_ns = time.perf_counter_ns
+_patched: List[Tuple[type, str, Callable]] = []  # (类, 方法名, 原方法)
+_registry: Optional[MetricsRegistry] = None
+
+
+def _targets() -> Dict[str, Tuple[type, str]]:
+    from ..game.flow import GameFlow
+    from ..hand.hand import Hand
+    from ..wall.wall import Wall
+    from ..yaku.judger import YakuJudger
+    return {
+        'hand.shanten': (Hand, 'get_shanten'),
+        'hand.agari': (Hand, 'check_win'),
+        'hand.check_tenpai': (Hand, 'check_tenpai'),
+        'yaku.judge': (YakuJudger, 'judge'),
+        'wall.draw': (Wall, 'draw'),
+        'flow.check_ron': (GameFlow, 'check_other_players_win'),
+        'flow.check_response': (GameFlow, 'check_other_players_response'),
+    }
+
+
+def _timed(registry: MetricsRegistry, name: str, func: Callable) -> Callable:
+    observe = registry.observe
+
+    @wraps(func)
+    def timed(*args, **kwargs):
+        start = _perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            observe(name, _perf_counter_ns() - start)
+    return timed
+
+
+def _wall_draw(registry: MetricsRegistry, func: Callable) -> Callable:
+    timed = _timed(registry, 'wall.draw', func)
+
+    @wraps(func)
+    def draw(self):
+        tile = timed(self)
+        if tile is None:
+            registry.count('wall.exhausted')
+        return tile
+    return draw
+
+
+def _check_response(registry: MetricsRegistry, func: Callable) -> Callable:
+    timed = _timed(registry, 'flow.check_response', func)
+
+    @wraps(func)
+    def check(self, discard_player, tile):
+        timed(self, discard_player, tile)
+        responders = len(self.machine.responders)
+        if responders:
+            registry.count('flow.responders', responders)
+    return check
+
+
+class _TurnClock:
+    """一个流程的回合计时: 累计回合内引擎入口(只计最外层)的耗时"""
+    __slots__ = ('depth', 'entered', 'total', 'started')
+
+    def __init__(self):
+        self.depth = 0       # 引擎入口的嵌套深度
+        self.entered = 0     # 进入最外层入口(或回合在入口内开始)的时间
+        self.total = 0       # 本回合已累计的耗时
+        self.started = False
+
+
+def _clock(clocks: weakref.WeakKeyDictionary, flow) -> _TurnClock:
+    clock = clocks.get(flow)
+    if clock is None:
+        clock = clocks[flow] = _TurnClock()
+    return clock
+
+
+def _turn_entry(clocks: weakref.WeakKeyDictionary, on_driver: bool, func: Callable) -> Callable:
+    """引擎入口: 耗时计入所属流程的当前回合"""
+    @wraps(func)
+    def entry(self, *args, **kwargs):
+        clock = _clock(clocks, self.flow if on_driver else self)
+        clock.depth += 1
+        if clock.depth == 1:
+            clock.entered = _perf_counter_ns()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            clock.depth -= 1
+            if not clock.depth:
+                clock.total += _perf_counter_ns() - clock.entered
+    return entry
+
+
+def _start_turn(registry: MetricsRegistry, clocks: weakref.WeakKeyDictionary, func: Callable) -> Callable:
+    """新回合开始: 记录上一回合的耗时"""
+    @wraps(func)
+    def start_turn(self, player):
+        clock = _clock(clocks, self)
+        now = _perf_counter_ns()
+        if clock.started:
+            registry.observe('flow.turn', clock.total + (now - clock.entered if clock.depth else 0))
+        clock.started = True
+        clock.total = 0
+        clock.entered = now
+        return func(self, player)
+    return start_turn
+
+
+def _run(registry: MetricsRegistry, clocks: weakref.WeakKeyDictionary, func: Callable) -> Callable:
+    """一局结束(或生成器被关闭)时记录最后一个回合,下一局重新开始计时"""
+    @wraps(func)
+    def run(self):
+        try:
+            return (yield from func(self))
+        finally:
+            clock = clocks.pop(self.flow, None)
+            if clock is not None and clock.started:
+                registry.observe('flow.turn', clock.total)
+    return run
+
+
+def enable(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """开启计时(已开启时先关闭再以新的注册表开启)
+
+    Args:
+        registry: 记录到的注册表,为 None 时使用进程级的默认注册表
+
+    Returns:
+        MetricsRegistry: 使用的注册表
+    """
+    global _registry
+    from ..game.driver import GameDriver
+    from ..game.flow import GameFlow
+    disable()
+    registry = registry or REGISTRY
+    wrappers = {'wall.draw': lambda func: _wall_draw(registry, func),
+                'flow.check_response': lambda func: _check_response(registry, func)}
+    for name, (cls, attr) in _targets().items():
+        original = cls.__dict__[attr]
+        wrapper = wrappers.get(name)
+        setattr(cls, attr, wrapper(original) if wrapper else _timed(registry, name, original))
+        _patched.append((cls, attr, original))
+    clocks = weakref.WeakKeyDictionary()  # 流程 -> 回合计时
+    turn = [(GameFlow, name, False) for name in ('step', 'handle_discard', 'handle_win')]
+    turn += [(GameDriver, name, True) for name in ('discard_actions', 'response_actions', '_apply_call')]
+    for cls, attr, on_driver in turn:
+        original = cls.__dict__[attr]
+        setattr(cls, attr, _turn_entry(clocks, on_driver, original))
+        _patched.append((cls, attr, original))
+    for cls, attr, wrapper in ((GameFlow, 'start_turn', _start_turn), (GameDriver, 'run', _run)):
+        original = cls.__dict__[attr]
+        setattr(cls, attr, wrapper(registry, clocks, original))
+        _patched.append((cls, attr, original))
+    _registry = registry
+    return registry
+
+
+def disable() -> None:
+    """关闭计时,恢复原方法(已记录的数据保留)"""
+    global _registry
+    while _patched:
+        cls, attr, original = _patched.pop()
+        setattr(cls, attr, original)
+    _registry = None
+
+
+def enabled() -> bool:
+    return _registry is not None
@@ -0,0 +1,164 @@
+"""Prometheus 文本格式导出
+
+MetricsExporter 把注册表中的计数器与直方图,以及各采集函数给出的数值,
+渲染为 Prometheus 文本格式(0.0.4),可通过本地 HTTP 端点
+(http.server,运行在后台线程)提供给抓取方,或原子写入文件
+(供 node_exporter 的 textfile 采集)。
+
+渲染在抓取线程中进行,不经过游戏事件循环; 结果缓存 max_age 秒,
+频繁抓取不会重复渲染。采集函数返回 {名称: 数值},名称以 _total
+结尾的按计数器导出,其余按仪表导出; 采集函数会在抓取线程中调用,
+只应读取数值,不应修改对局状态。值也可以是 Histogram(单位纳秒)。
+"""
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, List, Mapping, Optional, Sequence, Union
+from .registry import REGISTRY, Histogram, MetricsRegistry, MetricsSnapshot, bucket_bounds
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# 直方图导出的桶上界(秒)
+DEFAULT_BOUNDS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                  1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Collector = Callable[[], Mapping[str, Union[float, Histogram]]]
+_INVALID = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def metric_name(prefix: str, name: str) -> str:
+    """'hand.agari' -> 'mahjong_hand_agari'"""
+    name = _INVALID.sub('_', name)
+    return f"{prefix}_{name}" if prefix else name
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, histogram: Histogram, bounds: Sequence[float]) -> List[str]:
+    """纳秒直方图 -> 以秒为单位的累积桶"""
+    lines = [f"# TYPE {name} histogram"]
+    buckets = [(bucket_bounds(index)[1], count) for index, count in enumerate(histogram.counts) if count]
+    position = cumulative = 0
+    for bound in bounds:
+        limit = bound * 1e9
+        while position < len(buckets) and buckets[position][0] <= limit:
+            cumulative += buckets[position][1]
+            position += 1
+        lines.append(f'{name}_bucket{{le="{_number(bound)}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum {_number(histogram.total / 1e9)}")
+    lines.append(f"{name}_count {histogram.count}")
+    return lines
+
+
+def render(snapshot: MetricsSnapshot, values: Optional[Mapping[str, Union[float, Histogram]]] = None,
+           prefix: str = 'mahjong', bounds: Sequence[float] = DEFAULT_BOUNDS) -> str:
+    """渲染为 Prometheus 文本格式
+
+    Args:
+        snapshot: 计数器与直方图(直方图单位为纳秒,导出为 <名称>_seconds)
+        values: 其他数值,名称以 _total 结尾的为计数器,Histogram 为直方图,其余为仪表
+        prefix: 指标名前缀
+        bounds: 直方图的桶上界(秒)
+    """
+    lines: List[str] = []
+    histograms = dict(snapshot.histograms)
+    for name, value in sorted(snapshot.counters.items()):
+        metric = metric_name(prefix, name) + '_total'
+        lines += (f"# TYPE {metric} counter", f"{metric} {value}")
+    for name, value in sorted((values or {}).items()):
+        if isinstance(value, Histogram):
+            histograms[name] = value
+            continue
+        metric = metric_name(prefix, name)
+        kind = 'counter' if metric.endswith('_total') else 'gauge'
+        lines += (f"# TYPE {metric} {kind}", f"{metric} {_number(value)}")
+    for name, histogram in sorted(histograms.items()):
+        lines += _histogram_lines(metric_name(prefix, name) + '_seconds', histogram, bounds)
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """指标导出器"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, collectors: Iterable[Collector] = (),
+                 prefix: str = 'mahjong', max_age: float = 1.0):
+        """
+        Args:
+            registry: 计数器与直方图的来源,为 None 时使用默认注册表
+            collectors: 采集函数
+            prefix: 指标名前缀
+            max_age: 渲染结果的缓存时间(秒)
+        """
+        self.registry = registry or REGISTRY
+        self.collectors: List[Collector] = list(collectors)
+        self.prefix = prefix
+        self.max_age = max_age
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._cached: Optional[bytes] = None
+        self._rendered_at = 0.0
+
+    def collect(self) -> str:
+        """立即渲染当前指标"""
+        values = {}
+        for collector in self.collectors:
+            values.update(collector())
+        return render(self.registry.snapshot(), values, self.prefix)
+
+    def payload(self) -> bytes:
+        """缓存的渲染结果(超过 max_age 时重新渲染)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._cached is None or now - self._rendered_at >= self.max_age:
+                self._cached = self.collect().encode('utf-8')
+                self._rendered_at = now
+            return self._cached
+
+    def write(self, path: str) -> None:
+        """原子写入文件"""
+        temp = path + '.tmp'
+        with open(temp, 'wb') as f:
+            f.write(self.collect().encode('utf-8'))
+        os.replace(temp, path)
+
+    def serve(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        """在后台线程中启动 HTTP 端点(GET /metrics),返回实际端口"""
+        if self.server is not None:
+            return self.server.server_address[1]
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = exporter.payload()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 不为每次抓取写日志
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name='metrics-exporter', daemon=True)
+        self._thread.start()
+        return self.server.server_address[1]
+
+    def close(self) -> None:
+        """停止 HTTP 端点"""
+        server, self.server = self.server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            self._thread.join()
@@ -0,0 +1,214 @@
+"""计数器与耗时直方图
+
+记录写入当前线程独立的分片,写入时不加锁; snapshot() 在锁内合并所有
+线程的分片,得到可序列化的 MetricsSnapshot。多个进程各自的快照通过
+to_dict()/from_dict() 传回后用 merge() 合并。
+
+Histogram 为 HDR 风格的对数-线性分桶: 小于 2**PRECISION_BITS 的值每个值
+一个桶,更大的值按2的幂分段、每段再等分为 2**(PRECISION_BITS-1) 个桶,
+相对误差不超过 2**-(PRECISION_BITS-1)。
+"""
+import threading
+from typing import Dict, List, Optional
+
+PRECISION_BITS = 6  # 相对误差 ≤ 1/32
+_LINEAR = 1 << PRECISION_BITS
+_HALF = _LINEAR >> 1
+_MAX_BITS = 48      # 可记录的最大值约 2**48(纳秒约3天),更大的值计入最后一个桶
+BUCKETS = _LINEAR + (_MAX_BITS - PRECISION_BITS) * _HALF
+
+
+def bucket_index(value: int) -> int:
+    """值 -> 桶编号"""
+    if value < _LINEAR:
+        return value if value > 0 else 0
+    shift = value.bit_length() - PRECISION_BITS
+    index = _LINEAR + (shift - 1) * _HALF + (value >> shift) - _HALF
+    return index if index < BUCKETS else BUCKETS - 1
+
+
+def bucket_bounds(index: int) -> tuple:
+    """桶编号 -> (下界, 上界)"""
+    if index < _LINEAR:
+        return index, index
+    shift, offset = divmod(index - _LINEAR, _HALF)
+    shift += 1
+    low = (_HALF + offset) << shift
+    return low, low + (1 << shift) - 1
+
+
+class Histogram:
+    """耗时直方图(单位由调用方决定,引擎内部使用纳秒)"""
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        self.counts[bucket_index(value)] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: 'Histogram') -> 'Histogram':
+        """把 other 合并到本直方图,返回自身"""
+        if other.count:
+            counts = self.counts
+            for index, value in enumerate(other.counts):
+                if value:
+                    counts[index] += value
+            self.min = other.min if not self.count else min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.count += other.count
+            self.total += other.total
+        return self
+
+    def copy(self) -> 'Histogram':
+        return Histogram().merge(self)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> int:
+        """分位数(q取0-100): 所在桶的上界,不超出最小/最大值"""
+        if not self.count:
+            return 0
+        rank = max(1, -int(-self.count * q // 100))
+        seen = 0
+        for index, value in enumerate(self.counts):
+            seen += value
+            if seen >= rank:
+                return max(self.min, min(self.max, bucket_bounds(index)[1]))
+        return self.max
+
+    def to_dict(self) -> dict:
+        """可 JSON 序列化的表示(只保存非空桶)"""
+        return {
+            'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max,
+            'buckets': {str(index): value for index, value in enumerate(self.counts) if value},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Histogram':
+        histogram = cls()
+        for index, value in data['buckets'].items():
+            histogram.counts[int(index)] = value
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
+
+    def __repr__(self):
+        return (f"Histogram(count={self.count}, mean={self.mean:.0f}, p50={self.percentile(50)}, "
+                f"p99={self.percentile(99)}, max={self.max})")
+
+
+class MetricsSnapshot:
+    """某一时刻的计数与直方图(与记录分片独立,可合并、可序列化)"""
+
+    def __init__(self, counters: Optional[Dict[str, int]] = None,
+                 histograms: Optional[Dict[str, Histogram]] = None):
+        self.counters: Dict[str, int] = counters or {}
+        self.histograms: Dict[str, Histogram] = histograms or {}
+
+    def merge(self, other: 'MetricsSnapshot') -> 'MetricsSnapshot':
+        """把 other 合并到本快照,返回自身"""
+        counters = self.counters
+        for name, value in other.counters.items():
+            counters[name] = counters.get(name, 0) + value
+        histograms = self.histograms
+        for name, histogram in other.histograms.items():
+            mine = histograms.get(name)
+            if mine is None:
+                histograms[name] = histogram.copy()
+            else:
+                mine.merge(histogram)
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            'counters': dict(self.counters),
+            'histograms': {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MetricsSnapshot':
+        return cls(dict(data.get('counters', {})),
+                   {name: Histogram.from_dict(value) for name, value in data.get('histograms', {}).items()})
+
+    def __repr__(self):
+        return f"MetricsSnapshot(counters={self.counters}, histograms={self.histograms})"
+
+
+class _Shard:
+    """单个线程的记录"""
+    __slots__ = ('counters', 'histograms')
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+
+class MetricsRegistry:
+    """计数器与直方图的注册表"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[_Shard] = []
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def count(self, name: str, value: int = 1) -> None:
+        """计数器加 value"""
+        counters = self._shard().counters
+        counters[name] = counters.get(name, 0) + value
+
+    def observe(self, name: str, value: int) -> None:
+        """向直方图记录一个值"""
+        histograms = self._shard().histograms
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram()
+        histogram.record(value)
+
+    def snapshot(self) -> MetricsSnapshot:
+        """合并所有线程的记录(其他线程同时写入时为近似值)"""
+        result = MetricsSnapshot()
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            result.merge(MetricsSnapshot(dict(shard.counters), dict(shard.histograms)))
+        return result
+
+    def reset(self) -> None:
+        """清空所有记录"""
+        with self._lock:
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+
+REGISTRY = MetricsRegistry()  # 进程级的默认注册表
+
+
+def snapshot() -> MetricsSnapshot:
+    """默认注册表的快照"""
+    return REGISTRY.snapshot()
@@ -14,6 +14,13 @@ class FuritenState:
         if self.current_turn_tiles is None:
             self.current_turn_tiles = []
             
+    def fork(self) -> 'FuritenState':
+        """复制振听状态"""
+        clone = FuritenState.__new__(FuritenState)
+        clone.__dict__.update(self.__dict__)
+        clone.current_turn_tiles = list(self.current_turn_tiles)
+        return clone
+            
     def clear_temporary_furiten(self):
         """清除同巡振听"""
         self.is_temporary_furiten = False
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Union
 from ..tile import Tile, TileSuit
 from ..hand import Hand
 from .state import PlayerState
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from ..common.wind import Wind
 from src.core.player.furiten import FuritenState
 from src.core.player.river import River
+from src.core.tile import zobrist
 
 @dataclass
 class Player:
@@ -18,7 +19,9 @@ class Player:
         self.name = name
         self.hand = Hand(self)
         self.discards: List[Tile] = []
-        self.state = PlayerState.WAITING
+        # 状态变化回调(由所在牌桌的状态机设置)
+        self.state_observer: Optional[Callable[['Player', PlayerState, PlayerState], None]] = None
+        self._state = PlayerState.WAITING
         self.is_riichi = False
         self.is_furiten = False
         self.points = 25000
@@ -26,6 +29,49 @@ class Player:
         self.selected_tile_index = -1  # 初始化为-1表示未选中
         self.furiten = FuritenState()
         self.river = River()
+        # 舍牌哈希的缓存: (已哈希的列表, 已哈希的张数, 哈希值)
+        self._discards_hashed = (self.discards, 0, 0)
+        
+    def fork(self) -> 'Player':
+        """复制玩家的对局状态(状态回调由复制出的状态机重新挂接)"""
+        clone = Player.__new__(Player)
+        clone.__dict__.update(self.__dict__)
+        clone.hand = self.hand.fork(clone)
+        clone.discards = list(self.discards)
+        _, count, value = self._discards_hashed
+        clone._discards_hashed = (clone.discards, count, value)
+        clone.state_observer = None
+        clone.furiten = self.furiten.fork()
+        clone.river = self.river.fork()
+        return clone
+        
+    @property
+    def discard_zobrist(self) -> int:
+        """舍牌(按顺序)的64位 Zobrist 哈希
+
+        舍牌列表只会追加,由流程直接写入,因此查询时只哈希新追加的牌;
+        列表被替换或缩短时重新计算。
+        """
+        discards = self.discards
+        source, count, value = self._discards_hashed
+        if source is not discards or count > len(discards):
+            count = value = 0
+        if count < len(discards):
+            value = zobrist.sequence_hash(zobrist.RIVER, discards, count, value)
+            self._discards_hashed = (discards, len(discards), value)
+        return value
+        
+    @property
+    def state(self) -> PlayerState:
+        """玩家状态"""
+        return self._state
+
+    @state.setter
+    def state(self, state: PlayerState) -> None:
+        old = self._state
+        self._state = state
+        if self.state_observer is not None and old != state:
+            self.state_observer(self, old, state)
         
     def set_points(self, points: int) -> None:
         """设置分数"""
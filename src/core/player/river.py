@@ -8,6 +8,14 @@ class River:
         self.riichi_tile_index: int = -1  # 立直宣言牌的位置
         self.tsumogiri: List[bool] = []  # 记录是否为摸切(True/False)
         
+    def fork(self) -> 'River':
+        """复制牌河"""
+        clone = River.__new__(River)
+        clone.tiles = list(self.tiles)
+        clone.riichi_tile_index = self.riichi_tile_index
+        clone.tsumogiri = list(self.tsumogiri)
+        return clone
+        
     def add_tile(self, tile: Tile, is_tsumogiri: bool = False) -> None:
         """添加打出的牌到牌河
         
@@ -0,0 +1,20 @@
+from .profiler import Profiler, TableProfile, from_environment
+from ..common.lazy import lazy_exports
+
+# Game 创建时只需要 from_environment(),其余在使用时才导入
+__getattr__, __dir__ = lazy_exports(__name__, globals(), {
+    'collapse_samples': '.collapse',
+    'collapse_stats': '.collapse',
+    'read_collapsed': '.collapse',
+    'AllocationReport': '.memory',
+    'LeakCheck': '.memory',
+    'TypeStats': '.memory',
+    'allocations': '.memory',
+    'census': '.memory',
+    'game_census': '.memory',
+    'leak_check': '.memory',
+})
+
+__all__ = ['Profiler', 'TableProfile', 'from_environment', 'collapse_samples', 'collapse_stats',
+           'read_collapsed', 'AllocationReport', 'LeakCheck', 'TypeStats', 'allocations', 'census',
+           'game_census', 'leak_check']
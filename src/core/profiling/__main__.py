@@ -0,0 +1,4 @@
+import sys
+from .memory import main
+
+sys.exit(main())
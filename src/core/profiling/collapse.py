@@ -0,0 +1,122 @@
+"""剖析结果的格式转换
+
+pstats 的统计表: {(文件, 行号, 函数名): (原始调用数, 调用数, 自身耗时, 累计耗时, 调用方)},
+调用方为 {(文件, 行号, 函数名): (调用数, 原始调用数, 自身耗时, 累计耗时)}。
+折叠调用栈: 每行 "根;...;叶 数值",可直接交给 flamegraph.pl、speedscope 等工具。
+"""
+import marshal
+import os
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Mapping, Tuple
+
+Function = Tuple[str, int, str]
+Stack = Tuple[Function, ...]
+
+_MAX_DEPTH = 128
+
+
+def label(function: Function) -> str:
+    """函数 -> 折叠调用栈中的帧名"""
+    filename, line, name = function
+    if filename == '~':  # 内置函数
+        text = name
+    else:
+        text = f"{name} ({os.path.basename(filename)}:{line})"
+    return text.replace(';', ':')
+
+
+def collapse_stats(stats: Mapping[Function, tuple], unit: float = 1e-6) -> Dict[str, int]:
+    """由 cProfile 的统计表展开折叠调用栈
+
+    cProfile 只记录调用方-被调用方一层的关系,这里从没有调用方的函数出发,
+    按每条调用边的累计耗时占比把被调用方的耗时分摊到各条调用路径上
+    (与 flameprof 等工具相同的近似)。递归调用不展开。
+
+    Args:
+        stats: pstats 统计表
+        unit: 数值的单位(秒),默认微秒
+
+    Returns:
+        Dict[str, int]: 调用栈 -> 自身耗时
+    """
+    callees = defaultdict(list)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller].append((function, edge[3]))
+    roots = [function for function, value in stats.items() if not any(c in stats for c in value[4])]
+    result: Counter = Counter()
+    minimum = unit / 2
+
+    def walk(function: Function, path: Tuple[str, ...], seen: frozenset, fraction: float) -> None:
+        _, _, tt, ct, _ = stats[function]
+        path += (label(function),)
+        if tt * fraction >= minimum:
+            result[';'.join(path)] += tt * fraction
+        if len(path) >= _MAX_DEPTH:
+            return
+        seen |= {function}
+        for callee, edge_time in callees.get(function, ()):
+            total = stats[callee][3]
+            share = edge_time * fraction
+            if callee in seen or total <= 0 or share < minimum:
+                continue
+            walk(callee, path, seen, share / total)
+
+    for root in roots:
+        walk(root, (), frozenset(), 1.0)
+    return {stack: int(round(value / unit)) for stack, value in result.items() if round(value / unit)}
+
+
+def collapse_samples(stacks: Mapping[Stack, int]) -> Dict[str, int]:
+    """采样得到的调用栈(根在前) -> 折叠调用栈与采样数"""
+    result: Counter = Counter()
+    for stack, count in stacks.items():
+        result[';'.join(label(function) for function in stack)] += count
+    return dict(result)
+
+
+def samples_to_stats(stacks: Mapping[Stack, int], interval: float) -> Dict[Function, tuple]:
+    """由采样得到的调用栈构造 pstats 统计表(调用数为出现的采样数,耗时为采样数×间隔)"""
+    own: Counter = Counter()
+    total: Counter = Counter()
+    edges: Dict[Function, Counter] = defaultdict(Counter)
+    edge_own: Dict[Function, Counter] = defaultdict(Counter)
+    for stack, count in stacks.items():
+        if not stack:
+            continue
+        own[stack[-1]] += count
+        for function in set(stack):  # 递归时只计一次
+            total[function] += count
+        for caller, callee in set(zip(stack, stack[1:])):
+            edges[callee][caller] += count
+            if callee == stack[-1]:
+                edge_own[callee][caller] += count
+    stats = {}
+    for function, count in total.items():
+        callers = {caller: (n, n, edge_own[function][caller] * interval, n * interval)
+                   for caller, n in edges[function].items()}
+        stats[function] = (count, count, own[function] * interval, count * interval, callers)
+    return stats
+
+
+def write_stats(path: str, stats: Mapping[Function, tuple]) -> None:
+    """写入 pstats 文件(与 Profile.dump_stats 格式相同)"""
+    with open(path, 'wb') as f:
+        marshal.dump(dict(stats), f)
+
+
+def write_collapsed(path: str, stacks: Mapping[str, int]) -> None:
+    """写入折叠调用栈文本"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(f"{stack} {value}\n" for stack, value in sorted(stacks.items()))
+
+
+def read_collapsed(lines: Iterable[str]) -> Dict[str, int]:
+    """读取折叠调用栈文本"""
+    result: Dict[str, int] = {}
+    for line in lines:
+        line = line.rstrip('\n')
+        if line:
+            stack, value = line.rsplit(' ', 1)
+            result[stack] = result.get(stack, 0) + int(value)
+    return result
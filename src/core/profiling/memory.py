@@ -0,0 +1,244 @@
+"""内存占用诊断
+
+    python -m src.core.profiling [--hands 50] [--tolerance 2048]
+
+    allocations()  tracemalloc 快照前后的新增内存,按模块汇总
+    census()       从对局出发可达的对象,按类型统计个数与字节数(即每张牌桌的占用)
+    leak_check()   在同一个 Game 上连续进行 N 局,检查内存是否稳定
+
+census() 不进入类、模块、函数、枚举成员与 logger(进程内共享),规则配置与
+全局配置也按共享对象排除; 字节数为 sys.getsizeof 的浅层大小之和。
+"""
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import tracemalloc
+import types
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 报告中单独列出的类型
+WATCHED = ('Tile', 'Hand', 'Shanten', 'HandCalculator', 'YakuJudger', 'Logger', 'Player', 'River')
+
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.CodeType,
+           types.MethodDescriptorType, types.WrapperDescriptorType, Enum)
+
+
+@dataclass
+class TypeStats:
+    """某一类型(或模块)的个数与字节数"""
+    count: int = 0
+    size: int = 0
+
+
+@dataclass
+class AllocationReport:
+    """tracemalloc 统计的新增内存"""
+    label: str
+    size: int                       # 新增字节数
+    count: int                      # 新增内存块数
+    modules: Dict[str, TypeStats] = field(default_factory=dict)  # 模块 -> 新增量
+
+    def format(self, limit: int = 15) -> str:
+        lines = [f"{self.label}: {self.size / 1024:.1f} KiB, {self.count} 块"]
+        ranked = sorted(self.modules.items(), key=lambda item: -item[1].size)[:limit]
+        width = max((len(name) for name, _ in ranked), default=0)
+        lines += [f"  {name.ljust(width)}  {stats.size / 1024:9.1f} KiB  {stats.count:7d} 块"
+                  for name, stats in ranked]
+        return "\n".join(lines)
+
+
+def _module_name(filename: str) -> str:
+    """源文件路径 -> 模块名(无法确定时保留文件名)"""
+    path = os.path.abspath(filename)
+    best = ''
+    for entry in sys.path:
+        root = os.path.abspath(entry or os.curdir)
+        if path.startswith(root + os.sep) and len(root) > len(best):
+            best = root
+    if not best:
+        return filename
+    relative = os.path.splitext(path[len(best) + 1:])[0]
+    return relative.replace(os.sep, '.').removesuffix('.__init__')
+
+
+def allocations(func: Callable, *args, label: str = '', frames: int = 1) -> Tuple[object, AllocationReport]:
+    """调用 func 并统计调用前后新增(且未释放)的内存
+
+    未开启 tracemalloc 时临时开启。
+
+    Args:
+        func: 被测函数
+        label: 报告标题
+        frames: tracemalloc 记录的调用栈深度
+
+    Returns:
+        (func 的返回值, 新增内存报告)
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(frames)
+    try:
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        result = func(*args)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+    report = AllocationReport(label or getattr(func, '__name__', ''), 0, 0)
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    for stat in after.filter_traces(filters).compare_to(before.filter_traces(filters), 'filename'):
+        if not stat.size_diff and not stat.count_diff:
+            continue
+        module = _module_name(stat.traceback[0].filename)
+        stats = report.modules.setdefault(module, TypeStats())
+        stats.size += stat.size_diff
+        stats.count += stat.count_diff
+        report.size += stat.size_diff
+        report.count += stat.count_diff
+    return result, report
+
+
+def census(root, exclude: Iterable = ()) -> Dict[str, TypeStats]:
+    """统计从 root 出发可达的对象
+
+    Args:
+        root: 起点对象
+        exclude: 不计入也不进入的对象(共享的配置等)
+
+    Returns:
+        Dict[str, TypeStats]: 类型名 -> 个数与浅层字节数
+    """
+    seen = {id(obj) for obj in exclude}
+    stats: Dict[str, TypeStats] = {}
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _OPAQUE):
+            continue
+        seen.add(id(obj))
+        entry = stats.get(type(obj).__name__)
+        if entry is None:
+            entry = stats[type(obj).__name__] = TypeStats()
+        entry.count += 1
+        entry.size += sys.getsizeof(obj)
+        if not isinstance(obj, logging.Logger):
+            stack.extend(gc.get_referents(obj))
+    return stats
+
+
+def game_census(game) -> Dict[str, TypeStats]:
+    """单个对局(牌桌)可达的对象统计,另含 'River.tiles' 与 'Player.discards' 两项列表
+
+    牌对象(Tile)由各牌山共用,计入统计但不随牌桌数增加。
+    """
+    stats = census(game, exclude=(game.settings, game.config, game.profile))
+    for name, lists in (('River.tiles', [p.river.tiles for p in game.players]),
+                        ('Player.discards', [p.discards for p in game.players])):
+        stats[name] = TypeStats(len(lists), sum(map(sys.getsizeof, lists)))
+    return stats
+
+
+def format_census(stats: Dict[str, TypeStats], limit: int = 12) -> str:
+    """对象统计的文本表格: 总量、关注的类型、其余按字节数排序"""
+    total = TypeStats(sum(s.count for s in stats.values()), sum(s.size for s in stats.values()))
+    rows = [("类型", "个数", "字节"), ("(合计)", str(total.count), str(total.size))]
+    watched = [name for name in WATCHED + ('River.tiles', 'Player.discards') if name in stats]
+    others = sorted((name for name in stats if name not in watched), key=lambda name: -stats[name].size)
+    for name in watched + others[:limit]:
+        rows.append((name, str(stats[name].count), str(stats[name].size)))
+    widths = [max(len(row[i]) for row in rows) for i in range(3)]
+    return "\n".join("  ".join(cell.ljust(width) if i == 0 else cell.rjust(width)
+                               for i, (cell, width) in enumerate(zip(row, widths)))
+                     for row in rows)
+
+
+@dataclass
+class LeakCheck:
+    """连续对局的内存检查结果"""
+    samples: List[int]       # 每局结束并回收后 tracemalloc 统计的当前内存
+    warmup: int
+    tolerance: float         # 允许的每局增长(字节)
+
+    @property
+    def growth_per_hand(self) -> float:
+        """预热之后每局内存增长的最小二乘斜率(字节)"""
+        values = self.samples[self.warmup:]
+        n = len(values)
+        if n < 2:
+            return 0.0
+        mean_x, mean_y = (n - 1) / 2, sum(values) / n
+        numerator = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+        return numerator / sum((x - mean_x) ** 2 for x in range(n))
+
+    @property
+    def steady(self) -> bool:
+        return self.growth_per_hand <= self.tolerance
+
+    def check(self) -> None:
+        """内存未稳定时抛出 AssertionError"""
+        if not self.steady:
+            raise AssertionError(f"每局内存增长 {self.growth_per_hand:.0f} 字节,超过 {self.tolerance:.0f}")
+
+
+def leak_check(hands: int = 50, warmup: int = 5, tolerance: float = 2048, seed: int = 0,
+               game=None) -> LeakCheck:
+    """在同一个对局对象上连续进行 hands 局,记录每局之后的内存
+
+    Args:
+        hands: 局数(含预热)
+        warmup: 不计入增长的前几局(缓存填充等)
+        tolerance: 允许的每局增长(字节)
+        seed: 随机种子(牌山和决策都由它决定,不改动全局随机状态)
+        game: 使用的对局,为 None 时新建
+    """
+    from ..game import Game, play_round
+    rng = random.Random(seed)
+    game = game if game is not None else Game()
+    tiles = game.table.wall._create_tiles()  # 未洗的一副牌(新建 Wall 会用全局随机洗牌)
+    previous_order = game.wall_order
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    samples = []
+    try:
+        for _ in range(hands):
+            rng.shuffle(tiles)
+            game.wall_order = tiles  # Wall.initialize 会复制牌序,可以原地重洗
+            play_round(game, rng=rng)
+            gc.collect()
+            samples.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        game.wall_order = previous_order
+        if started:
+            tracemalloc.stop()
+    return LeakCheck(samples, min(warmup, max(0, hands - 2)), tolerance)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m src.core.profiling', description="对局的内存占用诊断")
+    parser.add_argument('--hands', type=int, default=50, help="内存稳定性检查的局数")
+    parser.add_argument('--tolerance', type=float, default=2048, help="允许的每局内存增长(字节)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    from ..game import Game, play_round
+
+    game, report = allocations(Game, label="创建对局")
+    print(report.format())
+    print()
+    _, report = allocations(play_round, game, None, random.Random(args.seed), label="进行一局")
+    print(report.format())
+    print()
+    print("单个对局可达的对象:")
+    print(format_census(game_census(game)))
+    print()
+    result = leak_check(args.hands, seed=args.seed, tolerance=args.tolerance)
+    print(f"连续 {args.hands} 局: 每局增长 {result.growth_per_hand:.0f} 字节,"
+          f"{'稳定' if result.steady else '未稳定'}")
+    return 0 if result.steady else 1
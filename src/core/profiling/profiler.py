@@ -0,0 +1,282 @@
+"""对局的性能剖析
+
+Profiler 按牌桌开启剖析: 被剖析牌桌的 Game.profiling 为 TableProfile,
+驱动只在调用引擎入口(step、handle_discard、discard_actions 等)期间开启
+剖析,等待玩家决策的时间不计入。每张牌桌每完成 games 局写出一组文件:
+    <进程号>-table<牌桌编号>-<序号>.pstats     python -m pstats、snakeviz 可读
+    <进程号>-table<牌桌编号>-<序号>.collapsed  折叠调用栈,flamegraph.pl、speedscope 可读
+
+两种模式:
+    cprofile  确定性剖析(cProfile),折叠调用栈由调用关系按耗时比例展开
+    sample    统计采样: 后台线程每隔 interval 秒读取一次对局线程的调用栈,
+              开销与调用次数无关; 受 GIL 切换间隔限制,实际采样间隔不小于
+              sys.getswitchinterval()
+
+局数按牌桌编号累计: 同一编号的各个 Game(例如每局新建一个 Game)共用一个
+TableProfile。不修改代码时可通过环境变量开启,此时进程中创建的每个 Game
+都被剖析,并共用默认牌桌(编号0)的句柄:
+    MAHJONG_PROFILE=cprofile|sample  MAHJONG_PROFILE_DIR=profiles
+    MAHJONG_PROFILE_GAMES=1  MAHJONG_PROFILE_INTERVAL=0.001
+"""
+import atexit
+import os
+import sys
+import threading
+from collections import Counter
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+MODES = ('cprofile', 'sample')
+MODE_ENV = 'MAHJONG_PROFILE'
+DIR_ENV = 'MAHJONG_PROFILE_DIR'
+GAMES_ENV = 'MAHJONG_PROFILE_GAMES'
+INTERVAL_ENV = 'MAHJONG_PROFILE_INTERVAL'
+PROFILE_DIR = 'profiles'
+
+
+class _CProfileSession:
+    """cProfile 剖析"""
+
+    def __init__(self):
+        import cProfile
+        self.profile = cProfile.Profile()
+
+    def resume(self) -> None:
+        self.profile.enable()
+
+    def pause(self) -> None:
+        self.profile.disable()
+
+    def results(self) -> Tuple[dict, Dict[str, int]]:
+        from .collapse import collapse_stats
+        self.profile.create_stats()
+        stats = self.profile.stats
+        return stats, collapse_stats(stats)
+
+    def close(self) -> None:
+        self.profile.disable()
+
+
+class _SampleSession:
+    """统计采样: 只在对局线程处于引擎入口内时记录调用栈"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.active = False
+        self._thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def resume(self) -> None:
+        self._thread_id = threading.get_ident()
+        self.active = True
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='mahjong-profiler', daemon=True)
+            self._thread.start()
+
+    def pause(self) -> None:
+        self.active = False
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self.active:
+                self.sample()
+
+    def sample(self) -> None:
+        """记录一次对局线程的调用栈(截取到引擎入口为止)"""
+        frame = sys._current_frames().get(self._thread_id)
+        stack = []
+        while frame is not None and frame.f_code is not _ENTRY_CODE:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        if frame is not None and stack:  # 不在入口内(刚好退出)时丢弃
+            stack.reverse()
+            self.stacks[tuple(stack)] += 1
+
+    def results(self) -> Tuple[dict, Dict[str, int]]:
+        from .collapse import collapse_samples, samples_to_stats
+        stacks = dict(self.stacks)
+        return samples_to_stats(stacks, self.interval), collapse_samples(stacks)
+
+    def close(self) -> None:
+        self.active = False
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def _entry(handle: 'TableProfile', func: Callable) -> Callable:
+    @wraps(func)
+    def profiled(*args, **kwargs):
+        handle.enter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            handle.exit()
+    return profiled
+
+
+_ENTRY_CODE = _entry(None, len).__code__  # 所有入口包装共用的代码对象,采样时作为栈底
+
+
+class Profiler:
+    """剖析器: 决定剖析哪些牌桌,并管理输出文件"""
+
+    def __init__(self, directory: str = PROFILE_DIR, mode: str = 'cprofile', games: int = 1,
+                 tables: Optional[Iterable[int]] = None, interval: float = 0.001):
+        """
+        Args:
+            directory: 输出目录(不存在时创建)
+            mode: 'cprofile' 或 'sample'
+            games: 每张牌桌每多少局写出一组文件
+            tables: 只剖析这些牌桌编号,为 None 时剖析全部
+            interval: 采样模式的采样间隔(秒)
+        """
+        if mode not in MODES:
+            raise ValueError(f"未知的剖析模式: {mode}")
+        if games < 1:
+            raise ValueError(f"局数必须为正: {games}")
+        self.directory = directory
+        self.mode = mode
+        self.games = games
+        self.tables = None if tables is None else frozenset(tables)
+        self.interval = interval
+        self.written: list = []  # 已写出的 (pstats 路径, 折叠调用栈路径)
+        self._tables: Dict[int, 'TableProfile'] = {}  # 牌桌编号 -> 句柄
+        self._open: Set['TableProfile'] = set()  # 有未写出数据的牌桌
+        self._lock = threading.Lock()
+
+    def sampled(self, table_id: int) -> bool:
+        """牌桌是否被剖析"""
+        return self.tables is None or table_id in self.tables
+
+    def table(self, table_id: int = 0) -> Optional['TableProfile']:
+        """牌桌的剖析句柄(未被选中时为 None),同一编号总是返回同一个句柄
+
+        Args:
+            table_id: 牌桌编号,默认为进程的默认牌桌
+        """
+        if not self.sampled(table_id):
+            return None
+        with self._lock:
+            handle = self._tables.get(table_id)
+            if handle is None:
+                handle = self._tables[table_id] = TableProfile(self, table_id)
+        return handle
+
+    def attach(self, game, table_id: int) -> bool:
+        """为对局设置剖析句柄,返回是否被剖析"""
+        game.profiling = self.table(table_id)
+        return game.profiling is not None
+
+    def _session(self):
+        if self.mode == 'sample':
+            return _SampleSession(self.interval)
+        return _CProfileSession()
+
+    def _write(self, handle: 'TableProfile', session) -> Tuple[str, str]:
+        from .collapse import write_collapsed, write_stats
+        stats, stacks = session.results()
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            base = os.path.join(self.directory, f"{os.getpid()}-table{handle.table_id}-{handle.dumps:04d}")
+            paths = (base + '.pstats', base + '.collapsed')
+            write_stats(paths[0], stats)
+            write_collapsed(paths[1], stacks)
+            self.written.append(paths)
+        return paths
+
+    def release(self, table_id: int) -> Optional[Tuple[str, str]]:
+        """牌桌不再使用: 写出未凑满局数的数据并丢弃句柄
+
+        之后同一编号的牌桌从新的句柄开始,文件序号可能与之前的重复。
+        """
+        with self._lock:
+            handle = self._tables.pop(table_id, None)
+        return handle.dump() if handle is not None else None
+
+    def close(self) -> None:
+        """写出所有牌桌未写出的数据"""
+        for handle in list(self._open):
+            handle.dump()
+
+
+class TableProfile:
+    """单张牌桌的剖析句柄(同一时刻只应在一个线程中使用)"""
+
+    def __init__(self, profiler: Profiler, table_id: int):
+        self.profiler = profiler
+        self.table_id = table_id
+        self.played = 0  # 当前这组文件已包含的局数
+        self.dumps = 0   # 已写出的组数
+        self._session = None
+        self._depth = 0
+
+    def enter(self) -> None:
+        """进入引擎入口(嵌套调用只在最外层开启)"""
+        if not self._depth:
+            if self._session is None:
+                self._session = self.profiler._session()
+                self.profiler._open.add(self)
+            self._session.resume()
+        self._depth += 1
+
+    def exit(self) -> None:
+        self._depth -= 1
+        if not self._depth:
+            self._session.pause()
+
+    def wrap(self, func: Callable) -> Callable:
+        """返回在调用期间开启剖析的包装函数"""
+        return _entry(self, func)
+
+    def instrument(self, obj, names: Iterable[str]) -> None:
+        """把对象上的方法替换为带剖析的包装(只影响该实例)"""
+        for name in names:
+            setattr(obj, name, self.wrap(getattr(obj, name)))
+
+    def finish_game(self) -> Optional[Tuple[str, str]]:
+        """一局结束,凑满 games 局时写出文件并返回路径"""
+        self.played += 1
+        if self.played >= self.profiler.games:
+            return self.dump()
+        return None
+
+    def dump(self) -> Optional[Tuple[str, str]]:
+        """写出当前数据并开始新的一组,没有数据时返回 None"""
+        session, self._session = self._session, None
+        self.played = 0
+        if session is None:
+            return None
+        self.profiler._open.discard(self)
+        session.close()
+        paths = self.profiler._write(self, session)
+        self.dumps += 1
+        return paths
+
+
+_environment: Optional[Profiler] = None
+_environment_read = False
+
+
+def from_environment() -> Optional[Profiler]:
+    """按环境变量创建的进程级剖析器(未设置 MAHJONG_PROFILE 时为 None)
+
+    进程退出时写出未凑满局数的数据。
+    """
+    global _environment, _environment_read
+    if not _environment_read:
+        _environment_read = True
+        mode = os.environ.get(MODE_ENV, '').strip().lower()
+        if mode in ('', '0', 'off'):
+            return None
+        if mode in ('1', 'on'):
+            mode = 'cprofile'
+        _environment = Profiler(os.environ.get(DIR_ENV) or PROFILE_DIR, mode,
+                                int(os.environ.get(GAMES_ENV) or 1),
+                                interval=float(os.environ.get(INTERVAL_ENV) or 0.001))
+        atexit.register(_environment.close)
+    return _environment
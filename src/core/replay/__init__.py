@@ -0,0 +1,6 @@
+from .format import ActionRecord, IndexEntry, ReplayError, read_profile, write_profile
+from .writer import ReplayWriter
+from .reader import ReplayReader, ReplayRound, ReplayStep
+
+__all__ = ['ActionRecord', 'IndexEntry', 'ReplayError', 'read_profile', 'write_profile',
+           'ReplayWriter', 'ReplayReader', 'ReplayRound', 'ReplayStep']
@@ -0,0 +1,111 @@
+"""回放文件格式
+
+文件头:
+    MAGIC(4) | 版本 uint8 | 规则(PROFILE + 顺位点 int32 × 人数 + 名称长度 uint8 + UTF-8名称)
+之后按局依次写入:
+    ROUND 标记 | 牌山字节数 uint8 | 牌山(每张1字节,见 tile.codec)
+    操作记录 × N(每条2字节),其间穿插关键帧
+    END 标记
+操作记录: 高4位为操作类型(ActionType),低4位为座位号; 第二个字节为该操作在
+合法操作列表中的序号。对局完全由牌山与操作序列决定,回放时重新驱动 Game 即可复现。
+关键帧: KEYFRAME 标记 | 长度 uint16 | 对局状态(game.snapshot,不含牌序)。
+写入结束时追加索引: INDEX 标记 | 项数 uint32 | INDEX_ENTRY × N | TRAILER,
+索引项为每局的开始与每个关键帧,读取方据此跳转到任意操作附近。
+"""
+import struct
+from typing import BinaryIO, NamedTuple
+from ..rules.profile import RuleProfile
+
+MAGIC = b'MJRP'
+VERSION = 2  # 2: 关键帧使用第2版状态编码
+
+HEADER = struct.Struct('<4sB')
+# 规则标志 uint8 | 累计役满上限 int8(-1为不限制) | 立直棒 uint16 | 本场点 uint16 | 初始点数 int32 | 人数 uint8
+PROFILE = struct.Struct('<BbHHiB')
+ACTION = struct.Struct('<BB')
+LENGTH = struct.Struct('<H')
+COUNT = struct.Struct('<I')
+# 操作序号 uint32 | 局序号 uint16 | 该局 ROUND 标记的偏移 uint32 | 关键帧标记的偏移 uint32(0为局首)
+INDEX_ENTRY = struct.Struct('<IHII')
+# 索引偏移 uint32 | INDEX_MAGIC
+TRAILER = struct.Struct('<I4s')
+INDEX_MAGIC = b'MJIX'
+
+# 标记记录(类型字段为 0xF)
+MARKER = 0xF0
+ROUND = 0xF0   # 一局开始,第二个字节为牌山字节数
+END = 0xF1     # 一局结束
+KEYFRAME = 0xF2  # 关键帧
+INDEX = 0xF3   # 文件末尾的索引
+
+_FLAGS = ('aka_dora', 'open_tanyao', 'double_yakuman', 'uradora')
+
+
+class ReplayError(ValueError):
+    """回放文件损坏或与引擎不一致"""
+
+
+class ActionRecord(NamedTuple):
+    """一条操作记录"""
+    seat: int
+    type: int   # ActionType 的值
+    index: int  # 在合法操作列表中的序号
+
+    def pack(self) -> bytes:
+        return ACTION.pack(self.type << 4 | self.seat, self.index)
+
+
+class IndexEntry(NamedTuple):
+    """索引项: 一局的开始或一个关键帧"""
+    index: int         # 此处之后第一个操作的全局序号
+    round: int         # 局序号
+    round_offset: int  # 该局 ROUND 标记的文件偏移
+    offset: int = 0    # 关键帧标记的文件偏移(0表示局首)
+
+    @property
+    def is_keyframe(self) -> bool:
+        return self.offset != 0
+
+
+def encode_profile(profile: RuleProfile) -> bytes:
+    """编码文件头与规则"""
+    flags = 0
+    for bit, name in enumerate(_FLAGS):
+        if getattr(profile, name):
+            flags |= 1 << bit
+    kazoe = -1 if profile.kazoe_limit is None else profile.kazoe_limit
+    name = profile.name.encode('utf-8')[:255]
+    return (HEADER.pack(MAGIC, VERSION)
+            + PROFILE.pack(flags, kazoe, profile.riichi_cost, profile.honba_value,
+                           profile.initial_points, profile.player_count)
+            + struct.pack(f'<{profile.player_count}i', *profile.uma)
+            + bytes((len(name),)) + name)
+
+
+def write_profile(stream: BinaryIO, profile: RuleProfile) -> None:
+    """写入文件头与规则"""
+    stream.write(encode_profile(profile))
+
+
+def read_profile(stream: BinaryIO) -> RuleProfile:
+    """读取文件头并还原规则"""
+    magic, version = HEADER.unpack(read_exact(stream, HEADER.size))
+    if magic != MAGIC:
+        raise ReplayError("不是回放文件")
+    if version != VERSION:
+        raise ReplayError(f"不支持的回放版本: {version}")
+    flags, kazoe, riichi_cost, honba_value, initial_points, player_count = \
+        PROFILE.unpack(read_exact(stream, PROFILE.size))
+    uma = struct.unpack(f'<{player_count}i', read_exact(stream, 4 * player_count))
+    name = read_exact(stream, read_exact(stream, 1)[0]).decode('utf-8')
+    options = {field: bool(flags & (1 << bit)) for bit, field in enumerate(_FLAGS)}
+    return RuleProfile(name=name, kazoe_limit=None if kazoe < 0 else kazoe,
+                       riichi_cost=riichi_cost, honba_value=honba_value, uma=uma,
+                       initial_points=initial_points, player_count=player_count, **options)
+
+
+def read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ReplayError("回放文件被截断")
+    return data
@@ -0,0 +1,258 @@
+import io
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import BinaryIO, Generator, Iterator, List, NamedTuple, Optional, Union
+from ..game import Game
+from ..game.driver import Action, DecisionRequest, GameEvent
+from ..game.state import GameState
+from ..game.snapshot import restore
+from ..tile import Tile
+from ..tile.codec import tiles_from_bytes
+from .format import (ACTION, COUNT, END, INDEX, INDEX_ENTRY, INDEX_MAGIC, KEYFRAME, LENGTH, MARKER,
+                     ROUND, TRAILER, ActionRecord, IndexEntry, ReplayError, read_exact, read_profile)
+
+
+@dataclass
+class ReplayRound:
+    """回放中的一局"""
+    index: int
+    wall: List[Tile]
+    actions: List[ActionRecord] = field(default_factory=list)
+    complete: bool = True  # 是否有结束标记(写入中断时为 False)
+    first: int = 0         # 本局第一个操作的全局序号
+    offset: int = 0        # ROUND 标记的文件偏移(流不可定位时为0)
+    keyframes: List[IndexEntry] = field(default_factory=list)
+
+
+class ReplayStep(NamedTuple):
+    """回放中的一次决策: 产出时操作尚未执行"""
+    index: int               # 全局操作序号
+    round: int               # 所在局的序号
+    request: DecisionRequest
+    action: Action
+
+
+class ReplayReader:
+    """读取回放文件并重新驱动对局
+
+    rounds() 逐局流式解析; replay() 以生成器方式重新驱动 Game,
+    按原顺序产出 GameEvent 与 ReplayStep,可在任意操作前停止。
+    seek() 从不晚于目标的最近关键帧恢复状态,只重新模拟其后的操作,
+    耗时只与关键帧间隔有关,与对局长度无关。
+    """
+
+    def __init__(self, stream: BinaryIO):
+        """
+        Args:
+            stream: 以二进制模式打开的可读流(可定位的流支持多次读取与跳转)
+        """
+        self.stream = stream
+        self.profile = read_profile(stream)
+        self._body = stream.tell() if stream.seekable() else None
+        self._index: Optional[List[IndexEntry]] = None
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ReplayReader':
+        return cls(io.BytesIO(data))
+
+    def rounds(self) -> Iterator[ReplayRound]:
+        """逐局解析回放"""
+        stream = self.stream
+        if self._body is not None:
+            stream.seek(self._body)
+        index = 0
+        first = 0
+        while True:
+            offset = stream.tell() if self._body is not None else 0
+            marker = stream.read(ACTION.size)
+            if not marker:
+                return
+            kind, size = ACTION.unpack(_exact(marker))
+            if kind == INDEX:
+                return
+            if kind != ROUND:
+                raise ReplayError(f"缺少一局的开始标记: {kind:#x}")
+            current = self._read_round(index, first, offset, size)
+            yield current
+            index += 1
+            first += len(current.actions)
+
+    def _read_round(self, index: int, first: int, offset: int, size: int) -> ReplayRound:
+        """读取 ROUND 标记之后的一局"""
+        stream = self.stream
+        wall = tiles_from_bytes(read_exact(stream, size))
+        if None in wall:
+            raise ReplayError("非法的牌山编码")
+        current = ReplayRound(index, wall, first=first, offset=offset)
+        actions = current.actions
+        while True:
+            data = stream.read(ACTION.size)
+            if not data:
+                current.complete = False
+                return current
+            head, second = ACTION.unpack(_exact(data))
+            if head == END:
+                return current
+            if head == KEYFRAME:
+                position = stream.tell() - ACTION.size if self._body is not None else 0
+                current.keyframes.append(IndexEntry(first + len(actions), index, offset, position))
+                length, = LENGTH.unpack(read_exact(stream, LENGTH.size))
+                read_exact(stream, length)
+                continue
+            if head & MARKER == MARKER:
+                raise ReplayError(f"非法的操作记录: {head:#x}")
+            actions.append(ActionRecord(head & 0x0F, head >> 4, second))
+
+    def index(self) -> List[IndexEntry]:
+        """各局开始与关键帧的索引(优先读取文件末尾的索引,没有时扫描全文件)"""
+        if self._index is not None:
+            return self._index
+        if self._body is None:
+            raise ReplayError("跳转需要可定位的流")
+        entries = self._read_index()
+        if entries is None:
+            entries = []
+            for current in self.rounds():
+                entries.append(IndexEntry(current.first, current.index, current.offset))
+                entries.extend(current.keyframes)
+        self._index = entries
+        return entries
+
+    def _read_index(self) -> Optional[List[IndexEntry]]:
+        stream = self.stream
+        end = stream.seek(0, io.SEEK_END)
+        if end - self._body < TRAILER.size:
+            return None
+        stream.seek(end - TRAILER.size)
+        offset, magic = TRAILER.unpack(stream.read(TRAILER.size))
+        if magic != INDEX_MAGIC or not self._body <= offset < end:
+            return None
+        stream.seek(offset)
+        kind, _ = ACTION.unpack(read_exact(stream, ACTION.size))
+        if kind != INDEX:
+            return None
+        count, = COUNT.unpack(read_exact(stream, COUNT.size))
+        data = read_exact(stream, count * INDEX_ENTRY.size)
+        return [IndexEntry(*entry) for entry in INDEX_ENTRY.iter_unpack(data)]
+
+    def replay(self, game: Optional[Game] = None) -> Generator[Union[GameEvent, ReplayStep], None, Game]:
+        """重新驱动对局
+
+        对每个决策产出 ReplayStep 后才执行该操作,因此在收到第 n 个
+        ReplayStep 时停止迭代,对局恰好处于执行第 n 个操作之前。
+
+        Args:
+            game: 用于回放的对局,为 None 时按文件中的规则创建
+        Returns:
+            Game: 回放完成后的对局
+        """
+        game = game or Game(self.profile)
+        game.set_state(GameState.WAITING)  # 每局从发牌开始
+        for current in self.rounds():
+            game.wall_order = current.wall
+            yield from _drive(game, current, current.first)
+        return game
+
+    def seek(self, index: int, game: Optional[Game] = None) -> Game:
+        """重新驱动对局到第 index 个操作执行之前
+
+        从不晚于 index 的最近关键帧开始,只重新模拟之后的操作。
+        回放中没有可用的关键帧时从头回放(局首不包含跨局保留的状态)。
+
+        Raises:
+            IndexError: 回放中没有该操作
+        """
+        if index < 0:
+            raise IndexError(f"操作序号超出回放范围: {index}")
+        entries = self.index()
+        position = bisect_right(entries, index, key=lambda entry: entry.index) - 1
+        entry = entries[position] if position >= 0 else None
+        game = game or Game(self.profile)
+        if entry is None or not (entry.is_keyframe or entry.round == 0):
+            return _advance(self.replay(game), index, game)
+
+        stream = self.stream
+        stream.seek(entry.round_offset)
+        kind, size = ACTION.unpack(read_exact(stream, ACTION.size))
+        if kind != ROUND:
+            raise ReplayError("索引与回放内容不一致")
+        current = self._read_round(entry.round, _round_first(entries, position),
+                                   entry.round_offset, size)
+        game.wall_order = current.wall
+        if entry.is_keyframe:
+            stream.seek(entry.offset + ACTION.size)
+            length, = LENGTH.unpack(read_exact(stream, LENGTH.size))
+            restore(game, read_exact(stream, length), order=current.wall)
+        else:
+            game.set_state(GameState.WAITING)
+        return _advance(_drive(game, current, entry.index), index, game)
+
+
+def _advance(steps: Generator, index: int, game: Game) -> Game:
+    """推进回放直到第 index 个操作执行之前"""
+    try:
+        for item in steps:
+            if isinstance(item, ReplayStep) and item.index == index:
+                return game
+    finally:
+        steps.close()
+    raise IndexError(f"操作序号超出回放范围: {index}")
+
+
+def _round_first(entries: List[IndexEntry], position: int) -> int:
+    """索引项所在局的第一个操作序号(局首项总在该局的关键帧之前)"""
+    round_offset = entries[position].round_offset
+    while entries[position].is_keyframe:
+        position -= 1
+        if position < 0 or entries[position].round_offset != round_offset:
+            raise ReplayError("索引中缺少局首")
+    return entries[position].index
+
+
+def _drive(game: Game, current: ReplayRound, index: int) -> Generator[Union[GameEvent, ReplayStep], None, int]:
+    """从第 index 个操作开始驱动一局
+
+    Returns:
+        int: 下一个操作的全局序号
+    """
+    records = iter(current.actions[index - current.first:])
+    gen = game.play()
+    try:
+        item = next(gen)
+        while True:
+            if isinstance(item, DecisionRequest):
+                record = next(records, None)
+                if record is None:
+                    if current.complete:
+                        raise ReplayError(f"第{current.index}局的操作记录不足")
+                    return index  # 写入中断的最后一局
+                action = _resolve(item, record)
+                yield ReplayStep(index, current.index, item, action)
+                index += 1
+                item = gen.send(action)
+            else:
+                yield item
+                item = gen.send(None)
+    except StopIteration:
+        pass
+    finally:
+        gen.close()
+        game.wall_order = None
+    if next(records, None) is not None:
+        raise ReplayError(f"第{current.index}局结束后仍有多余的操作记录")
+    return index
+
+
+def _resolve(request: DecisionRequest, record: ActionRecord) -> Action:
+    """把操作记录还原为决策请求中的合法操作"""
+    actions = request.legal_actions
+    if record.seat != request.seat or record.index >= len(actions) \
+            or actions[record.index].type != record.type:
+        raise ReplayError(f"回放与引擎不一致: 座位{request.seat}, 记录{record}")
+    return actions[record.index]
+
+
+def _exact(data: bytes) -> bytes:
+    if len(data) != ACTION.size:
+        raise ReplayError("回放文件被截断")
+    return data
@@ -0,0 +1,107 @@
+from typing import BinaryIO, List, Optional
+from ..game.snapshot import snapshot
+from .format import (ACTION, COUNT, END, INDEX, INDEX_ENTRY, INDEX_MAGIC, KEYFRAME, LENGTH, ROUND,
+                     TRAILER, ActionRecord, IndexEntry, ReplayError, encode_profile)
+
+
+class ReplayWriter:
+    """挂接到事件总线,把对局流式写入回放文件
+
+    文件头在挂接时写入; 每局在 "deal" 事件时写入牌山,之后每个 "decision"
+    事件写入一条2字节的操作记录,"round_end" 时写入结束标记并刷新。
+    每局第一次摸牌以及距上一个关键帧超过 keyframe_interval 个操作后的摸牌时
+    写入关键帧(关键帧包含跨局保留的局数、供托等状态),close() 时在文件末尾写入索引。同一个 Game 连续进行的多局写入同一文件。
+    """
+
+    def __init__(self, stream: BinaryIO, game=None, keyframe_interval: int = 64):
+        """
+        Args:
+            stream: 以二进制模式打开的可写流
+            game: 要记录的对局,也可稍后通过 attach() 挂接
+            keyframe_interval: 关键帧间隔(操作数),为0时不写关键帧
+        """
+        self.stream = stream
+        self.keyframe_interval = keyframe_interval
+        self.game = None
+        self.profile = None  # 文件头中写入的规则
+        self.rounds = 0   # 已开始的局数
+        self.actions = 0  # 已写入的操作数
+        self.offset = stream.tell() if stream.seekable() else 0  # 当前写入位置
+        self.index: List[IndexEntry] = []
+        self.closed = False
+        self._round_offset = 0
+        self._last_frame: Optional[int] = None  # 上一个关键帧的操作序号(None表示本局还没有)
+        if game is not None:
+            self.attach(game)
+
+    def attach(self, game) -> 'ReplayWriter':
+        """挂接到对局的事件总线"""
+        if self.closed:
+            raise ReplayError("ReplayWriter 已关闭")
+        if self.game is not None:
+            raise ReplayError("ReplayWriter 已挂接到对局")
+        if self.profile is None:
+            self._write(encode_profile(game.profile))
+            self.profile = game.profile
+        elif game.profile != self.profile:
+            raise ReplayError("同一回放文件中的对局必须使用相同规则")
+        self.game = game
+        game.events.on("deal", self._on_deal)
+        game.events.on("draw", self._on_draw)
+        game.events.on("decision", self._on_decision)
+        game.events.on("round_end", self._on_round_end)
+        return self
+
+    def detach(self) -> None:
+        """从事件总线移除"""
+        game = self.game
+        if game is None:
+            return
+        game.events.off("deal", self._on_deal)
+        game.events.off("draw", self._on_draw)
+        game.events.off("decision", self._on_decision)
+        game.events.off("round_end", self._on_round_end)
+        self.game = None
+
+    def close(self) -> None:
+        """移除监听,写入索引并刷新(不关闭流)"""
+        self.detach()
+        if not self.closed and self.profile is not None:
+            index_offset = self.offset
+            self._write(ACTION.pack(INDEX, 0) + COUNT.pack(len(self.index))
+                        + b''.join(INDEX_ENTRY.pack(*entry) for entry in self.index)
+                        + TRAILER.pack(index_offset, INDEX_MAGIC))
+        self.closed = True
+        self.stream.flush()
+
+    def _write(self, data: bytes) -> None:
+        self.stream.write(data)
+        self.offset += len(data)
+
+    def _on_deal(self, *args) -> None:
+        wall = self.game.table.wall.to_bytes()
+        if len(wall) > 255:
+            raise ReplayError(f"牌山过大: {len(wall)}")
+        self._round_offset = self.offset
+        self._last_frame = None
+        self.index.append(IndexEntry(self.actions, self.rounds, self.offset))
+        self._write(ACTION.pack(ROUND, len(wall)) + wall)
+        self.rounds += 1
+
+    def _on_draw(self, *args) -> None:
+        # 摸牌后对局状态完整且下一步必为出牌决策,适合作为关键帧
+        interval = self.keyframe_interval
+        if not interval or (self._last_frame is not None and self.actions - self._last_frame < interval):
+            return
+        state = snapshot(self.game, include_order=False)
+        self.index.append(IndexEntry(self.actions, self.rounds - 1, self._round_offset, self.offset))
+        self._write(ACTION.pack(KEYFRAME, 0) + LENGTH.pack(len(state)) + state)
+        self._last_frame = self.actions
+
+    def _on_decision(self, seat: int, index: int, action_type: int) -> None:
+        self._write(ActionRecord(seat, action_type, index).pack())
+        self.actions += 1
+
+    def _on_round_end(self, *args) -> None:
+        self._write(ACTION.pack(END, 0))
+        self.stream.flush()
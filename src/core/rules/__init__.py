@@ -1,3 +1,4 @@
 from .rules import Rules
+from .profile import RuleProfile, STANDARD, default_profile
 
-__all__ = ['Rules']
\ No newline at end of file
+__all__ = ['Rules', 'RuleProfile', 'STANDARD', 'default_profile']
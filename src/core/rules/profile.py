@@ -0,0 +1,112 @@
+import copy
+from dataclasses import dataclass, replace
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Optional, Tuple
+from ..common.config import Config, get_config
+
+if TYPE_CHECKING:
+    from mahjong.hand_calculating.hand_config import HandConfig, OptionalRules
+
+
+@dataclass(frozen=True)
+class RuleProfile:
+    """编译后的规则配置
+
+    创建时把各规则开关编译为常量,OptionalRules 与 HandConfig 模板在首次判定时
+    构建(此时才导入 mahjong),对局过程中只读取属性,不再查询配置字典。
+    规则对象不可变且可哈希,同一进程中可以同时存在多套规则。
+    """
+    name: str = "standard"
+    aka_dora: bool = False          # 是否计算赤宝牌
+    open_tanyao: bool = True        # 是否允许副露断幺
+    double_yakuman: bool = False    # 是否有双倍役满
+    kazoe_limit: Optional[int] = None  # 累计役满上限(None为不限制)
+    uradora: bool = True            # 立直和牌时是否计算里宝牌
+    riichi_cost: int = 1000         # 立直棒点数
+    honba_value: int = 300          # 每本场点数
+    uma: Tuple[int, ...] = (30000, 10000, -10000, -30000)  # 顺位点(按名次)
+    initial_points: int = 25000
+    player_count: int = 4
+
+    def __post_init__(self):
+        if len(self.uma) != self.player_count:
+            raise ValueError(f"顺位点数量({len(self.uma)})与人数({self.player_count})不一致")
+        object.__setattr__(self, 'uma', tuple(self.uma))
+
+    # 以下为编译结果(首次访问时计算并缓存)
+    @cached_property
+    def honba_per_payer(self) -> int:
+        return self.honba_value // (self.player_count - 1)
+
+    @cached_property
+    def options(self) -> 'OptionalRules':
+        from mahjong.hand_calculating.hand_config import OptionalRules
+        return OptionalRules(
+            has_open_tanyao=self.open_tanyao,
+            has_aka_dora=self.aka_dora,
+            has_double_yakuman=self.double_yakuman,
+            kazoe_limit=self.kazoe_limit,
+        )
+
+    @cached_property
+    def hand_template(self) -> 'HandConfig':
+        from mahjong.hand_calculating.hand_config import HandConfig
+        return HandConfig(options=self.options)
+
+    @classmethod
+    def from_config(cls, config: Config, name: str = "config") -> 'RuleProfile':
+        """从配置文件编译规则"""
+        rules = config.rules
+        return cls(
+            name=name,
+            aka_dora=rules.get("has_aka_dora", True),
+            open_tanyao=rules.get("has_open_tanyao", True),
+            double_yakuman=rules.get("has_double_yakuman", False),
+            riichi_cost=config.riichi_cost,
+            honba_value=config.honba_value,
+            uma=config.uma_values,
+            initial_points=config.initial_points,
+            player_count=config.player_count,
+        )
+
+    def variant(self, **changes) -> 'RuleProfile':
+        """返回修改了部分规则的配置(相同修改只编译一次)"""
+        return _variant(self, tuple(sorted(changes.items())))
+
+    def hand_config(self, player_wind: Optional[int] = None, **flags) -> 'HandConfig':
+        """基于模板构建和牌判定配置
+
+        复制模板而不是重新构造 HandConfig,复用其中的役种表。
+        役种表不是线程安全的,同一规则不应在多个线程中同时判定。
+        """
+        config = copy.copy(self.hand_template)
+        config.player_wind = player_wind
+        config.is_dealer = player_wind == _EAST
+        for key, value in flags.items():
+            setattr(config, key, value)
+        return config
+
+    def uma_for_rank(self, rank: int) -> int:
+        """名次(0起)对应的顺位点"""
+        return self.uma[rank] if rank < len(self.uma) else self.uma[-1]
+
+
+@lru_cache(maxsize=None)
+def _variant(profile: RuleProfile, changes: Tuple) -> RuleProfile:
+    return replace(profile, **dict(changes))
+
+
+_EAST = 27  # mahjong.constants.EAST(34编码中东风的编号)
+
+STANDARD = RuleProfile()  # 内置标准规则
+
+_default: Optional[Tuple[Config, RuleProfile]] = None
+
+
+def default_profile() -> RuleProfile:
+    """当前共享配置对应的规则(配置重新加载后重新编译)"""
+    global _default
+    config = get_config()
+    if _default is None or _default[0] is not config:
+        _default = (config, RuleProfile.from_config(config))
+    return _default[1]
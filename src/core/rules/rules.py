@@ -1,6 +1,5 @@
-import json
-from pathlib import Path
 from typing import Dict, Any
+from ..common.config import get_config
 
 class Rules:
     def __init__(self):
@@ -9,19 +8,8 @@ class Rules:
         self._load_rules()
     
     def _load_rules(self) -> None:
-        """从配置文件加载规则"""
-        try:
-            config_path = Path(__file__).parent.parent.parent / 'assets' / 'config' / 'rule.json'
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
-        except Exception as e:
-            print(f"加载规则配置失败: {e}")
-            # 使用默认配置
-            self.config = {
-                "tile_count": 136,
-                "min_points": 1,
-                "max_points": 13
-            }
+        """从共享配置获取规则(配置文件在进程内只读取一次)"""
+        self.config = get_config().rule
     
     def get_tile_count(self) -> int:
         """获取总牌数"""
@@ -1,9 +1,10 @@
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict
 from ..common.wind import Wind
 from ..player import Player
 from ..hand import Hand
 from ..wall import Wall
 from ..tile import Tile
+from ..tile import zobrist
 
 class Table:
     def __init__(self, player_count: int = 4):
@@ -15,14 +16,44 @@ class Table:
         self.wind_assignments: Dict[str, Wind] = {}
         self.wall: Optional[Wall] = None
         self.round_wind: int = 0  # 0=东, 1=南, 2=西, 3=北
+        self.player_state_observer: Optional[Callable] = None  # 玩家状态变化回调
         self.initialize_wall()
         
+    def fork(self) -> 'Table':
+        """复制牌桌、玩家与牌山(玩家状态回调由复制出的状态机重新挂接)"""
+        clone = Table.__new__(Table)
+        clone.__dict__.update(self.__dict__)
+        clone.players = [player.fork() for player in self.players]
+        clone.wind_assignments = dict(self.wind_assignments)
+        clone.wall = self.wall.fork() if self.wall is not None else None
+        clone.player_state_observer = None
+        return clone
+        
+    @property
+    def zobrist(self) -> int:
+        """牌桌状态(手牌、副露、舍牌、宝牌指示牌、立直与当前座位)的64位 Zobrist 哈希
+        
+        各部分的哈希均为增量维护,这里只按座位组合,开销与人数成正比。
+        点数、供托与局数不计入。
+        """
+        value = zobrist.TURN[self.current_player_index & 15]
+        for seat, player in enumerate(self.players):
+            value ^= zobrist.rotate(player.hand.zobrist ^ player.discard_zobrist, 13 * seat)
+            if player.is_riichi:
+                value ^= zobrist.RIICHI[seat & 15]
+        if self.wall is not None:
+            value ^= self.wall.dora_manager.zobrist
+        return value
+        
     def add_player(self, player: Player) -> bool:
         """添加玩家"""
         if len(self.players) >= self.max_players:
             return False
         
         self.players.append(player)
+        if self.player_state_observer is not None:
+            player.state_observer = self.player_state_observer
+            self.player_state_observer(player, None, player.state)
         # 设置玩家风位
         player.seat_wind = Wind(27 + len(self.players) - 1)  # 东南西北依次分配
         return True
@@ -1,3 +1,4 @@
 from .tile import Tile, TileSuit
+from .codec import tile_code, tile_from_code, tiles_to_bytes, tiles_from_bytes
 
-__all__ = ['Tile', 'TileSuit']
\ No newline at end of file
+__all__ = ['Tile', 'TileSuit', 'tile_code', 'tile_from_code', 'tiles_to_bytes', 'tiles_from_bytes']
@@ -0,0 +1,73 @@
+from operator import attrgetter
+from typing import List, Optional, Sequence
+from .tile import Tile, TileSuit
+
+# 牌的1字节编码: 34种编号(万0-8 筒9-17 索18-26 字27-33),赤五加 RED_FLAG
+NO_TILE = -1
+RED_FLAG = 0x40
+_SUIT_BASE = {TileSuit.MAN: 0, TileSuit.PIN: 9, TileSuit.SOU: 18, TileSuit.HONOR: 27}
+_BASE_SUIT = [(base, suit) for suit, base in sorted(_SUIT_BASE.items(), key=lambda item: -item[1])]
+_cached_code = attrgetter('_code')  # 已缓存的代码(未缓存时为 None)
+
+
+def tile_code(tile: Optional[Tile]) -> int:
+    """牌 -> 1字节代码(34种编号,赤五加 RED_FLAG)"""
+    if tile is None:
+        return NO_TILE
+    code = tile._code
+    if code is None:
+        code = _SUIT_BASE[tile.suit] + tile.value - 1
+        if tile.is_red:
+            code |= RED_FLAG
+        tile._code = code
+    return code
+
+
+def tile_from_code(code: int) -> Optional[Tile]:
+    """1字节代码 -> 牌"""
+    if code < 0:
+        return None
+    index = code & ~RED_FLAG
+    for base, suit in _BASE_SUIT:
+        if index >= base:
+            return Tile(suit, index - base + 1, bool(code & RED_FLAG))
+    raise ValueError(f"非法的牌代码: {code}")
+
+
+def pack_tiles(tiles: Sequence[Tile]) -> int:
+    """把至多4张牌打包为一个整数(每张8位,代码加1以区分空位)"""
+    packed = 0
+    for i, tile in enumerate(tiles[:4]):
+        packed |= (tile_code(tile) + 1) << (8 * i)
+    return packed - (1 << 32) if packed >= 1 << 31 else packed
+
+
+def unpack_tiles(packed: int) -> List[Tile]:
+    """pack_tiles 的逆操作"""
+    packed &= 0xFFFFFFFF
+    tiles = []
+    while packed:
+        tiles.append(tile_from_code((packed & 0xFF) - 1))
+        packed >>= 8
+    return tiles
+
+
+def tiles_to_bytes(tiles: Sequence[Tile]) -> bytes:
+    """牌序列 -> 每张1字节"""
+    try:
+        return bytes(map(_cached_code, tiles))
+    except TypeError:  # 有牌尚未缓存代码
+        return bytes(map(tile_code, tiles))
+
+
+def tiles_from_bytes(data: bytes) -> List[Tile]:
+    """tiles_to_bytes 的逆操作(返回共享的牌对象)"""
+    return list(map(_DECODED.__getitem__, data))
+
+
+# 代码 -> 共享的牌对象(牌对象不可变,解码时直接复用)
+_DECODED: List[Optional[Tile]] = [None] * 0x80
+for _code in range(34):
+    _DECODED[_code] = tile_from_code(_code)
+    if _code in (4, 13, 22):
+        _DECODED[_code | RED_FLAG] = tile_from_code(_code | RED_FLAG)
@@ -14,6 +14,7 @@ class Tile:
         self._value = value
         self._is_red = is_red
         self._hash = hash((suit, value, is_red))  # 预计算哈希值
+        self._code: Optional[int] = None  # 1字节编码(由 codec 首次编码时缓存)
         
     @property
     def suit(self):
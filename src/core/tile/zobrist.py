@@ -0,0 +1,81 @@
+"""Zobrist 哈希键
+
+所有键由固定种子生成,不同进程、不同机器上同一局面的哈希一致,
+可用于置换表与跨回放文件的局面去重。牌以 tile.codec 的1字节代码索引。
+
+各部分的哈希通过异或组合,增减一张牌只需异或一个键:
+    手牌: 第 k 张相同的牌对应 HAND 键(按张数计数,与顺序无关)
+    副露: 整组牌的键,相同副露按出现次数旋转区分
+    牌河/宝牌指示牌: 按位置与牌对应的键(与顺序有关)
+牌桌哈希按座位旋转各玩家的哈希后再组合。
+"""
+import random
+from typing import Sequence
+from .codec import tile_code
+from .tile import Tile
+
+MASK = (1 << 64) - 1
+SEED = 0x4D4A5A42  # 固定种子,修改后所有已保存的哈希失效
+
+_CODES = 0x80     # 牌代码空间(含赤五标志)
+COPY_BITS = 3     # 手牌中同一张牌的计数键数量为 2**COPY_BITS(超出后循环使用)
+COPY_MASK = (1 << COPY_BITS) - 1
+_POSITIONS = 32   # 牌河/指示牌的位置键数量(超出后循环使用)
+
+_rng = random.Random(SEED)
+
+
+def _keys(count: int) -> tuple:
+    return tuple(_rng.getrandbits(64) for _ in range(count))
+
+
+HAND = _keys(_CODES << COPY_BITS)        # [code << COPY_BITS | 已有张数]
+MELD = _keys(_CODES * 4)              # [副露中的位置 * 0x80 + code]
+RIVER = _keys(_CODES * _POSITIONS)    # [位置 * 0x80 + code]
+DORA = _keys(_CODES * _POSITIONS)     # 表宝牌指示牌 [位置 * 0x80 + code]
+URADORA = _keys(_CODES * _POSITIONS)  # 里宝牌指示牌
+URADORA_REVEALED = _keys(1)[0]
+TURN = _keys(16)                      # 当前座位
+RIICHI = _keys(16)                    # 已立直的座位
+PHASE = _keys(8)                      # 回合阶段
+
+
+def rotate(value: int, bits: int) -> int:
+    """64位循环左移(与异或可交换,组合后仍可增量更新)"""
+    bits &= 63
+    return ((value << bits) | (value >> (64 - bits))) & MASK
+
+
+def hand_key(code: int, count: int) -> int:
+    """手牌中已有 count 张同种牌时,再加入一张的键"""
+    return HAND[(code & 0x7F) << COPY_BITS | (count & COPY_MASK)]
+
+
+def meld_codes(tiles: Sequence[Tile]) -> bytes:
+    """副露的牌代码(排序后,与顺序无关),相同副露的代码相同"""
+    return bytes(sorted(tile_code(tile) & 0x7F for tile in tiles))
+
+
+def meld_key(codes: bytes, occurrence: int = 0) -> int:
+    """一组副露的键
+
+    Args:
+        codes: meld_codes() 的结果
+        occurrence: 手牌中已有的相同副露数量
+    """
+    key = 0
+    for position, code in enumerate(codes):
+        key ^= MELD[(position & 3) * _CODES + code]
+    return rotate(key, 7 * occurrence) if occurrence else key
+
+
+def sequence_key(keys: tuple, position: int, tile: Tile) -> int:
+    """牌河或指示牌第 position 张的键"""
+    return keys[(position & (_POSITIONS - 1)) * _CODES + (tile_code(tile) & 0x7F)]
+
+
+def sequence_hash(keys: tuple, tiles: Sequence[Tile], start: int = 0, value: int = 0) -> int:
+    """从 start 开始把 tiles 累积到 value 上"""
+    for position in range(start, len(tiles)):
+        value ^= sequence_key(keys, position, tiles[position])
+    return value
@@ -0,0 +1,5 @@
+from .tracer import Tracer, TableTrace
+from .decoder import LatencyHistogram, TraceRecord, aggregate, format_report, read_trace
+
+__all__ = ['Tracer', 'TableTrace', 'LatencyHistogram', 'TraceRecord', 'aggregate', 'format_report',
+           'read_trace']
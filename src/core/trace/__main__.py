@@ -0,0 +1,3 @@
+from .decoder import main
+
+main()
@@ -0,0 +1,131 @@
+"""追踪文件的离线解码与汇总
+
+    python -m src.core.trace trace.bin [--table 3]
+
+按函数汇总调用次数与耗时分布,输出各函数的平均值与分位数。
+"""
+import argparse
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from .tracer import DEFINE, HEADER, MAGIC, RECORD, RECORD_SIZE, VERSION
+
+_BUCKETS = 64
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    """一条调用记录"""
+    function: str
+    table_id: int
+    duration_ns: int
+    payload: int
+    start_us: int
+
+
+@dataclass
+class LatencyHistogram:
+    """按2的幂分桶的耗时直方图(纳秒)"""
+    count: int = 0
+    total: int = 0
+    min: int = 0
+    max: int = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * _BUCKETS)  # [i]: 耗时 < 2**i
+
+    def add(self, duration_ns: int) -> None:
+        if not self.count or duration_ns < self.min:
+            self.min = duration_ns
+        if duration_ns > self.max:
+            self.max = duration_ns
+        self.count += 1
+        self.total += duration_ns
+        self.buckets[duration_ns.bit_length()] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> int:
+        """分位数的上界(q取0-100),不超过最大值"""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * q // 100))
+        seen = 0
+        for index, value in enumerate(self.buckets):
+            seen += value
+            if seen >= rank:
+                return min(self.max, (1 << index) - 1)
+        return self.max
+
+
+def read_trace(stream: BinaryIO) -> Iterator[TraceRecord]:
+    """逐条读取追踪文件中的调用记录
+
+    Raises:
+        ValueError: 文件头不正确或记录不完整
+    """
+    header = stream.read(HEADER.size)
+    if len(header) != HEADER.size:
+        raise ValueError("追踪文件不完整")
+    magic, version = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"不支持的追踪文件: {magic!r} 版本 {version}")
+    names: Dict[int, str] = {}
+    read = stream.read
+    while True:
+        data = read(RECORD_SIZE)
+        if not data:
+            return
+        if len(data) != RECORD_SIZE:
+            raise ValueError("追踪记录不完整")
+        function, payload, table_id, duration, start = RECORD.unpack(data)
+        if function == DEFINE:
+            size = table_id + (-table_id % RECORD_SIZE)  # 名称按记录大小补齐
+            name = read(size)
+            if len(name) != size:
+                raise ValueError("函数定义不完整")
+            names[payload] = name[:table_id].decode('utf-8')
+            continue
+        yield TraceRecord(names.get(function, f"#{function}"), table_id, duration, payload, start)
+
+
+def aggregate(stream: BinaryIO, table_id: Optional[int] = None) -> Dict[str, LatencyHistogram]:
+    """按函数汇总耗时
+
+    Args:
+        stream: 追踪文件
+        table_id: 只统计该牌桌,为 None 时统计全部
+
+    Returns:
+        Dict[str, LatencyHistogram]: 函数名 -> 耗时直方图
+    """
+    histograms: Dict[str, LatencyHistogram] = {}
+    for record in read_trace(stream):
+        if table_id is not None and record.table_id != table_id:
+            continue
+        histogram = histograms.get(record.function)
+        if histogram is None:
+            histogram = histograms[record.function] = LatencyHistogram()
+        histogram.add(record.duration_ns)
+    return histograms
+
+
+def format_report(histograms: Dict[str, LatencyHistogram]) -> str:
+    """汇总结果的文本表格(微秒),按总耗时降序"""
+    rows: List[Tuple] = [("函数", "次数", "平均", "p50", "p99", "最大")]
+    for name, histogram in sorted(histograms.items(), key=lambda item: -item[1].total):
+        rows.append((name, str(histogram.count), f"{histogram.mean / 1000:.1f}",
+                     f"{histogram.percentile(50) / 1000:.1f}", f"{histogram.percentile(99) / 1000:.1f}",
+                     f"{histogram.max / 1000:.1f}"))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(cell.ljust(width) if i == 0 else cell.rjust(width)
+                               for i, (cell, width) in enumerate(zip(row, widths)))
+                     for row in rows)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="汇总追踪文件中各函数的耗时")
+    parser.add_argument('path')
+    parser.add_argument('--table', type=int, default=None, help="只统计该牌桌")
+    args = parser.parse_args(argv)
+    with open(args.path, 'rb') as f:
+        print(format_report(aggregate(f, args.table)))
@@ -0,0 +1,179 @@
+"""引擎内部的二进制追踪
+
+每次被追踪的调用写入一条16字节的定长记录,按块写入流:
+    函数编号 uint16 | 附加值 int16 | 牌桌编号 uint32 | 耗时(纳秒) uint32 | 开始时间(微秒) uint32
+函数编号 0 保留为定义记录: 附加值为新函数的编号,牌桌编号字段为名称的
+字节数,之后紧跟按16字节补齐的 UTF-8 名称。文件以 MAGIC 和版本号开头。
+开始时间为相对追踪开始的微秒数(约71分钟后回绕)。
+
+采样按牌桌决定: 指定牌桌编号集合,或按牌桌编号的哈希选取固定比例的牌桌
+(同一编号在不同进程中的选择一致)。未被采样的牌桌 Game.trace 为 None,
+驱动不做任何计时。
+"""
+import time
+from functools import wraps
+from typing import BinaryIO, Callable, Dict, Iterable, Optional
+import struct
+
+MAGIC = b'MJTR'
+VERSION = 1
+HEADER = struct.Struct('<4sB3x')
+RECORD = struct.Struct('<HhIII')
+RECORD_SIZE = RECORD.size
+DEFINE = 0  # 定义记录的函数编号
+
+_MAX_DURATION = 0xFFFFFFFF
+_HASH_MULTIPLIER = 0x9E3779B1  # 乘法哈希,使连续的牌桌编号均匀分布
+_perf_counter_ns = time.perf_counter_ns
+
+
+def _payload(result) -> int:
+    """由返回值得到附加值: 列表取长度,布尔/整数取其值,其余为0"""
+    if isinstance(result, list):
+        value = len(result)
+    elif isinstance(result, int):
+        value = int(result)
+    else:
+        return 0
+    return max(-0x8000, min(0x7FFF, value))
+
+
+class Tracer:
+    """追踪写入器
+
+    记录先写入内存缓冲区,写满 buffer_records 条后一次写入流。
+    不是线程安全的,每个线程或进程应使用各自的 Tracer。
+    """
+
+    def __init__(self, stream: BinaryIO, rate: float = 1.0, tables: Optional[Iterable[int]] = None,
+                 buffer_records: int = 4096):
+        """
+        Args:
+            stream: 以二进制模式打开的可写流
+            rate: 被采样牌桌的比例(0-1)
+            tables: 指定采样的牌桌编号,不为 None 时忽略 rate
+            buffer_records: 缓冲的记录数
+        """
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"采样比例必须在0到1之间: {rate}")
+        self.stream = stream
+        self.rate = rate
+        self.tables = None if tables is None else frozenset(tables)
+        self.functions: Dict[str, int] = {}
+        self.records = 0  # 已记录的调用数(不含定义记录)
+        self.closed = False
+        self._threshold = int(rate * (1 << 32))
+        self._buffer = bytearray(buffer_records * RECORD_SIZE)
+        self._offset = 0
+        self._origin = _perf_counter_ns()
+        stream.write(HEADER.pack(MAGIC, VERSION))
+
+    def sampled(self, table_id: int) -> bool:
+        """牌桌是否被采样"""
+        if self.tables is not None:
+            return table_id in self.tables
+        return (table_id * _HASH_MULTIPLIER) & 0xFFFFFFFF < self._threshold
+
+    def table(self, table_id: int) -> Optional['TableTrace']:
+        """牌桌的追踪句柄(未被采样时为 None)"""
+        return TableTrace(self, table_id) if self.sampled(table_id) else None
+
+    def attach(self, game, table_id: int) -> bool:
+        """为对局设置追踪句柄,返回是否被采样"""
+        game.trace = self.table(table_id)
+        return game.trace is not None
+
+    def function(self, name: str) -> int:
+        """函数名 -> 编号(首次使用时写入定义记录)"""
+        function = self.functions.get(name)
+        if function is None:
+            function = len(self.functions) + 1
+            if function > 0x7FFF:
+                raise ValueError("追踪的函数过多")
+            self.functions[name] = function
+            encoded = name.encode('utf-8')
+            padded = -len(encoded) % RECORD_SIZE
+            self._write(RECORD.pack(DEFINE, function, len(encoded), 0, 0) + encoded + bytes(padded))
+        return function
+
+    def record(self, function: int, table_id: int, duration_ns: int, payload: int = 0,
+               start_ns: Optional[int] = None) -> None:
+        """写入一条调用记录
+
+        Args:
+            function: function() 返回的编号
+            table_id: 牌桌编号
+            duration_ns: 耗时(纳秒,超出 uint32 时截断)
+            payload: 附加值(int16)
+            start_ns: 开始时间(perf_counter_ns),为 None 时由结束时间倒推
+        """
+        if self.closed:
+            return
+        now = _perf_counter_ns()
+        if start_ns is None:
+            start_ns = now - duration_ns
+        offset = self._offset
+        if offset == len(self._buffer):
+            self.flush()
+            offset = 0
+        RECORD.pack_into(self._buffer, offset, function, payload, table_id & 0xFFFFFFFF,
+                         min(duration_ns, _MAX_DURATION), ((start_ns - self._origin) // 1000) & 0xFFFFFFFF)
+        self._offset = offset + RECORD_SIZE
+        self.records += 1
+
+    def _write(self, data: bytes) -> None:
+        self.flush()
+        self.stream.write(data)
+
+    def flush(self) -> None:
+        """把缓冲的记录写入流"""
+        if self._offset:
+            self.stream.write(memoryview(self._buffer)[:self._offset])
+            self._offset = 0
+
+    def close(self) -> None:
+        """写出剩余记录(不关闭流)"""
+        if not self.closed:
+            self.flush()
+            self.stream.flush()
+            self.closed = True
+
+    def __enter__(self) -> 'Tracer':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TableTrace:
+    """单张牌桌的追踪句柄"""
+    __slots__ = ('tracer', 'table_id')
+
+    def __init__(self, tracer: Tracer, table_id: int):
+        self.tracer = tracer
+        self.table_id = table_id
+
+    def record(self, name: str, duration_ns: int, payload: int = 0) -> None:
+        """按函数名写入一条记录"""
+        tracer = self.tracer
+        tracer.record(tracer.function(name), self.table_id, duration_ns, payload)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """返回记录每次调用耗时的包装函数(附加值取自返回值)"""
+        tracer = self.tracer
+        function = tracer.function(name)
+        table_id = self.table_id
+        record = tracer.record
+
+        @wraps(func)
+        def traced(*args, **kwargs):
+            start = _perf_counter_ns()
+            result = func(*args, **kwargs)
+            record(function, table_id, _perf_counter_ns() - start, _payload(result), start)
+            return result
+        return traced
+
+    def instrument(self, obj, names: Iterable[str], prefix: str = '') -> None:
+        """把对象上的方法替换为带计时的包装(只影响该实例)"""
+        for name in names:
+            setattr(obj, name, self.wrap(prefix + name.lstrip('_'), getattr(obj, name)))
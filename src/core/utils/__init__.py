@@ -1,4 +1,4 @@
-from .logger import setup_logger
+from .logger import setup_logger, configure_logging, set_level, shutdown_logging
 from .converter import TileConverter
 
-__all__ = ['setup_logger', 'TileConverter']
\ No newline at end of file
+__all__ = ['setup_logger', 'configure_logging', 'set_level', 'shutdown_logging', 'TileConverter']
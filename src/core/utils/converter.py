@@ -1,6 +1,5 @@
 from typing import List, Optional
 from src.core.tile import Tile, TileSuit
-from mahjong.tile import TilesConverter
 
 
 class TileConverter:
@@ -17,6 +16,8 @@ class TileConverter:
         Returns:
             List[int]: 136格式的牌数组
         """
+        from mahjong.tile import TilesConverter  # 首次转换时才导入 mahjong
+
         # 按照花色分类
         man = ''
         pin = ''
@@ -24,12 +25,14 @@ class TileConverter:
         honors = ''
         
         for tile in tiles:
+            # 启用赤宝牌时赤五记为0,对应 mahjong 包中的赤五编号
+            value = '0' if has_aka_dora and tile.is_red else str(tile.value)
             if tile.suit == TileSuit.MAN:
-                man += str(tile.value)
+                man += value
             elif tile.suit == TileSuit.PIN:
-                pin += str(tile.value)
+                pin += value
             elif tile.suit == TileSuit.SOU:
-                sou += str(tile.value)
+                sou += value
             elif tile.suit == TileSuit.HONOR:
                 honors += str(tile.value)
                 
@@ -1,42 +1,126 @@
+"""日志配置
+
+setup_logger() 配置的 logger 共用一个 QueueHandler: 调用方只把日志记录放入
+队列,格式化后的写文件与输出到控制台由 QueueListener 的后台线程完成,
+不阻塞对局逻辑。日志文件按大小轮转,目录与文件在第一条记录写入时才创建。
+
+级别默认为 INFO(不输出 DEBUG),可通过环境变量 MAHJONG_LOG_LEVEL
+或 configure_logging()/set_level() 修改。热点路径中的调试日志应使用
+%s 占位符延迟格式化,构造开销较大的内容先用 logger.isEnabledFor() 判断。
+"""
+import atexit
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional, Union
+
+LOG_DIR = 'logs'
+LOG_FILE = 'mahjong.log'
+LEVEL_ENV = 'MAHJONG_LOG_LEVEL'
+DEFAULT_LEVEL = logging.INFO
+MAX_BYTES = 5 * 1024 * 1024  # 单个日志文件的最大字节数
+BACKUP_COUNT = 3             # 保留的轮转文件数
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_handler: Optional[QueueHandler] = None  # 各 logger 共用(重新配置时只替换其队列)
+_listener: Optional[QueueListener] = None
+_level = DEFAULT_LEVEL
+_loggers: List[logging.Logger] = []
+
+
+class _RotatingFileHandler(RotatingFileHandler):
+    """首次写入记录时才创建日志目录与文件(配置日志不产生文件系统副作用)"""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def _resolve_level(level: Union[int, str, None]) -> int:
+    """级别名称或数值 -> 数值(None 时读取环境变量)"""
+    if level is None:
+        level = os.environ.get(LEVEL_ENV) or DEFAULT_LEVEL
+    if isinstance(level, str):
+        value = logging.getLevelName(level.strip().upper())
+        if not isinstance(value, int):
+            raise ValueError(f"未知的日志级别: {level}")
+        return value
+    return level
+
+
+def configure_logging(level: Union[int, str, None] = None, log_dir: Optional[str] = LOG_DIR,
+                      max_bytes: int = MAX_BYTES, backup_count: int = BACKUP_COUNT,
+                      console: bool = True) -> QueueListener:
+    """配置日志输出并启动后台写入线程(重复调用时替换之前的配置)
+
+    Args:
+        level: 日志级别,为 None 时使用环境变量 MAHJONG_LOG_LEVEL,默认 INFO
+        log_dir: 日志目录,为 None 时不写文件
+        max_bytes: 日志文件轮转的大小
+        backup_count: 保留的轮转文件数
+        console: 是否同时输出到标准输出
+
+    Returns:
+        QueueListener: 后台写入线程
+    """
+    global _handler, _listener
+    shutdown_logging()
+    handlers: List[logging.Handler] = []
+    if log_dir:
+        handlers.append(_RotatingFileHandler(os.path.join(log_dir, LOG_FILE), maxBytes=max_bytes,
+                                             backupCount=backup_count, encoding='utf-8', delay=True))
+    if console:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    formatter = logging.Formatter(FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    if _handler is None:
+        _handler = QueueHandler(records)
+    else:
+        _handler.queue = records
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    set_level(level)
+    return _listener
+
+
+def set_level(level: Union[int, str, None]) -> None:
+    """修改 setup_logger() 配置的所有 logger 的级别"""
+    global _level
+    _level = _resolve_level(level)
+    for logger in _loggers:
+        logger.setLevel(_level)
+
+
+def shutdown_logging() -> None:
+    """处理完队列中的剩余记录后停止后台线程并关闭文件"""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
 
 def setup_logger(name: str) -> logging.Logger:
-    """设置并返回一个logger实例"""
+    """设置并返回一个logger实例(首次调用时按默认设置启动日志线程)"""
     logger = logging.getLogger(name)
-    
+
     # 如果logger已经有处理器，直接返回
     if logger.handlers:
         return logger
-        
-    logger.setLevel(logging.DEBUG)
-    
-    # 创建日志目录
-    log_dir = 'logs'
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    # 文件处理器
-    file_handler = logging.FileHandler(
-        os.path.join(log_dir, 'mahjong.log'),
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.DEBUG)
-    
-    # 控制台处理器
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.DEBUG)
-    
-    # 设置格式
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # 添加处理器
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger 
\ No newline at end of file
+
+    if _listener is None:
+        configure_logging()
+    logger.setLevel(_level)
+    logger.addHandler(_handler)
+    _loggers.append(logger)
+    return logger
+
+
+atexit.register(shutdown_logging)
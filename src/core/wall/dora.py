@@ -1,5 +1,6 @@
 from typing import List
 from src.core.tile import Tile, TileSuit
+from src.core.tile import zobrist
 
 class DoraManager:
     """宝牌管理器"""
@@ -7,19 +8,46 @@ class DoraManager:
         self.dora_indicators: List[Tile] = []      # 表宝牌指示牌
         self.uradora_indicators: List[Tile] = []   # 里宝牌指示牌
         self.revealed_uradora = False              # 是否已翻开里宝牌
+        self._zobrist = 0
+        
+    @property
+    def zobrist(self) -> int:
+        """宝牌指示牌与里宝牌翻开状态的64位 Zobrist 哈希"""
+        return self._zobrist
+        
+    def rehash(self) -> None:
+        """直接修改指示牌列表后重新计算哈希"""
+        value = zobrist.sequence_hash(zobrist.DORA, self.dora_indicators)
+        value = zobrist.sequence_hash(zobrist.URADORA, self.uradora_indicators, value=value)
+        if self.revealed_uradora:
+            value ^= zobrist.URADORA_REVEALED
+        self._zobrist = value
+        
+    def fork(self) -> 'DoraManager':
+        """复制宝牌状态"""
+        clone = DoraManager.__new__(DoraManager)
+        clone.dora_indicators = list(self.dora_indicators)
+        clone.uradora_indicators = list(self.uradora_indicators)
+        clone.revealed_uradora = self.revealed_uradora
+        clone._zobrist = self._zobrist
+        return clone
         
     def add_dora_indicator(self, tile: Tile):
         """添加表宝牌指示牌"""
         if len(self.dora_indicators) < 5:  # 最多5个指示牌
+            self._zobrist ^= zobrist.sequence_key(zobrist.DORA, len(self.dora_indicators), tile)
             self.dora_indicators.append(tile)
             
     def add_uradora_indicator(self, tile: Tile):
         """添加里宝牌指示牌"""
         if len(self.uradora_indicators) < 5:
+            self._zobrist ^= zobrist.sequence_key(zobrist.URADORA, len(self.uradora_indicators), tile)
             self.uradora_indicators.append(tile)
             
     def reveal_uradora(self):
         """翻开里宝牌"""
+        if not self.revealed_uradora:
+            self._zobrist ^= zobrist.URADORA_REVEALED
         self.revealed_uradora = True
         
     def get_dora_tiles(self) -> List[Tile]:
@@ -1,23 +1,42 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 import random
 from src.core.tile import Tile, TileSuit
+from src.core.tile.codec import tiles_to_bytes
 from src.core.wall.dora import DoraManager
+from src.core.common.config import get_config
+
+_TILES: Optional[Tuple[Tile, ...]] = None  # 一副牌(首次洗牌时创建,之后每局复用)
 
 
 class Wall:
     def __init__(self):
         self.tiles = []  # 牌山
+        self.order: List[Tile] = []  # 洗牌后的完整牌序(用于回放)
+        self._order_bytes: Optional[bytes] = None  # 牌序编码的缓存
         self._remaining_count: int = 0
+        self.drawn: int = 0  # 已从牌山顶部摸走的牌数
         self.dead_wall_tiles: List[Tile] = []  # 王牌区
-        self.dead_wall_size: int = 14  # 王牌区大小
+        config = get_config()
+        self.dead_wall_size: int = config.dead_wall_tiles  # 王牌区大小
+        self.max_dora_indicators: int = config.max_dora_indicators  # 宝牌指示牌上限
         self.dora_manager = DoraManager()  # 宝牌管理器
         self.initialize()
     
-    def initialize(self) -> None:
-        """初始化牌山"""
-        self.tiles = self._create_tiles()  # 创建所有牌
+    def initialize(self, order: Optional[Sequence[Tile]] = None) -> None:
+        """初始化牌山
+        Args:
+            order: 预设的牌序(回放时使用),为 None 时随机洗牌
+        """
+        self.dora_manager = DoraManager()  # 重新初始化时清空宝牌指示牌
+        if order is None:
+            self.tiles = self._create_tiles()  # 创建所有牌
+            self.shuffle()
+        else:
+            self.tiles = list(order)
+        self.order = list(self.tiles)
+        self._order_bytes = None
+        self.drawn = 0
         self._remaining_count = len(self.tiles)
-        self.shuffle()
         self.setup_dead_wall()  # 设置王牌区
         
         # 初始化第一张宝牌指示牌
@@ -26,26 +45,60 @@ class Wall:
         # 不在初始化时添加里宝牌指示牌
     
     def _create_tiles(self) -> List[Tile]:
-        """创建所有牌"""
-        tiles = []
-        # 生成数牌
-        for suit in [TileSuit.MAN, TileSuit.PIN, TileSuit.SOU]:
-            for number in range(1, 10):
-                for i in range(4):
-                    is_red = number == 5 and i == 0  # 5万/5筒/5索中各有一张赤宝牌
-                    tiles.append(Tile(suit, number, is_red))
-        
-        # 生成字牌
-        for number in range(1, 8):
-            for _ in range(4):
-                tiles.append(Tile(TileSuit.HONOR, number))
+        """创建所有牌(牌对象不可变,各牌山共用同一组136张)"""
+        global _TILES
+        if _TILES is None:
+            tiles = []
+            # 生成数牌
+            for suit in [TileSuit.MAN, TileSuit.PIN, TileSuit.SOU]:
+                for number in range(1, 10):
+                    for i in range(4):
+                        is_red = number == 5 and i == 0  # 5万/5筒/5索中各有一张赤宝牌
+                        tiles.append(Tile(suit, number, is_red))
+            
+            # 生成字牌
+            for number in range(1, 8):
+                for _ in range(4):
+                    tiles.append(Tile(TileSuit.HONOR, number))
+            _TILES = tuple(tiles)
                 
-        return tiles
+        return list(_TILES)
     
     def shuffle(self) -> None:
         """洗牌"""
         random.shuffle(self.tiles)
     
+    def restore(self, order: Sequence[Tile], drawn: int, count: int, remaining: int) -> None:
+        """按牌序与摸牌位置恢复牌山(不洗牌)
+        Args:
+            order: 洗牌后的完整牌序
+            drawn: 已从顶部摸走的牌数
+            count: 牌山中剩余的牌数
+            remaining: 剩余牌计数
+        """
+        if order is not self.order:
+            self.order = list(order)
+            self._order_bytes = None
+        live = len(self.order) - self.dead_wall_size
+        self.tiles = self.order[drawn:min(drawn + count, live)]
+        self.dead_wall_tiles = self.order[live:]
+        self.drawn = drawn
+        self._remaining_count = remaining
+    
+    def fork(self) -> 'Wall':
+        """复制牌山(牌序与王牌区只会整体替换,与原牌山共享)"""
+        clone = Wall.__new__(Wall)
+        clone.__dict__.update(self.__dict__)
+        clone.tiles = list(self.tiles)
+        clone.dora_manager = self.dora_manager.fork()
+        return clone
+    
+    def to_bytes(self) -> bytes:
+        """洗牌后的牌序编码(每张1字节,牌序不变时复用)"""
+        if self._order_bytes is None:
+            self._order_bytes = tiles_to_bytes(self.order)
+        return self._order_bytes
+    
     @property
     def remaining_count(self) -> int:
         """获取剩余牌数"""
@@ -59,6 +112,7 @@ class Wall:
         # 从牌山顶部摸一张牌
         tile = self.tiles.pop(0)
         self._remaining_count -= 1
+        self.drawn += 1
         return tile
     
     def get_remaining_count(self) -> int:
@@ -76,7 +130,7 @@ class Wall:
     
     def handle_kan_dora(self) -> None:
         """处理杠宝牌"""
-        if len(self.dora_manager.dora_indicators) < 5:  # 最多5个宝牌指示牌
+        if len(self.dora_manager.dora_indicators) < self.max_dora_indicators:
             self.dora_manager.add_dora_indicator()
     
     # 添加属性代理
@@ -90,7 +144,7 @@ class Wall:
     
     def add_dora_indicator(self) -> None:
         """添加新的宝牌指示牌"""
-        if len(self.dora_indicators) >= 5:
+        if len(self.dora_indicators) >= self.max_dora_indicators:
             return
         
         # 计算下一个宝牌指示牌的位置
@@ -119,4 +173,4 @@ class Wall:
     def add_uradora_indicator(self) -> None:
         """添加里宝牌指示牌"""
         if len(self.tiles) > 0 and len(self.uradora_indicators) < len(self.dora_indicators):
-            self.uradora_indicators.append(self.tiles.pop())
\ No newline at end of file
+            self.dora_manager.add_uradora_indicator(self.tiles.pop())
\ No newline at end of file
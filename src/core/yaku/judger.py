@@ -1,12 +1,9 @@
 from typing import List, Optional, Dict
 import logging
-from mahjong.hand_calculating.hand import HandCalculator
-from mahjong.tile import TilesConverter
-from mahjong.hand_calculating.hand_config import HandConfig, OptionalRules
-from mahjong.meld import Meld
 from src.core.tile import Tile, TileSuit
 from src.core.utils.logger import setup_logger
 from src.core.utils.converter import TileConverter
+from src.core.rules.profile import RuleProfile, STANDARD
 
 class YakuJudger:
     # 添加错误代码常量
@@ -35,8 +32,9 @@ class YakuJudger:
         ERR_CHIIHOU_WITH_MELD: "地和不能有副露"
     }
 
-    def __init__(self):
-        self.calculator = HandCalculator()
+    def __init__(self, profile: Optional[RuleProfile] = None):
+        self._calculator = None  # 和牌计算器(首次判定时创建,此时才导入 mahjong)
+        self.profile = profile or STANDARD
         self.logger = setup_logger(__name__)
         # 添加役种名称映射
         self.yaku_name_mapping = {
@@ -82,6 +80,14 @@ class YakuJudger:
             '赤宝牌': 'aka dora'
         }
 
+    @property
+    def calculator(self):
+        calculator = self._calculator
+        if calculator is None:
+            from mahjong.hand_calculating.hand import HandCalculator
+            calculator = self._calculator = HandCalculator()
+        return calculator
+
     def _get_suit_char(self, suit: TileSuit) -> str:
         """将TileSuit枚举转换为mahjong包使用的字符"""
         if suit == TileSuit.MAN:
@@ -97,7 +103,7 @@ class YakuJudger:
     def judge(self, tiles: List[Tile], melds: Optional[List[List[Tile]]] = None, 
              win_tile: Optional[Tile] = None, is_tsumo: bool = False, 
              is_riichi: bool = False, dora_tiles: List[Tile] = None, 
-             uradora_tiles: List[Tile] = None, has_aka_dora: bool = False,
+             uradora_tiles: List[Tile] = None, has_aka_dora: Optional[bool] = None,
              is_ippatsu: bool = False,
              is_rinshan: bool = False,
              is_chankan: bool = False,
@@ -114,7 +120,6 @@ class YakuJudger:
              kyoutaku_number: int = 0,
              tsumi_number: int = 0,
              paarenchan: int = 0) -> Dict:
-        self.logger.debug(f"开始判定役种: 手牌数={len(tiles)}, 副露数={len(melds) if melds else 0}, 和牌={win_tile}, 自摸={is_tsumo}, 立直={is_riichi}, 表宝牌={dora_tiles}, 里宝牌={uradora_tiles}, 赤宝牌={has_aka_dora}, 一发={is_ippatsu}, 岭上开花={is_rinshan}, 抢杠={is_chankan}, 海底摸月={is_haitei}, 河底捞鱼={is_houtei}, 双立直={is_daburu_riichi}, 流局满贯={is_nagashi_mangan}, 天和={is_tenhou}, 人和={is_renhou}, 地和={is_chiihou}, 开立直={is_open_riichi}, 自风={player_wind}, 场风={round_wind}, 供托数={kyoutaku_number}, 积棒数={tsumi_number}, 连庄数={paarenchan}")
         """判定和牌役种
     
         Args:
@@ -125,7 +130,7 @@ class YakuJudger:
             is_riichi (bool, optional): 是否立直. Defaults to False.
             dora_tiles (List[Tile], optional): 表宝牌指示牌列表. Defaults to None.
             uradora_tiles (List[Tile], optional): 里宝牌指示牌列表. Defaults to None.
-            has_aka_dora (bool, optional): 是否启用赤宝牌规则. Defaults to False.
+            has_aka_dora (Optional[bool], optional): 是否启用赤宝牌规则. Defaults to None(按规则配置).
             is_ippatsu (bool, optional): 是否一发. Defaults to False.
             is_rinshan (bool, optional): 是否岭上开花. Defaults to False.
             is_chankan (bool, optional): 是否抢杠. Defaults to False.
@@ -150,11 +155,23 @@ class YakuJudger:
                 - fu: 符数
                 - score: 基本点数
         """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("开始判定役种: 手牌=%s, 副露=%s, 和牌=%s, 自摸=%s, 立直=%s, 表宝牌=%s, 里宝牌=%s, "
+                              "赤宝牌=%s, 一发=%s, 岭上开花=%s, 抢杠=%s, 海底摸月=%s, 河底捞鱼=%s, 双立直=%s, "
+                              "流局满贯=%s, 天和=%s, 人和=%s, 地和=%s, 开立直=%s, 自风=%s, 场风=%s, "
+                              "供托数=%s, 积棒数=%s, 连庄数=%s",
+                              [str(t) for t in tiles], len(melds) if melds else 0, win_tile, is_tsumo,
+                              is_riichi, dora_tiles, uradora_tiles, has_aka_dora, is_ippatsu, is_rinshan,
+                              is_chankan, is_haitei, is_houtei, is_daburu_riichi, is_nagashi_mangan,
+                              is_tenhou, is_renhou, is_chiihou, is_open_riichi, player_wind, round_wind,
+                              kyoutaku_number, tsumi_number, paarenchan)
+        profile = self.profile
+        if has_aka_dora is None:
+            has_aka_dora = profile.aka_dora
+        elif has_aka_dora != profile.aka_dora:
+            profile = profile.variant(aka_dora=has_aka_dora)
+        from mahjong.meld import Meld
         try:
-            self.logger.debug(f"开始判定役种: 手牌数={len(tiles)}, 副露数={len(melds) if melds else 0}")
-            self.logger.debug(f"手牌详情: {[str(t) for t in tiles]}")
-            self.logger.debug(f"和牌: {win_tile}")
-            
             # 转换手牌为136格式
             tiles_136 = TileConverter.to_136_array(tiles, has_aka_dora)
             
@@ -185,11 +202,12 @@ class YakuJudger:
             
             # 转换里宝牌指示牌为136格式
             uradora_136 = []
-            if is_riichi and uradora_tiles:
+            if is_riichi and uradora_tiles and profile.uradora:
                 uradora_136 = TileConverter.to_136_array(uradora_tiles, has_aka_dora)
             
-            # 设置规则配置
-            config = HandConfig(
+            # 基于规则模板设置判定配置
+            config = profile.hand_config(
+                player_wind=player_wind,
                 is_tsumo=is_tsumo,
                 is_riichi=is_riichi,
                 is_ippatsu=is_ippatsu,
@@ -203,18 +221,10 @@ class YakuJudger:
                 is_renhou=is_renhou,
                 is_chiihou=is_chiihou,
                 is_open_riichi=is_open_riichi,
-                player_wind=player_wind,
                 round_wind=round_wind,
                 kyoutaku_number=kyoutaku_number,
                 tsumi_number=tsumi_number,
                 paarenchan=paarenchan,
-                options=OptionalRules(
-                    has_open_tanyao=True,
-                    has_aka_dora=has_aka_dora,
-                    has_double_yakuman=False,  # 不使用双倍役满
-                    kazoe_limit=None,          # 不限制累计役满
-                ),
-                
             )
             
             # 添加宝牌指示牌
@@ -223,7 +233,7 @@ class YakuJudger:
                 dora_indicators.extend(dora_136)
             if is_riichi and uradora_136:
                 dora_indicators.extend(uradora_136)
-            self.logger.debug(f"宝牌指示牌: {dora_indicators}")
+            self.logger.debug("宝牌指示牌: %s", dora_indicators)
             
             # 计算役种
             result = self.calculator.estimate_hand_value(
@@ -272,8 +282,7 @@ class YakuJudger:
             return response
             
         except Exception as e:
-            self.logger.error(f"役种判定出错: {str(e)}")
-            self.logger.error("详细错误信息:", exc_info=True)
+            self.logger.error("役种判定出错: %s", e, exc_info=True)
             return {
                 'yaku': [],
                 'han': 0,
@@ -281,11 +290,12 @@ class YakuJudger:
                 'score': 0,
                 'error': str(e)  # 返回具体错误信息
             }
-            self.logger.debug(f"和牌判定结果: {response}")
+            self.logger.debug("和牌判定结果: %s", response)
             return response 
 
     def _get_meld_type(self, meld: List[Tile]) -> str:
         """根据副露类型和牌的数量判断副露种类"""
+        from mahjong.meld import Meld
         if len(meld) == 3:
             if len(set(meld)) == 1:  # 三张相同的牌
                 return Meld.PON
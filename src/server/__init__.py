@@ -0,0 +1,13 @@
+from .host import TableHost, PlayerClient, LocalClient, HostStats
+from .broadcast import StatePublisher, SPECTATOR
+from .server import GameServer, RemoteClient
+from src.core.common.lazy import lazy_exports
+
+# 客户端模块同时是压测入口(python -m src.server.client),不在包导入时加载
+__getattr__, __dir__ = lazy_exports(__name__, globals(), {
+    'GameClient': '.client',
+    'run_load_test': '.client',
+})
+
+__all__ = ['TableHost', 'PlayerClient', 'LocalClient', 'HostStats',
+           'StatePublisher', 'SPECTATOR', 'GameServer', 'RemoteClient', 'GameClient', 'run_load_test']
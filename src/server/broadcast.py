@@ -0,0 +1,221 @@
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+from src.core.game import Game
+from src.core.game.driver import GameEvent
+from src.server.protocol import dumps, encode_tile
+
+SPECTATOR = -1  # 旁观者视角(看不到任何手牌)
+
+# 鸣牌事件名
+_CALL_EVENTS = ("chi", "pon", "kan")
+
+
+class StatePublisher:
+    """牌桌状态差分发布器
+
+    把对局事件转换为按视角裁剪的最小增量。视角为座位号(0-3)或 SPECTATOR,
+    每个视角的增量只编码一次,再分发给该视角的所有订阅者,
+    广播开销与视角数成正比,与订阅者数无关。
+    不含隐藏信息的增量在所有视角间共享同一份编码。
+    后加入的订阅者先收到关键帧,再接收之后的增量。
+    """
+
+    def __init__(self, game: Game, table_id: int = 0):
+        self.game = game
+        self.table_id = table_id
+        self.seq = 0  # 已发布的增量序号
+        self.subscribers: Dict[int, Set[Hashable]] = {}
+        self._scores: List[int] = [p.points for p in game.players]
+        self._dora_count = 0
+        self._keyframes: Dict[int, Tuple[int, bytes]] = {}
+        self._state: Optional[Dict[str, Any]] = None  # 已发布状态的镜像(发牌后建立)
+
+    # ---- 订阅 ----
+
+    def subscribe(self, viewpoint: int, subscriber: Hashable) -> None:
+        """订阅视角"""
+        self.subscribers.setdefault(viewpoint, set()).add(subscriber)
+
+    def unsubscribe(self, subscriber: Hashable) -> None:
+        """取消订阅"""
+        for subscribers in self.subscribers.values():
+            subscribers.discard(subscriber)
+
+    # ---- 关键帧 ----
+
+    def keyframe(self, viewpoint: int) -> bytes:
+        """已发布状态的关键帧(按序号缓存)
+
+        关键帧取自随增量同步更新的镜像状态,而不是引擎的实时状态,
+        因此与之后的增量严格衔接。
+        """
+        cached = self._keyframes.get(viewpoint)
+        if cached is not None and cached[0] == self.seq:
+            return cached[1]
+        data = dumps({"op": "keyframe", "table": self.table_id, "seq": self.seq,
+                      "state": self.snapshot(viewpoint)})
+        self._keyframes[viewpoint] = (self.seq, data)
+        return data
+
+    def snapshot(self, viewpoint: int) -> Dict[str, Any]:
+        """构建视角可见的完整状态"""
+        state = self._state if self._state is not None else self._capture()
+        seats = []
+        for seat, info in enumerate(state["seats"]):
+            info = dict(info)
+            if seat != viewpoint:
+                info["hand"] = len(info["hand"])
+            seats.append(info)
+        return dict(state, seats=seats)
+
+    def _capture(self) -> Dict[str, Any]:
+        """从引擎读取完整状态(含所有手牌)"""
+        table = self.game.table
+        wall = table.wall
+        return {
+            "seats": [{
+                "hand": [encode_tile(t) for t in player.hand.tiles],
+                "melds": [[encode_tile(t) for t in meld] for meld in player.hand.melds],
+                "discards": [encode_tile(t) for t in player.discards],
+                "riichi": player.is_riichi,
+                "points": player.points,
+            } for player in table.players],
+            "turn": table.current_player_index,
+            "dealer": table.dealer_index,
+            "round_wind": table.round_wind,
+            "dora": [encode_tile(t) for t in wall.dora_indicators] if wall else [],
+            "left": wall.remaining_count if wall else 0,
+        }
+
+    # ---- 增量 ----
+
+    def publish(self, event: GameEvent) -> List[Tuple[bytes, List[Hashable]]]:
+        """把事件编码为各视角的增量
+
+        Returns:
+            List[Tuple[bytes, List]]: (编码后的增量, 订阅者列表),无增量时为空
+        """
+        if event.name == "deal":
+            # 新的一局: 以发牌后的状态重建镜像
+            self._state = self._capture()
+            self._dora_count = len(self._state["dora"])
+            self._scores = [seat["points"] for seat in self._state["seats"]]
+            self.seq += 1
+            return self._broadcast([{"t": "deal"}])
+        public, private = self._ops(event)
+        public.extend(self._diff())
+        if not public and private is None:
+            return []
+        self.seq += 1
+        if self._state is not None:
+            for op in ([private[1]] if private else []) + public:
+                self._apply(op)
+        if private is None:
+            return self._broadcast(public)
+        owner, op, redacted = private
+        shared = None
+        batches = []
+        for viewpoint, subscribers in self.subscribers.items():
+            if not subscribers:
+                continue
+            if viewpoint == owner:
+                batches.append((self._encode([op] + public), list(subscribers)))
+            else:
+                if shared is None:
+                    shared = self._encode([redacted] + public)
+                batches.append((shared, list(subscribers)))
+        return batches
+
+    def _broadcast(self, ops: List[Dict[str, Any]]) -> List[Tuple[bytes, List[Hashable]]]:
+        """所有视角共享同一份编码"""
+        subscribers = [s for group in self.subscribers.values() for s in group]
+        return [(self._encode(ops), subscribers)] if subscribers else []
+
+    def _encode(self, ops: List[Dict[str, Any]]) -> bytes:
+        return dumps({"op": "delta", "table": self.table_id, "seq": self.seq, "ops": ops})
+
+    def _ops(self, event: GameEvent):
+        """事件对应的操作: 返回(公开操作列表, 私密操作或None)
+
+        私密操作为(所属座位, 本人可见的操作, 其他视角可见的操作)。
+        """
+        name, args = event.name, event.args
+        if name == "draw":
+            seat, tile = args
+            left = self.game.table.wall.remaining_count
+            return [], (seat, {"t": "draw", "s": seat, "tile": encode_tile(tile), "left": left},
+                        {"t": "draw", "s": seat, "left": left})
+        if name == "discard":
+            seat, tile, tsumogiri = args
+            return [{"t": "discard", "s": seat, "tile": encode_tile(tile), "tsumogiri": tsumogiri}], None
+        if name == "riichi":
+            return [{"t": "riichi", "s": args[0]}], None
+        if name in _CALL_EVENTS:
+            seat, tiles = args
+            return [{"t": name, "s": seat, "tiles": [encode_tile(t) for t in tiles]}], None
+        if name in ("tsumo", "ron"):
+            # 和牌时公开手牌
+            seat = args[0]
+            hand = self.game.table.players[seat].hand.tiles
+            return [{"t": name, "s": seat, "hand": [encode_tile(t) for t in hand]}], None
+        if name == "round_end":
+            return [{"t": "end", "winner": args[0]}], None
+        if name in ("exhaustive_draw", "special_draw"):
+            return [{"t": name}], None
+        return [], None
+
+    def _diff(self) -> List[Dict[str, Any]]:
+        """宝牌指示牌与点数的变化"""
+        ops = []
+        wall = self.game.table.wall
+        indicators = wall.dora_indicators if wall else []
+        if len(indicators) < self._dora_count:
+            self._dora_count = 0  # 新的一局
+        for tile in indicators[self._dora_count:]:
+            ops.append({"t": "dora", "tile": encode_tile(tile)})
+        self._dora_count = len(indicators)
+        for seat, player in enumerate(self.game.table.players):
+            if seat >= len(self._scores):
+                self._scores.append(player.points)
+            elif player.points != self._scores[seat]:
+                self._scores[seat] = player.points
+                ops.append({"t": "score", "s": seat, "points": player.points})
+        return ops
+
+    def _apply(self, op: Dict[str, Any]) -> None:
+        """把操作应用到镜像状态"""
+        state = self._state
+        kind = op["t"]
+        if kind == "dora":
+            state["dora"].append(op["tile"])
+            return
+        if kind in ("end", "exhaustive_draw", "special_draw"):
+            return
+        seat = state["seats"][op["s"]]
+        if kind == "draw":
+            seat["hand"].append(op["tile"])
+            state["left"] = op["left"]
+            state["turn"] = op["s"]
+        elif kind == "discard":
+            _remove(seat["hand"], op["tile"])
+            seat["discards"].append(op["tile"])
+        elif kind == "riichi":
+            seat["riichi"] = True
+        elif kind == "score":
+            seat["points"] = op["points"]
+        elif kind in _CALL_EVENTS:
+            for tile in op["tiles"][:-1]:
+                _remove(seat["hand"], tile)
+            seat["melds"].append(list(op["tiles"]))
+            state["turn"] = op["s"]
+        elif kind in ("tsumo", "ron"):
+            seat["hand"] = list(op["hand"])
+
+
+def _remove(hand: List[str], code: str) -> None:
+    """从镜像手牌中移除一张牌(赤五与普通五视为同一种牌)"""
+    if code in hand:
+        hand.remove(code)
+        return
+    alias = ('5' if code[0] == '0' else '0') + code[1] if code[0] in '05' else None
+    if alias in hand:
+        hand.remove(alias)
@@ -0,0 +1,168 @@
+"""自带的本地客户端与压测工具
+
+用法:
+    python -m src.server.client --clients 1000 --games 1
+不指定 --port 时在进程内启动服务器。
+"""
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from src.server.protocol import MAX_MESSAGE_SIZE, dumps, loads
+from src.server.server import GameServer
+
+
+def random_policy(rng: random.Random) -> Callable[[dict], int]:
+    """随机选择合法操作的策略"""
+    return lambda message: rng.randrange(len(message["legal"]))
+
+
+class GameClient:
+    """基于换行分隔JSON协议的客户端
+
+    同一连接上可以连续进行多局。
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 policy: Optional[Callable[[dict], int]] = None,
+                 max_message_size: int = MAX_MESSAGE_SIZE):
+        self.host = host
+        self.port = port
+        self.policy = policy or (lambda message: 0)
+        self.max_message_size = max_message_size
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.messages_in = 0
+        self.messages_out = 0
+        self.decisions = 0
+        self.results: List[dict] = []
+
+    async def connect(self) -> None:
+        """建立连接"""
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, limit=self.max_message_size)
+
+    async def close(self) -> None:
+        """关闭连接"""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def send(self, message: dict) -> None:
+        """发送消息"""
+        self.writer.write(dumps(message))
+        self.messages_out += 1
+        await self.writer.drain()
+
+    async def receive(self) -> Optional[dict]:
+        """接收一条消息,连接关闭时返回 None"""
+        line = await self.reader.readline()
+        if not line:
+            return None
+        self.messages_in += 1
+        return loads(line)
+
+    async def play(self, games: int = 1) -> List[dict]:
+        """加入匹配并进行若干局,返回各局结果"""
+        for _ in range(games):
+            await self.send({"op": "join"})
+            while True:
+                message = await self.receive()
+                if message is None:
+                    return self.results
+                op = message["op"]
+                if op == "decide":
+                    self.decisions += 1
+                    await self.send({"op": "act", "id": message["id"], "action": self.policy(message)})
+                elif op == "end":
+                    self.results.append(message["result"])
+                    break
+                elif op == "error":
+                    raise RuntimeError(message["message"])
+        return self.results
+
+
+@dataclass
+class LoadTestReport:
+    """压测结果"""
+    clients: int
+    games: int
+    elapsed: float
+    messages: int
+    decisions: int
+    timeouts: int
+    p50_latency: float
+    p99_latency: float
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (f"clients={self.clients} games={self.games} elapsed={self.elapsed:.2f}s "
+                f"messages={self.messages} ({self.messages_per_second:.0f}/s) "
+                f"decisions={self.decisions} timeouts={self.timeouts} "
+                f"p50={self.p50_latency * 1000:.2f}ms p99={self.p99_latency * 1000:.2f}ms")
+
+
+async def run_load_test(clients: int = 1000, games: int = 1, seed: int = 0,
+                        host: str = '127.0.0.1', port: int = 0) -> LoadTestReport:
+    """启动若干模拟客户端进行压测
+
+    Args:
+        clients: 并发客户端数(应为4的倍数)
+        games: 每个客户端连续进行的局数(复用连接)
+        seed: 客户端策略的随机种子
+        host: 服务器地址
+        port: 服务器端口,为0时在进程内启动服务器
+    Returns:
+        LoadTestReport: 压测结果(延迟仅在进程内服务器时统计)
+    """
+    server = None
+    if not port:
+        server = GameServer(host, 0)
+        await server.start()
+        port = server.port
+    rng = random.Random(seed)
+    bots = [GameClient(host, port, random_policy(random.Random(rng.random()))) for _ in range(clients)]
+    try:
+        await asyncio.gather(*(bot.connect() for bot in bots))
+        start = time.perf_counter()
+        await asyncio.gather(*(bot.play(games) for bot in bots))
+        elapsed = time.perf_counter() - start
+    finally:
+        await asyncio.gather(*(bot.close() for bot in bots))
+        if server is not None:
+            await server.stop()
+    stats = server.table_host.stats if server else None
+    return LoadTestReport(
+        clients=clients,
+        games=games,
+        elapsed=elapsed,
+        messages=sum(bot.messages_in + bot.messages_out for bot in bots),
+        decisions=sum(bot.decisions for bot in bots),
+        timeouts=stats.timeouts if stats else 0,
+        p50_latency=stats.latency_percentile(50) if stats else 0.0,
+        p99_latency=stats.latency_percentile(99) if stats else 0.0,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="对局服务器压测")
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--games', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args(argv)
+    report = asyncio.run(run_load_test(args.clients, args.games, args.seed, args.host, args.port))
+    print(report)
+
+
+if __name__ == '__main__':
+    main()
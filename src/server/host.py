@@ -0,0 +1,201 @@
+import asyncio
+import inspect
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+from src.core.game import Game
+from src.core.game.driver import Action, ActionType, DecisionRequest, GameEvent
+from src.core.game.state import TurnPhase
+from src.core.metrics import Histogram
+
+# decide_nowait 无法立即给出操作时的返回值
+PENDING = object()
+
+
+class PlayerClient(ABC):
+    """玩家客户端接口"""
+
+    def decide_nowait(self, request: DecisionRequest):
+        """同步决策快速路径,无法立即决策时返回 PENDING
+
+        进程内机器人可覆盖此方法,避免每次决策都经过事件循环调度。
+        """
+        return PENDING
+
+    @abstractmethod
+    async def decide(self, request: DecisionRequest) -> Optional[Action]:
+        """根据决策请求返回操作(返回 None 表示采用默认操作)"""
+
+
+class LocalClient(PlayerClient):
+    """进程内客户端,用于测试与压测"""
+
+    def __init__(self, policy: Optional[Callable[[DecisionRequest], Optional[Action]]] = None,
+                 delay: float = 0.0):
+        self.policy = policy
+        self.delay = delay  # 模拟思考时间(秒)
+
+    def decide_nowait(self, request: DecisionRequest):
+        if self.delay:
+            return PENDING
+        return self.policy(request) if self.policy else None
+
+    async def decide(self, request: DecisionRequest) -> Optional[Action]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.policy(request) if self.policy else None
+
+
+@dataclass
+class HostStats:
+    """牌桌宿主统计"""
+    tables_started: int = 0
+    tables_finished: int = 0
+    decisions: int = 0          # 全部决策数
+    sync_decisions: int = 0     # 其中由 decide_nowait 立即给出的决策数(不计入等待耗时)
+    timeouts: int = 0
+    total_latency: float = 0.0  # 等待玩家操作的累计耗时(秒)
+    max_latency: float = 0.0
+    latency_samples: deque = field(default_factory=lambda: deque(maxlen=65536))  # 最近的等待耗时样本
+    latency_histogram: Histogram = field(default_factory=Histogram)  # 全部等待耗时(纳秒)
+
+    @property
+    def active_tables(self) -> int:
+        return self.tables_started - self.tables_finished
+
+    @property
+    def mean_latency(self) -> float:
+        """经过等待的决策的平均耗时(秒)"""
+        waited = self.decisions - self.sync_decisions
+        return self.total_latency / waited if waited else 0.0
+
+    def collect(self) -> Dict[str, object]:
+        """导出用的数值(见 metrics.prometheus)"""
+        return {
+            'tables_started_total': self.tables_started,
+            'tables_finished_total': self.tables_finished,
+            'active_tables': self.active_tables,
+            'decisions_total': self.decisions,
+            'sync_decisions_total': self.sync_decisions,
+            'decision_timeouts_total': self.timeouts,
+            'decision_latency': self.latency_histogram,
+        }
+
+    def latency_percentile(self, q: float) -> float:
+        """最近样本中等待耗时的分位数(q取0-100)"""
+        if not self.latency_samples:
+            return 0.0
+        samples = sorted(self.latency_samples)
+        index = min(len(samples) - 1, int(len(samples) * q / 100))
+        return samples[index]
+
+
+def timeout_action(request: DecisionRequest) -> Action:
+    """超时时的默认操作: 响应阶段放弃,出牌阶段摸切"""
+    actions = request.legal_actions
+    discards = [a for a in actions if a.type == ActionType.DISCARD]
+    if not discards:
+        return next((a for a in actions if a.type == ActionType.PASS), actions[-1])
+    drawn = request.observation.get('drawn')
+    hand = request.observation.get('hand', [])
+    for action in discards:
+        if drawn is not None and hand[action.tile_index] == drawn:
+            return action
+    return discards[-1]
+
+
+class TableHost:
+    """asyncio 多桌宿主
+
+    每张牌桌作为一个任务运行在共享的事件循环中,
+    通过 Game.play() 生成器推进对局,在决策点等待客户端操作。
+    超过思考时间时自动摸切或放弃响应。
+    """
+
+    def __init__(self, think_time: float = 10.0, response_time: float = 3.0,
+                 on_event: Optional[Callable[[Game, GameEvent], None]] = None,
+                 yield_every: int = 8):
+        """
+        Args:
+            think_time: 出牌阶段的思考时间(秒)
+            response_time: 吃碰杠荣响应的思考时间(秒)
+            on_event: 对局事件回调(可为协程函数,返回的协程会被等待)
+            yield_every: 连续同步决策多少次后让出事件循环,保证各桌公平
+        """
+        self.think_time = think_time
+        self.response_time = response_time
+        self.on_event = on_event
+        self.yield_every = yield_every
+        self.stats = HostStats()
+        self.tasks: List[asyncio.Task] = []
+
+    def add_table(self, game: Game, clients: Sequence[PlayerClient]) -> asyncio.Task:
+        """添加牌桌(需在事件循环中调用)"""
+        task = asyncio.get_running_loop().create_task(self.run_table(game, clients))
+        self.tasks.append(task)
+        return task
+
+    async def run_table(self, game: Game, clients: Sequence[PlayerClient]) -> Dict[str, int]:
+        """运行一张牌桌直到对局结束"""
+        self.stats.tables_started += 1
+        gen = game.play()
+        sync_decisions = 0
+        try:
+            item = next(gen)
+            while True:
+                if isinstance(item, DecisionRequest):
+                    client = clients[item.seat]
+                    action = client.decide_nowait(item)
+                    if action is PENDING:
+                        sync_decisions = 0
+                        action = await self._ask(client, item)
+                    else:
+                        self.stats.decisions += 1
+                        self.stats.sync_decisions += 1
+                        sync_decisions += 1
+                        if sync_decisions >= self.yield_every:
+                            sync_decisions = 0
+                            await asyncio.sleep(0)
+                    item = gen.send(action)
+                else:
+                    if self.on_event is not None:
+                        result = self.on_event(game, item)
+                        if inspect.isawaitable(result):
+                            await result
+                    item = gen.send(None)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            gen.close()
+            self.stats.tables_finished += 1
+
+    async def run(self, tables: Sequence[tuple]) -> List[Dict[str, int]]:
+        """并发运行多张牌桌
+
+        Args:
+            tables: (game, clients) 列表
+        Returns:
+            List[Dict[str, int]]: 各桌结果
+        """
+        return await asyncio.gather(*(self.add_table(game, clients) for game, clients in tables))
+
+    async def _ask(self, client: PlayerClient, request: DecisionRequest) -> Action:
+        """等待客户端操作,超时时采用默认操作"""
+        budget = self.think_time if request.phase == TurnPhase.DISCARD else self.response_time
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            action = await asyncio.wait_for(client.decide(request), budget)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            action = timeout_action(request)
+        elapsed = loop.time() - start
+        stats = self.stats
+        stats.decisions += 1
+        stats.total_latency += elapsed
+        stats.latency_samples.append(elapsed)
+        stats.latency_histogram.record(int(elapsed * 1e9))
+        if elapsed > stats.max_latency:
+            stats.max_latency = elapsed
+        return action
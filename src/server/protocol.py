@@ -0,0 +1,113 @@
+"""换行分隔的JSON协议
+
+每条消息为一行UTF-8 JSON对象,以 "op" 字段区分类型。
+
+客户端 -> 服务端:
+    {"op": "join"}                          加入匹配,满4人开桌
+    {"op": "observe", "table": 1}           旁观牌桌
+    {"op": "act", "id": 3, "action": 0}     回应决策请求(action为合法操作列表中的下标)
+服务端 -> 客户端:
+    {"op": "joined", "table": 1, "seat": 0}
+    {"op": "decide", "id": 3, "phase": "discard", "legal": [...], "obs": {...}}
+    {"op": "keyframe", "table": 1, "seq": 0, "state": {...}}   加入或旁观时的完整状态
+    {"op": "delta", "table": 1, "seq": 1, "ops": [...]}        之后的状态增量(按视角隐藏手牌)
+    {"op": "end", "table": 1, "result": {...}}
+    {"op": "error", "message": "..."}
+
+牌以字符串表示: 数字+花色(m/p/s/z),赤五记为 "0m"/"0p"/"0s"。
+"""
+import json
+from collections.abc import Mapping
+from typing import Any, Dict
+from src.core.game.driver import Action, DecisionRequest, GameEvent
+from src.core.player import Player
+from src.core.tile import Tile, TileSuit
+
+MAX_MESSAGE_SIZE = 64 * 1024  # 单条消息的最大字节数
+
+_SUIT_CHARS = {
+    TileSuit.MAN: 'm',
+    TileSuit.PIN: 'p',
+    TileSuit.SOU: 's',
+    TileSuit.HONOR: 'z',
+}
+_CHAR_SUITS = {char: suit for suit, char in _SUIT_CHARS.items()}
+
+
+class ProtocolError(ValueError):
+    """协议错误"""
+
+
+def encode_tile(tile: Tile) -> str:
+    """将牌编码为字符串"""
+    if tile.is_red:
+        return '0' + _SUIT_CHARS[tile.suit]
+    return f"{tile.value}{_SUIT_CHARS[tile.suit]}"
+
+
+def decode_tile(code: str) -> Tile:
+    """从字符串解码牌"""
+    if len(code) != 2 or code[1] not in _CHAR_SUITS or not code[0].isdigit():
+        raise ProtocolError(f"非法的牌: {code!r}")
+    suit = _CHAR_SUITS[code[1]]
+    if code[0] == '0':
+        return Tile(suit, 5, True)
+    return Tile(suit, int(code[0]))
+
+
+def encode_value(value: Any) -> Any:
+    """将事件参数与观测值转换为可JSON序列化的形式"""
+    if isinstance(value, Tile):
+        return encode_tile(value)
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    if isinstance(value, Player):
+        return value.name
+    if isinstance(value, Mapping):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    return str(value)
+
+
+def encode_action(action: Action) -> Dict[str, Any]:
+    """编码玩家操作"""
+    message: Dict[str, Any] = {"type": action.type.name.lower()}
+    if action.tile_index >= 0:
+        message["index"] = action.tile_index
+    if action.tiles:
+        message["tiles"] = [encode_tile(t) for t in action.tiles]
+    return message
+
+
+def encode_request(request: DecisionRequest, request_id: int) -> Dict[str, Any]:
+    """编码决策请求"""
+    return {
+        "op": "decide",
+        "id": request_id,
+        "seat": request.seat,
+        "phase": request.phase.name.lower(),
+        "legal": [encode_action(a) for a in request.legal_actions],
+        "obs": encode_value(request.observation),
+    }
+
+
+def encode_event(event: GameEvent, table_id: int) -> Dict[str, Any]:
+    """编码对局事件"""
+    return {"op": "event", "table": table_id, "name": event.name, "args": encode_value(event.args)}
+
+
+def dumps(message: Dict[str, Any]) -> bytes:
+    """序列化为一行消息"""
+    return json.dumps(message, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def loads(line: bytes) -> Dict[str, Any]:
+    """解析一行消息"""
+    try:
+        message = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ProtocolError(f"无法解析消息: {e}") from None
+    if not isinstance(message, dict) or not isinstance(message.get("op"), str):
+        raise ProtocolError("消息必须是包含op字段的JSON对象")
+    return message
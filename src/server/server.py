@@ -0,0 +1,307 @@
+import asyncio
+import itertools
+import logging
+from typing import Dict, List, Optional, Set
+from src.core.game import Game
+from src.core.game.driver import Action, DecisionRequest, GameEvent
+from src.core.profiling import Profiler
+from src.core.trace import Tracer
+from src.server.broadcast import SPECTATOR, StatePublisher
+from src.server.host import TableHost, PlayerClient
+from src.server.protocol import (MAX_MESSAGE_SIZE, ProtocolError, dumps, loads,
+                                 encode_request)
+
+
+class Connection:
+    """一条客户端连接
+
+    出站消息经过有界队列由独立的写任务发送。发送不等待: 队列满(客户端
+    读取过慢或写任务已停止)时断开该连接并丢弃未发出的消息,牌桌与其他
+    订阅者不会因为某个客户端而停顿。
+    """
+
+    def __init__(self, server: 'GameServer', reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter, queue_size: int):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.closed = False
+        self.client = RemoteClient(self)
+        self.messages_in = 0
+        self.messages_out = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def send(self, message: dict) -> bool:
+        """发送消息,返回是否放入了出站队列(见 send_raw)"""
+        return self.send_raw(dumps(message))
+
+    def send_raw(self, data: bytes) -> bool:
+        """发送已编码的消息(不等待)
+
+        Returns:
+            bool: 是否放入了出站队列; 连接已关闭时为 False,队列满时断开连接并返回 False
+        """
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.server.logger.warning("出站队列已满,断开连接")
+            self.close()
+            return False
+        return True
+
+    def close(self) -> None:
+        """立即断开连接: 丢弃未发出的消息,读取循环随之结束"""
+        if self.closed:
+            return
+        self.closed = True
+        self.client.disconnect()
+        self._discard_queue()
+        self.writer.transport.abort()
+
+    def _discard_queue(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    async def _write_loop(self) -> None:
+        writer = self.writer
+        queue = self.queue
+        try:
+            while True:
+                data = await queue.get()
+                writer.write(data)
+                self.messages_out += 1
+                # 只在队列排空时等待缓冲区,批量写出
+                if queue.empty():
+                    await writer.drain()
+        except ConnectionError:
+            self.close()  # 之后不会再有读取方,不能让队列积压
+        except asyncio.CancelledError:
+            pass
+
+    async def serve(self) -> None:
+        """处理连接直到关闭"""
+        self.task = asyncio.current_task()
+        write_task = asyncio.create_task(self._write_loop())
+        try:
+            while True:
+                try:
+                    line = await self.reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    self._error(f"消息超过{self.server.max_message_size}字节")
+                    break
+                if not line:
+                    break
+                self.messages_in += 1
+                try:
+                    await self.server.dispatch(self, loads(line))
+                except ProtocolError as e:
+                    self._error(str(e))
+        except ConnectionError:
+            pass
+        finally:
+            self.closed = True
+            self.client.disconnect()
+            self.server.remove(self)
+            # 给写任务一点时间发出剩余消息
+            if not write_task.done():
+                try:
+                    await asyncio.wait_for(self._drain_queue(), 1.0)
+                except asyncio.TimeoutError:
+                    pass
+                write_task.cancel()
+            self._discard_queue()
+            self.writer.close()
+
+    async def _drain_queue(self) -> None:
+        while not self.queue.empty():
+            await asyncio.sleep(0)
+
+    def _error(self, message: str) -> None:
+        self.send({"op": "error", "message": message})
+
+
+class RemoteClient(PlayerClient):
+    """远程玩家: 把决策请求发给连接并等待 act 消息"""
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.table_id: Optional[int] = None
+        self.seat = -1
+        self._ids = itertools.count(1)
+        self._request_id = 0
+        self._future: Optional[asyncio.Future] = None
+
+    async def decide(self, request: DecisionRequest) -> Optional[Action]:
+        if self.connection.closed:
+            return None
+        self._request_id = next(self._ids)
+        if not self.connection.send(encode_request(request, self._request_id)):
+            return None
+        self._future = asyncio.get_running_loop().create_future()
+        try:
+            index = await self._future
+        finally:
+            self._future = None
+        actions = request.legal_actions
+        return actions[index] if isinstance(index, int) and 0 <= index < len(actions) else None
+
+    def resolve(self, request_id, index) -> bool:
+        """收到客户端操作"""
+        future = self._future
+        if future is None or future.done() or request_id != self._request_id:
+            return False
+        future.set_result(index)
+        return True
+
+    def disconnect(self) -> None:
+        """连接断开: 后续决策全部采用默认操作"""
+        if self._future is not None and not self._future.done():
+            self._future.set_result(None)
+
+
+class GameServer:
+    """基于 asyncio 流的对局服务器
+
+    客户端按换行分隔的JSON协议加入匹配,满4人即开一桌,
+    对局由共享的 TableHost 在同一事件循环中运行。
+    同一连接可在对局结束后再次 join,连续进行多局。
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 max_message_size: int = MAX_MESSAGE_SIZE, queue_size: int = 256,
+                 think_time: float = 10.0, response_time: float = 3.0,
+                 tracer: Optional[Tracer] = None, profiler: Optional[Profiler] = None):
+        self.host = host
+        self.port = port
+        self.max_message_size = max_message_size
+        self.queue_size = queue_size
+        self.table_host = TableHost(think_time, response_time, on_event=self._on_event)
+        self.tracer = tracer  # 引擎追踪(按牌桌编号采样),为 None 时不追踪
+        self.profiler = profiler  # 剖析(按牌桌编号选择),为 None 时只受环境变量控制
+        self.logger = logging.getLogger(__name__)
+        self.connections: Set[Connection] = set()
+        self.lobby: List[RemoteClient] = []
+        self.tables: Dict[int, Game] = {}
+        self.publishers: Dict[int, StatePublisher] = {}
+        self._table_ids = itertools.count(1)
+        self._table_of_game: Dict[int, int] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """开始监听"""
+        self._server = await asyncio.start_server(
+            self._on_connection, self.host, self.port, limit=self.max_message_size)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """停止监听并关闭所有连接"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self.table_host.tasks:
+            task.cancel()
+        tasks = [connection.task for connection in self.connections if connection.task]
+        for connection in list(self.connections):
+            connection.writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.profiler is not None:
+            self.profiler.close()  # 写出未凑满局数的剖析数据
+
+    def collect(self) -> Dict[str, object]:
+        """导出用的数值: 牌桌统计、连接数与出站队列深度(可在其他线程中调用)"""
+        values = self.table_host.stats.collect()
+        depths = [connection.queue.qsize() for connection in tuple(self.connections)]
+        values.update({
+            'connections': len(depths),
+            'lobby_players': len(self.lobby),
+            'outbound_queue_depth': sum(depths),
+            'outbound_queue_depth_max': max(depths, default=0),
+        })
+        return values
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = Connection(self, reader, writer, self.queue_size)
+        self.connections.add(connection)
+        await connection.serve()
+
+    def remove(self, connection: Connection) -> None:
+        """移除断开的连接"""
+        self.connections.discard(connection)
+        if connection.client in self.lobby:
+            self.lobby.remove(connection.client)
+        for publisher in self.publishers.values():
+            publisher.unsubscribe(connection)
+
+    async def dispatch(self, connection: Connection, message: dict) -> None:
+        """分发客户端消息"""
+        op = message["op"]
+        if op == "act":
+            connection.client.resolve(message.get("id"), message.get("action"))
+        elif op == "join":
+            self._join(connection.client)
+        elif op == "observe":
+            table_id = message.get("table")
+            if table_id not in self.tables:
+                raise ProtocolError(f"牌桌不存在: {table_id}")
+            self._subscribe(self.publishers[table_id], SPECTATOR, connection)
+        else:
+            raise ProtocolError(f"未知操作: {op}")
+
+    def _join(self, client: RemoteClient) -> None:
+        if client.table_id is not None or client in self.lobby:
+            raise ProtocolError("已在匹配或对局中")
+        self.lobby.append(client)
+        if len(self.lobby) >= 4:
+            clients, self.lobby = self.lobby[:4], self.lobby[4:]
+            asyncio.get_running_loop().create_task(self._run_table(clients))
+
+    async def _run_table(self, clients: List[RemoteClient]) -> None:
+        table_id = next(self._table_ids)
+        game = Game()
+        if self.tracer is not None:
+            self.tracer.attach(game, table_id)
+        if self.profiler is not None:
+            self.profiler.attach(game, table_id)
+        publisher = StatePublisher(game, table_id)
+        self.tables[table_id] = game
+        self.publishers[table_id] = publisher
+        self._table_of_game[id(game)] = table_id
+        for seat, client in enumerate(clients):
+            client.table_id = table_id
+            client.seat = seat
+            client.connection.send({"op": "joined", "table": table_id, "seat": seat})
+            self._subscribe(publisher, seat, client.connection)
+        result = None
+        try:
+            result = await self.table_host.add_table(game, clients)
+        except Exception:
+            self.logger.exception("牌桌%s运行出错", table_id)
+        finally:
+            data = dumps({"op": "end", "table": table_id, "result": result})
+            for client in clients:
+                client.table_id = None
+            for subscribers in publisher.subscribers.values():
+                for connection in list(subscribers):
+                    connection.send_raw(data)
+            del self.tables[table_id]
+            del self.publishers[table_id]
+            del self._table_of_game[id(game)]
+            if self.profiler is not None:
+                self.profiler.release(table_id)  # 牌桌编号不再复用
+
+    def _subscribe(self, publisher: StatePublisher, viewpoint: int, connection: Connection) -> None:
+        """发送关键帧后订阅增量(发送不等待,两者之间不会有新增量发布)"""
+        if connection.send_raw(publisher.keyframe(viewpoint)):
+            publisher.subscribe(viewpoint, connection)
+
+    def _on_event(self, game: Game, event: GameEvent) -> None:
+        """把对局事件的增量推送给本桌玩家和旁观者(队列满的连接被断开)"""
+        table_id = self._table_of_game.get(id(game))
+        if table_id is None:
+            return
+        for data, connections in self.publishers[table_id].publish(event):
+            for connection in connections:
+                connection.send_raw(data)
@@ -354,11 +354,13 @@ class GameWindow:
         
         pygame.display.flip()
         
-        # 等待用户响应
+        # 等待用户响应(阻塞等待事件,不空转CPU)
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if yes_rect.collidepoint(event.pos):
-                        return True
-                    elif no_rect.collidepoint(event.pos):
-                        return False
\ No newline at end of file
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if yes_rect.collidepoint(event.pos):
+                    return True
+                elif no_rect.collidepoint(event.pos):
+                    return False
\ No newline at end of file
@@ -1,5 +1,7 @@
 import pytest
 import logging
+import random
+from src.core.game.driver import DecisionRequest, play_round, random_policy
 
 # 配置测试日志
 @pytest.fixture(autouse=True)
@@ -8,3 +10,60 @@ def setup_logging():
         level=logging.DEBUG,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+
+def play_random(game, seed=None, rng=None, on_decision=None, on_event=None):
+    """随机策略进行一局,返回各玩家点数
+
+    Args:
+        seed: 不为 None 时用它设置全局随机数(洗牌),并作为决策的随机种子
+        rng: 决策使用的随机数生成器(优先于 seed)
+        on_decision: 每个决策请求在选择操作之前调用
+        on_event: 每个对局事件调用
+    """
+    if seed is not None:
+        random.seed(seed)
+    choice = random_policy(rng or random.Random(seed))
+
+    def policy(request):
+        if on_decision is not None:
+            on_decision(request)
+        return choice(request)
+    return play_round(game, policy, on_event=on_event)
+
+def play_until(game, decisions, seed):
+    """随机策略进行到第 decisions 个决策请求,返回(生成器, 该请求)"""
+    random.seed(seed)
+    rng = random.Random(seed)
+    gen = game.play()
+    item = next(gen)
+    count = 0
+    while True:
+        if isinstance(item, DecisionRequest):
+            if count == decisions:
+                return gen, item
+            count += 1
+            item = gen.send(rng.choice(item.legal_actions))
+        else:
+            item = gen.send(None)
+
+def finish(gen, item, seed):
+    """按序号随机选择操作进行到本局结束,返回事件与点数"""
+    rng = random.Random(seed)
+    events = []
+    try:
+        while True:
+            if isinstance(item, DecisionRequest):
+                item = gen.send(item.legal_actions[rng.randrange(len(item.legal_actions))])
+            else:
+                events.append((item.name, item.args))
+                item = gen.send(None)
+    except StopIteration as stop:
+        return events, stop.value
+
+def resume(game):
+    """从当前状态继续驱动,返回(生成器, 第一个决策请求)"""
+    gen = game.play()
+    item = next(gen)
+    while not isinstance(item, DecisionRequest):
+        item = gen.send(None)
+    return gen, item
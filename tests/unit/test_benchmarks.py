@@ -0,0 +1,89 @@
+import json
+import runpy
+import sys
+import pytest
+from benchmarks import BENCHMARKS, build_corpus, compare, load, run, save
+from benchmarks.runner import format_comparison, format_results, select
+from src.core.hand import Hand
+
+def _hand(tiles):
+    hand = Hand()
+    for tile in tiles:
+        hand.add_tile(tile)
+    return hand
+
+def test_corpus_reproducible():
+    """测试同一种子生成相同的语料"""
+    first, second = build_corpus(seed=7, size=20), build_corpus(seed=7, size=20)
+    assert [list(map(str, hand)) for hand in first.random] == [list(map(str, hand)) for hand in second.random]
+    assert [list(map(str, hand.tiles)) for hand in first.winning] == \
+           [list(map(str, hand.tiles)) for hand in second.winning]
+    other = build_corpus(seed=8, size=20)
+    assert [list(map(str, hand.tiles)) for hand in first.winning] != \
+           [list(map(str, hand.tiles)) for hand in other.winning]
+
+def test_corpus_hands_valid():
+    """测试和牌型确实和牌,去掉和牌张后听牌,且每种牌不超过4张"""
+    corpus = build_corpus(seed=1, size=50)
+    assert all(len(hand) == 14 for hand in corpus.random)
+    for winning in corpus.winning:
+        assert len(winning.tiles) == 14
+        assert _hand(winning.tenpai).check_win(winning.win_tile)
+        waits = {(tile.suit, tile.value) for tile in _hand(winning.tenpai).check_tenpai()}
+        assert (winning.win_tile.suit, winning.win_tile.value) in waits
+        used = set(map(id, winning.tiles))
+        assert len(used) == 14 and id(winning.dora_tiles[0]) not in used
+
+def test_select():
+    """测试按名称、前缀与类型选择项目"""
+    assert select(['hand.']) == ['hand.shanten', 'hand.check_win', 'hand.check_tenpai']
+    assert select(['yaku.judge', 'wall.draw']) == ['yaku.judge', 'wall.draw']
+    assert select(kind='macro') == ['game.round', 'game.hanchan', 'import.spawn']
+    assert set(select()) == set(BENCHMARKS)
+    with pytest.raises(KeyError):
+        run(['nothing'])
+
+def test_run_and_save(tmp_path):
+    """测试运行结果包含机器信息与每次操作耗时,可保存后读取"""
+    result = run(['hand.shanten', 'wall.draw', 'game.round'], corpus_size=10, repeat=2, min_time=0)
+    assert set(result['benchmarks']) == {'hand.shanten', 'wall.draw', 'game.round'}
+    assert result['metadata']['python'] and result['config']['corpus_size'] == 10
+    shanten = result['benchmarks']['hand.shanten']
+    assert shanten['ops'] == 10 and shanten['kind'] == 'micro'
+    assert 0 < shanten['min_ns'] <= shanten['median_ns']
+    assert result['benchmarks']['wall.draw']['ops'] > 100
+    path = str(tmp_path / 'result.json')
+    save(result, path)
+    assert load(path) == json.loads(json.dumps(result))
+    assert 'hand.shanten' in format_results(result)
+
+def _result(**timings):
+    return {'version': 1, 'metadata': {}, 'config': {},
+            'benchmarks': {name: {'kind': 'micro', 'min_ns': value, 'median_ns': value, 'mean_ns': value}
+                           for name, value in timings.items()}}
+
+def test_compare():
+    """测试与基线比较时标记退化、改进、缺失与新增"""
+    baseline = _result(a=100.0, b=100.0, c=100.0, d=100.0)
+    current = _result(a=105.0, b=120.0, c=80.0, e=50.0)
+    status = {item.name: item.status for item in compare(baseline, current)}
+    assert status == {'a': 'same', 'b': 'regression', 'c': 'improvement', 'd': 'missing', 'e': 'new'}
+    assert compare(baseline, current, threshold=0.25)[1].status == 'same'
+    assert compare(baseline, current)[1].ratio == pytest.approx(1.2)
+    text = format_comparison(compare(baseline, current))
+    assert '+20.0%' in text and '退化' in text
+
+def test_cli_compare_exit_code(tmp_path):
+    """测试 compare 命令在出现退化时返回1"""
+    baseline, current = str(tmp_path / 'base.json'), str(tmp_path / 'new.json')
+    save(_result(a=100.0), baseline)
+    save(_result(a=150.0), current)
+    argv = sys.argv
+    try:
+        for args, code in (([baseline, current], 1), ([current, baseline], 0)):
+            sys.argv = ['benchmarks', 'compare'] + args
+            with pytest.raises(SystemExit) as exit:
+                runpy.run_module('benchmarks', run_name='__main__')
+            assert exit.value.code == code
+    finally:
+        sys.argv = argv
@@ -0,0 +1,80 @@
+import json
+import random
+from src.core.game import Game
+from src.core.game.driver import GameEvent
+from src.server.broadcast import SPECTATOR, StatePublisher
+from src.server.protocol import encode_tile
+from tests.conftest import play_random
+
+def _replay(keyframe, deltas):
+    """在关键帧上应用增量,返回各座位的牌河"""
+    discards = [list(seat["discards"]) for seat in json.loads(keyframe)["state"]["seats"]]
+    for delta in deltas:
+        for op in json.loads(delta)["ops"]:
+            if op["t"] == "discard":
+                discards[op["s"]].append(op["tile"])
+    return discards
+
+def test_draw_is_redacted_per_seat():
+    """测试摸牌只对本人可见,且每个视角只编码一次"""
+    game = Game()
+    publisher = StatePublisher(game)
+    publisher.subscribe(0, 'seat0')
+    publisher.subscribe(1, 'seat1')
+    publisher.subscribe(SPECTATOR, 'spec_a')
+    publisher.subscribe(SPECTATOR, 'spec_b')
+    game.initialize()
+
+    batches = publisher.publish(GameEvent("draw", (0, game.table.wall.tiles[0])))
+    by_subscriber = {s: data for data, subscribers in batches for s in subscribers}
+    assert len(batches) == 3
+    own = json.loads(by_subscriber['seat0'])["ops"][0]
+    other = json.loads(by_subscriber['seat1'])["ops"][0]
+    assert "tile" in own and "tile" not in other
+    # 不含私密信息的视角共享同一份编码
+    assert by_subscriber['seat1'] is by_subscriber['spec_a'] is by_subscriber['spec_b']
+
+def test_public_delta_encoded_once():
+    """测试公开事件对所有订阅者只编码一次"""
+    game = Game()
+    game.initialize()
+    publisher = StatePublisher(game)
+    for seat in range(4):
+        publisher.subscribe(seat, f'seat{seat}')
+    tile = game.players[0].hand.tiles[0]
+    batches = publisher.publish(GameEvent("discard", (0, tile, False)))
+    assert len(batches) == 1
+    assert len(batches[0][1]) == 4
+    assert publisher.publish(GameEvent("unknown")) == []
+
+def test_late_joiner_keyframe():
+    """测试后加入的旁观者从关键帧加增量能重建牌河"""
+    game = Game()
+    publisher = StatePublisher(game)
+    received = []
+    joined = []
+    count = 0
+
+    def on_event(event):
+        nonlocal count
+        count += 1
+        if count == 30:
+            joined.append(publisher.keyframe(SPECTATOR))
+            publisher.subscribe(SPECTATOR, 'late')
+        for data, subscribers in publisher.publish(event):
+            received.extend(data for _ in subscribers)
+
+    random.seed(12)
+    play_random(game, rng=random.Random(13), on_event=on_event)
+
+    keyframe = publisher.keyframe(SPECTATOR)
+    assert publisher.keyframe(SPECTATOR) is keyframe  # 序号未变时复用缓存
+    state = json.loads(keyframe)["state"]
+    assert all(isinstance(seat["hand"], int) for seat in state["seats"])
+    # 全部事件发布后,镜像状态与引擎一致
+    for seat, player in enumerate(game.players):
+        own = publisher.snapshot(seat)["seats"][seat]
+        assert sorted(own["hand"]) == sorted(encode_tile(t) for t in player.hand.tiles)
+        assert len(own["melds"]) == len(player.hand.melds)
+    assert received
+    assert _replay(joined[0], received) == [seat["discards"] for seat in state["seats"]]
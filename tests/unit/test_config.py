@@ -0,0 +1,66 @@
+import builtins
+import json
+import pathlib
+import pytest
+from src.core.common.config import (CONFIG_DIRS, FrozenDict, get_config, load_config,
+                                    reload_config)
+from src.core.game import Game
+from src.core.game.score import ScoreCalculator
+from src.core.rules import Rules
+
+@pytest.fixture
+def restore_config():
+    yield
+    reload_config(CONFIG_DIRS)
+
+def test_config_is_shared_and_frozen():
+    """测试配置在各组件间共享且只读"""
+    game = Game()
+    config = get_config()
+    assert game.config is config.game
+    assert game.flow.config is config.game
+    assert Rules().config is config.rule
+    assert isinstance(config.game, FrozenDict)
+    assert config.uma_values == (15000, 5000, -5000, -15000)
+    with pytest.raises(TypeError):
+        config.game["player_count"] = 3
+    with pytest.raises(TypeError):
+        config.rules.update(has_aka_dora=False)
+    with pytest.raises(AttributeError):
+        config.game = {}
+
+def test_game_construction_does_no_io(monkeypatch):
+    """测试配置加载后创建游戏不访问文件系统"""
+    get_config()
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("unexpected file access")
+
+    monkeypatch.setattr(builtins, 'open', forbidden)
+    monkeypatch.setattr(pathlib.Path, 'read_text', forbidden)
+    game = Game()
+    assert game.get_player_count() == 4
+    assert game.table.wall.dead_wall_size == 14
+
+def test_reload_with_invalid_values(tmp_path, caplog, restore_config):
+    """测试非法配置项回退为默认值并记录警告"""
+    (tmp_path / 'game.json').write_text(json.dumps({
+        "initial_points": 30000,
+        "riichi_cost": "1000",
+        "uma_values": [10000, 0, 0, 0],
+    }), encoding='utf-8')
+    config = reload_config([tmp_path])
+
+    assert config.initial_points == 30000
+    assert config.riichi_cost == 1000
+    assert config.uma_values == (15000, 5000, -5000, -15000)
+    assert config.tile_count == 136  # rule.json 缺失时使用默认值
+    assert any("riichi_cost" in r.getMessage() for r in caplog.records)
+    assert Game().get_initial_points() == 30000
+    assert ScoreCalculator().riichi_cost == 1000
+
+def test_load_config_does_not_replace_shared(tmp_path):
+    """测试 load_config 不影响共享配置"""
+    shared = get_config()
+    load_config([tmp_path])
+    assert get_config() is shared
@@ -0,0 +1,73 @@
+import json
+import random
+import numpy as np
+import pytest
+from src.core.game import Game
+from src.core.game.driver import Action, ActionType
+from src.core.features import (ACTIONS, CHANNELS, TILE_KINDS, ShardDataset, ShardWriter,
+                               action_index, export_game)
+from src.core.features import actions
+from src.core.tile import Tile, TileSuit
+
+def test_action_index():
+    """测试操作编号: 赤五单独编号,吃按被吃牌的位置区分"""
+    hand = [Tile(TileSuit.MAN, 1), Tile(TileSuit.PIN, 5, True), Tile(TileSuit.HONOR, 7)]
+    assert action_index(Action(ActionType.DISCARD, 0), hand) == 0
+    assert action_index(Action(ActionType.DISCARD, 1), hand) == actions.RED_DISCARD + 1
+    assert action_index(Action(ActionType.DISCARD, 2), hand) == 33
+    chi = lambda a, b, c: Action(ActionType.CHI, tiles=tuple(Tile(TileSuit.SOU, v) for v in (a, b, c)))
+    assert action_index(chi(2, 3, 1), hand) == actions.CHI
+    assert action_index(chi(1, 3, 2), hand) == actions.CHI + 1
+    assert action_index(chi(1, 2, 3), hand) == actions.CHI + 2
+    assert action_index(Action(ActionType.PASS), hand) == actions.PASS == ACTIONS - 1
+
+def test_export_and_read_back(tmp_path):
+    """测试自对弈样本写入多个分片,读取时与写入的内容一致"""
+    random.seed(0)
+    rng = random.Random(0)
+    rows = []
+
+    def policy(request):
+        action = rng.choice(request.legal_actions)
+        rows.append(action_index(action, request.player.hand.tiles))
+        assert action_index(action, request.player.hand.tiles) in {
+            action_index(a, request.player.hand.tiles) for a in request.legal_actions}
+        return action
+
+    with ShardWriter(str(tmp_path), shard_size=64) as writer:
+        export_game(Game(), writer, policy)
+    assert writer.rows == len(rows) > 64
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["rows"] == len(rows)
+    assert len(manifest["shards"]) == (len(rows) + 63) // 64
+    assert all(shard["rows"] == 64 for shard in manifest["shards"][:-1])
+
+    dataset = ShardDataset(str(tmp_path))
+    assert len(dataset) == len(rows)
+    obs, mask, action = dataset.shard(0)
+    assert isinstance(obs, np.memmap)
+    assert obs.shape == (64, CHANNELS, TILE_KINDS)
+    assert mask.shape == (64, ACTIONS)
+    assert [dataset[i][2] for i in range(len(dataset))] == rows
+    assert all(dataset[i][1][rows[i]] for i in range(len(dataset)))
+    assert dataset[-1][0].any()
+    with pytest.raises(IndexError):
+        dataset[len(rows)]
+
+def test_manifest_updated_per_shard(tmp_path):
+    """测试写满一个分片后清单即可读取,关闭后不能继续写入"""
+    writer = ShardWriter(str(tmp_path), shard_size=2)
+    obs = np.ones((CHANNELS, TILE_KINDS), np.float32)
+    mask = np.zeros(ACTIONS, bool)
+    for action in range(3):
+        writer.append(obs * action, mask, action)
+    dataset = ShardDataset(str(tmp_path))
+    assert len(dataset) == 2
+    assert dataset[1][0][0, 0] == 1
+    writer.close()
+    dataset = ShardDataset(str(tmp_path))
+    assert len(dataset) == 3
+    assert dataset[2][2] == 2
+    with pytest.raises(ValueError):
+        writer.append(obs, mask, 0)
@@ -0,0 +1,100 @@
+import random
+from src.core.events import EventLog, EventRing, Overflow, RECORD, RECORD_SIZE
+from src.core.tile.codec import pack_tiles, tile_code, tile_from_code, unpack_tiles
+from src.core.game import Game
+from src.core.tile import Tile, TileSuit
+from tests.conftest import play_random
+
+def test_tile_codec():
+    """测试牌代码与牌列表打包的往返转换"""
+    tiles = [Tile(TileSuit.MAN, 1), Tile(TileSuit.PIN, 5, True), Tile(TileSuit.SOU, 9),
+             Tile(TileSuit.HONOR, 7)]
+    for tile in tiles:
+        decoded = tile_from_code(tile_code(tile))
+        assert decoded == tile and decoded.is_red == tile.is_red
+    assert tile_from_code(tile_code(None)) is None
+    assert unpack_tiles(pack_tiles(tiles)) == tiles
+    assert unpack_tiles(pack_tiles(tiles[:2])) == tiles[:2]
+
+def test_cursor_reads_zero_copy_chunks():
+    """测试游标以缓冲区视图读取,并在末尾回绕处截断"""
+    ring = EventRing(capacity=4)
+    ring.append(1)
+    cursor = ring.cursor(from_start=True)
+    for i in range(2, 5):
+        ring.append(i)
+    chunk = cursor.read(limit=2)
+    assert chunk.obj is ring.buffer
+    assert len(chunk) == 2 * RECORD_SIZE
+    assert [r[1] for r in RECORD.iter_unpack(chunk)] == [1, 2]
+
+    ring.append(5)  # 覆盖序号0(已读)
+    assert [r[1] for r in RECORD.iter_unpack(cursor.read())] == [3, 4]  # 截断于末尾
+    assert [r[1] for r in cursor] == [5]
+    assert cursor.lag == 0 and cursor.dropped == 0
+
+def test_overflow_policies():
+    """测试写满后覆盖与丢弃两种策略"""
+    ring = EventRing(capacity=4)
+    slow = ring.cursor()
+    for i in range(10):
+        ring.append(i)
+    assert [r[0] for r in slow] == [6, 7, 8, 9]
+    assert slow.dropped == 6
+
+    ring = EventRing(capacity=4, overflow=Overflow.DROP)
+    slow = ring.cursor()
+    results = [ring.append(i) for i in range(6)]
+    assert results == [True] * 4 + [False] * 2
+    assert ring.dropped == 2
+    assert [r[1] for r in slow] == [0, 1, 2, 3]
+    assert ring.append(6)
+    ring.close_cursor(slow)
+    assert all(ring.append(i) for i in range(10))
+
+def test_drop_waits_for_slowest_cursor():
+    """测试 DROP 策略按最慢的游标判断是否已满,读取后腾出空间"""
+    ring = EventRing(capacity=4, overflow=Overflow.DROP)
+    fast, slow = ring.cursor(), ring.cursor()
+    assert all(ring.append(i) for i in range(4))
+    assert len(list(fast)) == 4
+    assert not ring.append(4)
+    assert len(slow.read(limit=3)) == 3 * RECORD_SIZE
+    assert [ring.append(i) for i in range(5, 9)] == [True] * 3 + [False]
+    assert ring.dropped == 2
+
+def test_out_of_range_fields_are_clamped():
+    """测试超出字段范围的整数截断到边界,多余的布尔值被忽略,均计入 clamped"""
+    log = EventLog(EventRing(capacity=8))
+    cursor = log.ring.cursor()
+    log.record("big", (100000, -(1 << 40)))
+    log.record("flags", (True,) * 9 + (5, 70000))
+    log.record("fits", (3, -32768, (1 << 31) - 1))
+    records = list(cursor)
+    assert [r[5:7] for r in records] == [(32767, -(1 << 31)), (32767, 0), (-32768, (1 << 31) - 1)]
+    assert records[1][2] == 5 and records[1][4] == 0xFF
+    assert records[2][2] == 3
+    assert log.clamped == 2
+
+def test_event_log_on_game_bus():
+    """测试挂接到对局后多个读者各自读取全部事件"""
+    random.seed(11)
+    game = Game()
+    log = EventLog(EventRing(capacity=8192)).attach(game)
+    first = log.ring.cursor()
+    second = log.ring.cursor()
+    events = []
+    play_random(game, rng=random.Random(12), on_event=events.append)
+
+    records = list(first)
+    assert len(records) == log.ring.written
+    assert list(second) == records
+    names = [log.name_of(r[1]) for r in records]
+    assert names.count("draw") == sum(e.name == "draw" for e in events)
+    assert names[-1] == "round_end"
+
+    discards = [e for e in events if e.name == "discard"]
+    decoded = [(r[2], tile_from_code(r[3]), bool(r[4]))
+               for r in records if log.name_of(r[1]) == "discard"]
+    assert decoded == [(seat, tile, tsumogiri) for seat, tile, tsumogiri in
+                       (e.args for e in discards)]
@@ -0,0 +1,76 @@
+import pytest
+from src.core.events import Event, EventEmitter
+from src.core.game import Game
+
+def test_emit_and_last_event():
+    """测试事件分发与最后事件记录"""
+    emitter = EventEmitter()
+    received = []
+    emitter.on("discard", lambda *args: received.append(args))
+    assert emitter.last_event is None
+
+    emitter.emit("discard", 1, 2)
+    emitter.emit("no_listener", 3)
+    assert received == [(1, 2)]
+    assert emitter.last_event == ("no_listener", (3,))
+    name, args = emitter.last_event
+    assert name == "no_listener" and args == (3,)
+
+def test_wildcard_and_once():
+    """测试通配监听器与一次性监听器"""
+    emitter = EventEmitter()
+    records = []
+    calls = []
+    emitter.on('*', records.append)
+    emitter.once("draw", lambda tile: calls.append(tile))
+
+    emitter.emit("draw", "1m")
+    emitter.emit("draw", "2m")
+    assert calls == ["1m"]
+    assert [r.name for r in records] == ["draw", "draw"]
+    assert all(isinstance(r, Event) for r in records)
+    assert emitter.has_listeners("anything")
+
+    emitter.off('*', records.append)
+    assert not emitter.has_listeners("draw")
+
+def test_remove_during_emit():
+    """测试在回调中移除监听器不影响本次分发"""
+    emitter = EventEmitter()
+    calls = []
+
+    def first():
+        calls.append("first")
+        if calls.count("first") == 1:
+            emitter.off("tick", second)
+
+    def second():
+        calls.append("second")
+
+    emitter.on("tick", first)
+    emitter.on("tick", second)
+    emitter.emit("tick")
+    emitter.emit("tick")
+    assert calls == ["first", "second", "first"]
+    with pytest.raises(ValueError):
+        emitter.off("tick", second)
+
+def test_listener_metrics():
+    """测试监听器统计"""
+    emitter = EventEmitter()
+    handler = lambda: None
+    emitter.on("tick", handler)
+    emitter.emit("tick")
+    assert emitter.metrics == {}
+
+    emitter.enable_metrics()
+    for _ in range(3):
+        emitter.emit("tick")
+    stats = emitter.metrics[("tick", handler)]
+    assert stats.calls == 3
+    assert stats.max_time <= stats.total_time
+
+def test_game_shares_one_bus():
+    """测试游戏与控制器共用同一事件总线"""
+    game = Game()
+    assert game.events is game.controller.events
@@ -0,0 +1,116 @@
+import random
+import numpy as np
+import pytest
+from src.core.game import Game
+from src.core.game.driver import DecisionRequest
+from src.core.features import CHANNELS, TILE_KINDS, BatchEncoder, FeatureEncoder, encode_into
+from src.core.features import encoder as layout
+from tests.conftest import play_random
+
+def _rebuilt(game, seat):
+    """从对局状态从头编码"""
+    return encode_into(np.zeros((1, CHANNELS, TILE_KINDS), np.float32), [(game, seat)])[0]
+
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_matches_rebuild(seed):
+    """测试随事件增量更新的平面在每个决策点都与从头编码一致"""
+    random.seed(seed)
+    rng = random.Random(seed)
+    game = Game()
+    game.initialize()
+    encoders = [FeatureEncoder(game, seat) for seat in range(4)]
+    checked = []
+
+    def check(request):
+        for seat, encoder in enumerate(encoders):
+            np.testing.assert_array_equal(encoder.planes, _rebuilt(game, seat))
+        checked.append(request)
+
+    play_random(game, rng=rng, on_decision=check)
+    for seat, encoder in enumerate(encoders):
+        np.testing.assert_array_equal(encoder.planes, _rebuilt(game, seat))
+    assert len(checked) > 10
+
+def test_planes_content():
+    """测试手牌、牌河与标量平面的内容"""
+    random.seed(1)
+    game = Game()
+    gen = game.play()
+    item = next(gen)
+    discards = 0
+    while discards < 6:
+        if isinstance(item, DecisionRequest):
+            discards += item.legal_actions[0].type.name == 'DISCARD'
+            item = gen.send(item.legal_actions[0])
+        else:
+            item = gen.send(None)
+    planes = FeatureEncoder(game, 0).planes
+    me = game.players[0]
+    assert planes[layout.HAND:layout.AKA].sum() == len(me.hand.tiles)
+    assert planes[layout.DISCARD:layout.TSUMOGIRI].sum() == sum(len(p.river.tiles) for p in game.players)
+    own = planes[layout.DISCARD:layout.DISCARD + layout.LEVELS].sum(axis=0)
+    for tile in me.river.tiles:
+        assert own[layout.tile_code(tile) & 0x3F] > 0
+    assert planes[layout.SCORE, 0] == pytest.approx(me.points / layout.SCORE_SCALE)
+    assert planes[layout.DEALER + (game.table.dealer_index - 0) % 4].all()
+    assert planes[layout.ROUND_WIND].sum() == 1
+
+def test_riichi_tile_marked():
+    """测试立直宣言牌记入牌河并标记在对应座位的平面上"""
+    random.seed(2)
+    game = Game()
+    game.initialize()
+    encoder = FeatureEncoder(game, 1)
+    gen = game.play()
+    item = next(gen)
+    while not isinstance(item, DecisionRequest) or item.legal_actions[0].type.name != 'DISCARD':
+        item = gen.send(item.legal_actions[0] if isinstance(item, DecisionRequest) else None)
+    player = game.players[item.seat]
+    player.is_riichi = True
+    game.events.emit("riichi", item.seat)
+    action = item.legal_actions[0]
+    gen.send(action)
+    assert player.river.riichi_tile_index == 0
+    relative = (item.seat - 1) % 4
+    tile = player.river.tiles[0]
+    assert encoder.planes[layout.RIICHI_TILE + relative, layout.tile_code(tile) & 0x3F] == 1
+    np.testing.assert_array_equal(encoder.planes, _rebuilt(game, 1))
+
+def test_other_hands_not_visible():
+    """测试编码不依赖其他玩家的手牌"""
+    random.seed(3)
+    game = Game()
+    game.initialize()
+    game.start()
+    before = _rebuilt(game, 0)
+    game.players[2].hand.tiles.reverse()
+    game.players[2].hand.tiles.pop()
+    np.testing.assert_array_equal(_rebuilt(game, 0), before)
+    assert not np.array_equal(_rebuilt(game, 2), _rebuilt(game, 0))
+
+def test_batch_encoder():
+    """测试批量编码写入同一数组,增量更新与整体重建一致"""
+    games = []
+    for seed in range(3):
+        random.seed(seed)
+        game = Game()
+        game.initialize()
+        games.append(game)
+    batch = BatchEncoder([(game, index % 4) for index, game in enumerate(games)])
+    assert batch.array.shape == (3, CHANNELS, TILE_KINDS)
+    for index, game in enumerate(games):
+        gen = game.play()
+        item = next(gen)
+        for _ in range(40):
+            item = gen.send(item.legal_actions[-1] if isinstance(item, DecisionRequest) else None)
+        assert batch.encoders[index].planes.base is batch.array
+    incremental = batch.array.copy()
+    np.testing.assert_array_equal(batch.encode(), incremental)
+    for index, game in enumerate(games):
+        np.testing.assert_array_equal(batch.array[index], _rebuilt(game, index % 4))
+    batch.detach()
+
+def test_rejects_wrong_buffer():
+    """测试缓冲区形状错误时报错"""
+    with pytest.raises(ValueError):
+        FeatureEncoder(Game(), 0, out=np.zeros((3, TILE_KINDS)))
@@ -0,0 +1,51 @@
+import pytest
+from src.core.game import Game
+from src.core.player.state import PlayerState
+from tests.conftest import finish, play_until, resume
+
+def test_fork_shares_immutable_parts():
+    """测试复制出的对局共享规则与判定器,可变状态各自独立"""
+    game = Game()
+    play_until(game, 12, seed=4)
+    clone = game.fork()
+    assert clone.snapshot() == game.snapshot()
+    assert clone.profile is game.profile
+    assert clone.flow.yaku_judger is game.flow.yaku_judger
+    assert clone.table.wall.order is game.table.wall.order
+    assert clone.table.wall.tiles is not game.table.wall.tiles
+    for player, copy in zip(game.players, clone.players):
+        assert copy is not player
+        assert copy.hand.player is copy
+        assert copy.hand.shanten is player.hand.shanten
+        assert copy.hand.tiles is not player.hand.tiles
+        assert copy.river.tiles is not player.river.tiles
+    assert clone.events is not game.events
+    assert clone.flow.machine is clone.controller.machine
+
+@pytest.mark.parametrize("decisions", [0, 9, 30])
+def test_fork_does_not_affect_parent(decisions):
+    """测试在复制出的对局上进行到终局后,原对局状态不变且可继续"""
+    game = Game()
+    gen, item = play_until(game, decisions, seed=decisions + 1)
+    before = game.snapshot()
+
+    clone = game.fork()
+    clone_gen, clone_item = resume(clone)
+    assert clone_item.seat == item.seat
+    assert clone_item.legal_actions == item.legal_actions
+    expected = finish(clone_gen, clone_item, seed=5)
+    assert game.snapshot() == before
+
+    assert finish(gen, item, seed=5) == expected
+
+def test_fork_state_observer_is_rebound():
+    """测试复制出的玩家状态变化只更新复制出的状态机"""
+    game = Game()
+    play_until(game, 5, seed=2)
+    clone = game.fork()
+    before = game.players[1].state
+    player = clone.players[1]
+    player.state = PlayerState.WAITING_PON
+    assert any(p is player for p in clone.controller.machine.responders)
+    assert all(p is not player for p in game.controller.machine.responders)
+    assert game.players[1].state == before
@@ -0,0 +1,101 @@
+import random
+import pytest
+from src.core.game import Game
+from src.core.game.driver import Action, ActionType, DecisionRequest, GameEvent, GameDriver, play_round
+from src.core.game.state import GameState, TurnPhase
+from src.core.player.state import PlayerState
+from src.core.tile import Tile, TileSuit
+
+def _run(game, policy):
+    """驱动对局直到结束,返回(事件列表, 决策次数, 结果)"""
+    events = []
+    decisions = 0
+    gen = game.play()
+    item = next(gen)
+    try:
+        while True:
+            if isinstance(item, DecisionRequest):
+                decisions += 1
+                item = gen.send(policy(item))
+            else:
+                events.append(item)
+                item = gen.send(None)
+    except StopIteration as stop:
+        return events, decisions, stop.value
+
+def test_play_full_round():
+    """测试生成器驱动完整一局"""
+    random.seed(3)
+    rng = random.Random(4)
+    game = Game()
+    events, decisions, result = _run(game, lambda req: rng.choice(req.legal_actions))
+
+    assert game.get_state() == GameState.FINISHED
+    assert decisions > 0
+    assert events[-1].name == "round_end"
+    assert set(result) == {p.name for p in game.players}
+    assert any(e.name == "draw" for e in events)
+    assert any(e.name == "discard" for e in events)
+
+def test_play_round_matches_driver_loop():
+    """测试 play_round 与手动驱动的随机对局结果相同,策略返回 None 时采用第一个合法操作"""
+    random.seed(3)
+    rng = random.Random(4)
+    _, _, expected = _run(Game(), lambda req: rng.choice(req.legal_actions))
+    random.seed(3)
+    assert play_round(Game(), rng=random.Random(4)) == expected
+    random.seed(5)
+    _, _, expected = _run(Game(), lambda req: None)
+    random.seed(5)
+    assert play_round(Game(), lambda req: None) == expected
+
+def test_decision_request_contents():
+    """测试决策请求内容"""
+    random.seed(5)
+    game = Game()
+    gen = game.play()
+    item = next(gen)
+    while not isinstance(item, DecisionRequest):
+        assert isinstance(item, GameEvent)
+        item = next(gen)
+
+    assert item.phase == TurnPhase.DISCARD
+    assert item.player is game.table.get_current_player()
+    assert len(item.observation['hand']) == 14
+    assert all(a.type in (ActionType.DISCARD, ActionType.RIICHI, ActionType.TSUMO)
+               for a in item.legal_actions)
+    gen.close()
+
+def test_illegal_action_raises():
+    """测试非法操作抛出 ValueError(指明座位与操作),而不是重复请求"""
+    random.seed(6)
+    game = Game()
+    gen = game.play()
+    item = next(gen)
+    while not isinstance(item, DecisionRequest):
+        item = next(gen)
+
+    with pytest.raises(ValueError, match=f"座位{item.seat}.*tile_index=99"):
+        gen.send(Action(ActionType.DISCARD, 99))
+    with pytest.raises(ValueError):
+        play_round(Game(), lambda request: Action(ActionType.PASS, 5))
+
+def test_response_actions():
+    """测试响应阶段的合法操作"""
+    game = Game()
+    game.initialize()
+    driver = GameDriver(game)
+
+    player = game.players[1]
+    player.hand.tiles = [Tile(TileSuit.MAN, 2), Tile(TileSuit.MAN, 3), Tile(TileSuit.MAN, 5),
+                         Tile(TileSuit.MAN, 5)]
+    player.set_state(PlayerState.WAITING_CHI)
+    actions = driver.response_actions(player, Tile(TileSuit.MAN, 4))
+    chi = [a for a in actions if a.type == ActionType.CHI]
+    assert len(chi) == 2
+    assert actions[-1].type == ActionType.PASS
+
+    player.set_state(PlayerState.WAITING_PON)
+    actions = driver.response_actions(player, Tile(TileSuit.MAN, 5))
+    assert actions[0].type == ActionType.PON
+    assert len(actions[0].tiles) == 3
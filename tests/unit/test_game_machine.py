@@ -0,0 +1,93 @@
+import random
+from src.core.game import Game
+from src.core.game.flow import GameFlow
+from src.core.game.machine import GameStateMachine, TRANSITIONS
+from src.core.game.state import GameState, TurnPhase, ActionPriority
+from src.core.player import Player
+from src.core.player.state import PlayerState
+
+def _setup_game():
+    game = Game()
+    for i in range(4):
+        game.table.add_player(Player(f"Player_{i}"))
+    return game
+
+def test_transition_table():
+    """测试阶段转换表"""
+    machine = GameStateMachine()
+    assert machine.phase == TurnPhase.IDLE
+
+    # 不合法的事件不改变阶段
+    assert machine.fire('discard') is False
+    assert machine.phase == TurnPhase.IDLE
+
+    assert machine.fire('deal') is True
+    assert machine.phase == TurnPhase.DISCARD
+    assert machine.fire('discard') is True
+    assert machine.phase == TurnPhase.RESPONSE
+    assert machine.fire('pass') is True
+    assert machine.fire('next') is True
+    assert machine.phase == TurnPhase.DRAW
+    assert all(isinstance(phase, TurnPhase) for phase in TRANSITIONS.values())
+
+def test_leaving_playing_resets_phase():
+    """测试离开PLAYING状态时阶段回到IDLE"""
+    machine = GameStateMachine()
+    machine.state = GameState.PLAYING
+    machine.fire('deal')
+    machine.state = GameState.FINISHED
+    assert machine.phase == TurnPhase.IDLE
+
+def test_responder_tracking():
+    """测试等待响应玩家的增量跟踪"""
+    game = _setup_game()
+    machine = game.controller.machine
+    players = game.table.players
+
+    assert not machine.has_responders
+    players[1].set_state(PlayerState.WAITING_PON)
+    players[2].state = PlayerState.WAITING_RON
+    assert set(machine.responders) == {players[1], players[2]}
+    assert machine.current_priority == ActionPriority.RON
+
+    players[2].set_state(PlayerState.WAITING)
+    assert machine.current_priority == ActionPriority.PON
+    players[1].set_state(PlayerState.THINKING)
+    assert machine.current_priority == ActionPriority.NONE
+    assert not machine.has_responders
+
+def test_controller_and_flow_share_state():
+    """测试控制器与流程共享状态"""
+    game = _setup_game()
+    flow = GameFlow(game)
+
+    game.set_state(GameState.PLAYING)
+    assert game.controller.state == GameState.PLAYING
+    assert flow.machine is game.controller.machine
+
+    flow.first_turn = False
+    assert game.flow.first_turn is False
+
+def test_step_through_turns():
+    """测试逐步推进回合"""
+    random.seed(0)
+    game = _setup_game()
+    flow = game.flow
+    flow.start_dealing()
+    game.set_state(GameState.PLAYING)
+    flow.machine.fire('deal')
+    assert flow.machine.phase == TurnPhase.DISCARD
+
+    # DISCARD阶段需要玩家决策
+    assert flow.step() is False
+
+    first = game.table.get_current_player()
+    for _ in range(4):
+        player = game.table.get_current_player()
+        flow.process_discard(player, 0)
+        flow._clear_waiting_players()
+        while flow.machine.phase != TurnPhase.DISCARD:
+            assert flow.step() is True
+    assert game.table.get_current_player() == first
+    assert flow.first_turn is False
+    assert flow.first_draw is False
@@ -0,0 +1,79 @@
+import asyncio
+import random
+import pytest
+from src.core.game import Game
+from src.core.game.driver import ActionType, DecisionRequest
+from src.core.game.state import GameState
+from src.server.host import TableHost, LocalClient, PlayerClient, timeout_action
+
+class StallingClient(PlayerClient):
+    """第一次决策时超时,之后立即返回"""
+    def __init__(self):
+        self.calls = 0
+
+    async def decide(self, request):
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(1)
+        return None
+
+def test_many_tables_share_one_loop():
+    """测试多桌共享事件循环"""
+    random.seed(7)
+    rng = random.Random(8)
+    policy = lambda req: rng.choice(req.legal_actions)
+    host = TableHost(think_time=1.0, response_time=1.0)
+    tables = [(Game(), [LocalClient(policy) for _ in range(4)]) for _ in range(8)]
+
+    results = asyncio.run(host.run(tables))
+
+    assert len(results) == 8
+    assert all(game.get_state() == GameState.FINISHED for game, _ in tables)
+    assert host.stats.tables_finished == 8
+    assert host.stats.active_tables == 0
+    assert host.stats.decisions > 0
+    assert host.stats.timeouts == 0
+
+def test_timeout_uses_default_action():
+    """测试超时自动操作"""
+    random.seed(9)
+    host = TableHost(think_time=0.01, response_time=0.01)
+    clients = [StallingClient() for _ in range(4)]
+    game = Game()
+
+    asyncio.run(host.run([(game, clients)]))
+
+    assert host.stats.timeouts >= 1
+    assert game.get_state() == GameState.FINISHED
+
+def test_timeout_action_is_tsumogiri():
+    """测试超时默认摸切"""
+    random.seed(10)
+    gen = Game().play()
+    item = next(gen)
+    while not isinstance(item, DecisionRequest):
+        item = next(gen)
+    action = timeout_action(item)
+    assert action.type == ActionType.DISCARD
+    assert item.observation['hand'][action.tile_index] == item.observation['drawn']
+    gen.close()
+
+def test_mean_latency_excludes_sync_decisions():
+    """测试同步决策单独计数,平均等待耗时只按经过等待的决策计算"""
+    random.seed(11)
+    host = TableHost(think_time=1.0, response_time=1.0)
+    clients = [LocalClient()] * 3 + [LocalClient(delay=0.001)]
+
+    asyncio.run(host.run([(Game(), clients)]))
+
+    stats = host.stats
+    waited = stats.decisions - stats.sync_decisions
+    assert stats.sync_decisions > 0 and waited > 0
+    assert len(stats.latency_samples) == waited
+    assert stats.mean_latency == stats.total_latency / waited >= 0.001
+    assert stats.collect()['sync_decisions_total'] == stats.sync_decisions
+
+def test_player_client_is_abstract():
+    """测试客户端接口必须实现 decide"""
+    with pytest.raises(TypeError):
+        PlayerClient()
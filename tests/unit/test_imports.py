@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HEAVY = ('mahjong', 'pygame', 'numpy', 'http.server', 'cProfile', 'tracemalloc')
+IMPORT_BUDGET = 0.5  # 导入引擎并创建对局的时间上限(秒),实测约0.1秒
+
+def _spawn(code, cwd):
+    """在新的解释器中执行代码,返回其输出的 JSON"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop('MAHJONG_PROFILE', None)
+    output = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, check=True,
+                            capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+def test_game_import_is_light(tmp_path):
+    """测试导入引擎并创建对局时不导入 mahjong 等重量级依赖,也不创建文件"""
+    loaded = _spawn(
+        "import json, sys\n"
+        "from src.core.game import Game\n"
+        "Game()\n"
+        f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))\n", str(tmp_path))
+    assert loaded == []
+    assert list(tmp_path.iterdir()) == []
+
+def test_mahjong_loaded_on_first_use(tmp_path):
+    """测试首次计算向听数与判定役种时才导入 mahjong"""
+    loaded = _spawn(
+        "import json, sys\n"
+        "from src.core.hand import Hand\n"
+        "from src.core.tile import Tile, TileSuit\n"
+        "hand = Hand()\n"
+        "before = 'mahjong' in sys.modules\n"
+        "for value in (1, 2, 3, 4, 5, 6, 7, 8, 9, 1, 2, 3, 4):\n"
+        "    hand.add_tile(Tile(TileSuit.MAN, value))\n"
+        "hand.get_shanten()\n"
+        "print(json.dumps([before, 'mahjong.shanten' in sys.modules, Hand.shanten is hand.shanten]))\n",
+        str(tmp_path))
+    assert loaded == [False, True, True]
+
+def test_lazy_exports():
+    """测试包的按需导出: 首次访问时导入,之后写入包的命名空间"""
+    loaded = _spawn(
+        "import json, sys\n"
+        "import src.core.metrics as metrics\n"
+        "before = 'src.core.metrics.prometheus' in sys.modules\n"
+        "render = metrics.render\n"
+        "print(json.dumps([before, 'src.core.metrics.prometheus' in sys.modules,\n"
+        "                  'render' in vars(metrics), 'MetricsExporter' in dir(metrics)]))\n", ROOT)
+    assert loaded == [False, True, True, True]
+    import src.core.profiling as profiling
+    assert profiling.leak_check.__module__ == 'src.core.profiling.memory'
+
+def test_import_budget(tmp_path):
+    """测试新进程导入引擎并创建对局的耗时在预算之内"""
+    elapsed = _spawn(
+        "import json, time\n"
+        "start = time.perf_counter()\n"
+        "from src.core.game import Game\n"
+        "Game()\n"
+        "print(json.dumps(time.perf_counter() - start))\n", str(tmp_path))
+    assert elapsed < IMPORT_BUDGET
+
+def test_client_entry_point_without_warning():
+    """测试压测入口作为 __main__ 运行时,包的 __init__ 未预先导入客户端模块"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, '-W', 'error::RuntimeWarning', '-m', 'src.server.client', '--help'],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    assert output.returncode == 0, output.stderr
+    assert 'RuntimeWarning' not in output.stderr
+    from src.server import GameClient
+    assert GameClient.__module__ == 'src.server.client'
@@ -0,0 +1,41 @@
+import logging
+import pytest
+from src.core.utils import logger as log_config
+from src.core.utils.logger import configure_logging, set_level, setup_logger, shutdown_logging
+
+@pytest.fixture
+def log_dir(tmp_path):
+    yield tmp_path
+    configure_logging()  # 恢复默认配置
+
+def test_debug_disabled_by_default(log_dir, monkeypatch):
+    """测试默认级别为 INFO,调试日志不会被格式化"""
+    monkeypatch.delenv(log_config.LEVEL_ENV, raising=False)
+    configure_logging(log_dir=str(log_dir), console=False)
+    logger = setup_logger("tests.logger.default")
+    assert not logger.isEnabledFor(logging.DEBUG)
+
+    class Expensive:
+        def __str__(self):
+            raise AssertionError("不应被格式化")
+
+    logger.debug("value: %s", Expensive())
+    monkeypatch.setenv(log_config.LEVEL_ENV, "debug")
+    set_level(None)
+    assert logger.isEnabledFor(logging.DEBUG)
+
+def test_records_written_by_listener(log_dir):
+    """测试日志经队列由后台线程写入文件,并按大小轮转"""
+    configure_logging(level="DEBUG", log_dir=str(log_dir), max_bytes=2000, backup_count=2, console=False)
+    logger = setup_logger("tests.logger.rotate")
+    for i in range(100):
+        logger.debug("第%d条调试日志", i)
+    shutdown_logging()
+    files = sorted(p.name for p in log_dir.iterdir())
+    assert files == [log_config.LOG_FILE, log_config.LOG_FILE + ".1", log_config.LOG_FILE + ".2"]
+    assert "第99条调试日志" in (log_dir / log_config.LOG_FILE).read_text(encoding="utf-8")
+
+def test_unknown_level(log_dir):
+    """测试未知的级别名称报错"""
+    with pytest.raises(ValueError):
+        set_level("LOUD")
@@ -0,0 +1,77 @@
+import os
+import random
+import tracemalloc
+import pytest
+from src.core.game import Game, play_round
+from src.core.hand import Hand
+from src.core.profiling import LeakCheck, allocations, census, game_census, leak_check
+from src.core.profiling.memory import _module_name, format_census
+from src.core.wall import Wall
+
+def test_allocations_by_module():
+    """测试按模块汇总新增内存,结束后恢复 tracemalloc 状态"""
+    game, report = allocations(Game, label="创建对局")
+    assert isinstance(game, Game)
+    assert report.size > 0 and report.count > 0
+    assert any(name.startswith('src.core.') for name in report.modules)
+    assert sum(stats.size for stats in report.modules.values()) == report.size
+    assert "创建对局" in report.format()
+    assert not tracemalloc.is_tracing()
+
+def test_module_name():
+    """测试源文件路径转换为模块名"""
+    path = os.path.join(os.getcwd(), 'src', 'core', 'hand', 'hand.py')
+    assert _module_name(path) == 'src.core.hand.hand'
+    assert _module_name('<frozen abc>') == '<frozen abc>'
+
+def test_game_census():
+    """测试单个对局的对象统计"""
+    game = Game()
+    play_round(game, rng=random.Random(1))
+    stats = game_census(game)
+    assert stats['Player'].count == 4 and stats['Hand'].count == 4
+    assert stats['Tile'].count == 136
+    assert 'Shanten' not in stats  # 各手牌共用类属性上的实例
+    assert stats['River.tiles'].count == 4
+    text = format_census(stats)
+    assert text.splitlines()[1].startswith("(合计)") and "Player.discards" in text
+
+def test_census_skips_shared_objects():
+    """测试 census 不进入排除的对象与类、模块"""
+    shared = [1.5, 2.5]
+    stats = census({'a': [shared, 'x'], 'b': Game}, exclude=[shared])
+    assert stats['dict'].count == 1 and stats['list'].count == 1
+    assert 'float' not in stats and 'type' not in stats
+
+def test_shared_tiles_and_shanten():
+    """测试牌山共用牌对象,手牌共用向听计算器"""
+    first, second = Wall(), Wall()
+    assert {id(t) for t in first.order} == {id(t) for t in second.order}
+    assert len({id(t) for t in first.order}) == 136
+    assert Hand().shanten is Hand().shanten
+
+def test_leak_check():
+    """测试连续对局后内存稳定"""
+    result = leak_check(hands=12, warmup=4, seed=2)
+    assert len(result.samples) == 12
+    result.check()
+    assert not tracemalloc.is_tracing()
+
+def test_leak_check_keeps_global_random_state():
+    """测试 leak_check 用种子决定牌山,不重置全局随机状态"""
+    game = Game()
+    state = random.getstate()
+    leak_check(hands=2, warmup=0, seed=3, game=game)
+    first = list(game.table.wall.order)
+    assert random.getstate() == state
+    assert game.wall_order is None
+    leak_check(hands=2, warmup=0, seed=3, game=game)
+    assert game.table.wall.order == first
+
+def test_leak_check_detects_growth():
+    """测试内存持续增长时 check() 报错"""
+    growing = LeakCheck([1000 * i for i in range(10)], warmup=2, tolerance=500)
+    assert growing.growth_per_hand == pytest.approx(1000)
+    with pytest.raises(AssertionError):
+        growing.check()
+    assert LeakCheck([5000, 100, 100, 100], warmup=1, tolerance=0).steady
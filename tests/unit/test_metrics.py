@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+import pytest
+from src.core import metrics
+from src.core.game import Game
+from src.core.hand.hand import Hand
+from src.core.metrics import Histogram, MetricsRegistry, MetricsSnapshot
+from src.core.metrics.registry import BUCKETS, bucket_bounds, bucket_index
+from tests.conftest import play_random
+
+def test_bucket_precision():
+    """测试分桶连续覆盖所有值,相对误差不超过1/32"""
+    previous_high = -1
+    for index in range(BUCKETS):
+        low, high = bucket_bounds(index)
+        assert low == previous_high + 1
+        assert (high - low) <= max(0, low) / 32
+        previous_high = high
+    for value in (0, 1, 63, 64, 65, 127, 128, 1000, 123456789):
+        low, high = bucket_bounds(bucket_index(value))
+        assert low <= value <= high
+
+def test_histogram_percentile_and_merge():
+    """测试分位数与合并"""
+    a, b = Histogram(), Histogram()
+    for value in range(1, 1001):
+        (a if value % 2 else b).record(value * 1000)
+    merged = a.copy().merge(b)
+    assert merged.count == 1000
+    assert (merged.min, merged.max) == (1000, 1000000)
+    assert merged.percentile(50) == pytest.approx(500000, rel=1 / 32)
+    assert merged.percentile(99) == pytest.approx(990000, rel=1 / 32)
+    assert merged.percentile(100) == 1000000
+    assert a.count == 500
+
+def test_threads_and_processes_merge():
+    """测试多线程写入合并正确,快照可序列化后跨进程合并"""
+    registry = MetricsRegistry()
+
+    def work():
+        for i in range(1000):
+            registry.count("calls")
+            registry.observe("latency", i)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    snapshot = registry.snapshot()
+    assert snapshot.counters["calls"] == 4000
+    assert snapshot.histograms["latency"].count == 4000
+
+    other = MetricsSnapshot.from_dict(json.loads(json.dumps(snapshot.to_dict())))
+    total = MetricsSnapshot().merge(snapshot).merge(other)
+    assert total.counters["calls"] == 8000
+    assert total.histograms["latency"].percentile(50) == snapshot.histograms["latency"].percentile(50)
+    registry.reset()
+    assert registry.snapshot().counters == {}
+
+def test_enable_records_hot_paths():
+    """测试开启后记录引擎热点路径,关闭后恢复原方法"""
+    original = Hand.__dict__['check_win']
+    registry = MetricsRegistry()
+    metrics.enable(registry)
+    try:
+        assert metrics.enabled()
+        game = Game()
+        play_random(game, seed=1)
+        stats = registry.snapshot()
+    finally:
+        metrics.disable()
+    assert not metrics.enabled()
+    assert Hand.__dict__['check_win'] is original
+    for name in ('hand.agari', 'hand.shanten', 'wall.draw', 'flow.check_ron',
+                 'flow.check_response', 'flow.turn'):
+        assert stats.histograms[name].count > 0, name
+    assert stats.histograms['wall.draw'].count >= stats.histograms['flow.turn'].count
+
+    before = registry.snapshot().histograms['wall.draw'].count
+    play_random(Game(), seed=2)
+    assert registry.snapshot().histograms['wall.draw'].count == before
+
+def test_turn_excludes_decision_wait():
+    """测试回合耗时只累计引擎入口: 等待决策与局间的时间不计入,每个回合记录一次"""
+    registry = MetricsRegistry()
+    metrics.enable(registry)
+    try:
+        game = Game()
+        turns = []
+        start_turn = game.flow.start_turn
+
+        def counted(player):
+            turns.append(player)
+            return start_turn(player)
+        game.flow.start_turn = counted
+        decisions = []
+
+        def wait(request):  # 每10个决策等待一次
+            decisions.append(request)
+            if len(decisions) % 10 == 0:
+                time.sleep(0.05)
+        play_random(game, seed=3, on_decision=wait)
+        time.sleep(0.05)
+        play_random(game, seed=4, on_decision=wait)
+        stats = registry.snapshot()
+    finally:
+        metrics.disable()
+    turn = stats.histograms['flow.turn']
+    assert turn.count == len(turns) > 0
+    assert len(decisions) >= 10
+    assert turn.max < 50_000_000
+
+def test_game_stats_uses_default_registry():
+    """测试 Game.stats() 返回默认注册表的快照"""
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    try:
+        game = Game()
+        play_random(game, seed=4)
+    finally:
+        metrics.disable()
+    assert game.stats().histograms['wall.draw'].count > 0
+    metrics.REGISTRY.reset()
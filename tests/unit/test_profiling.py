@@ -0,0 +1,134 @@
+import os
+import pstats
+import pytest
+from src.core import profiling
+from src.core.game import Game
+from src.core.profiling import Profiler, collapse_samples, collapse_stats, read_collapsed
+from src.core.profiling.collapse import samples_to_stats
+from tests.conftest import play_random
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return read_collapsed(f)
+
+def test_profiled_game_matches_unprofiled(tmp_path):
+    """测试剖析不改变对局结果,每局写出 pstats 与折叠调用栈"""
+    profiler = Profiler(str(tmp_path))
+    game = Game()
+    assert profiler.attach(game, 5)
+    result = play_random(game, seed=3)
+    assert play_random(Game(), seed=3) == result
+    assert len(profiler.written) == 1
+    stats_path, collapsed_path = profiler.written[0]
+    assert os.path.basename(stats_path).endswith('-table5-0000.pstats')
+    stats = pstats.Stats(stats_path)
+    assert any(name == 'step' for _, _, name in stats.stats)
+    stacks = _read(collapsed_path)
+    assert stacks and all(value > 0 for value in stacks.values())
+    assert any(stack.startswith('step (flow.py:') for stack in stacks)
+
+def test_games_per_dump(tmp_path):
+    """测试每 games 局写出一组文件,close() 写出剩余数据"""
+    profiler = Profiler(str(tmp_path), games=2)
+    game = Game()
+    profiler.attach(game, 1)
+    for seed in range(3):
+        play_random(game, seed)
+    assert len(profiler.written) == 1
+    profiler.close()
+    assert len(profiler.written) == 2
+    assert profiler.written[1][0].endswith('-table1-0001.pstats')
+    profiler.close()
+    assert len(profiler.written) == 2
+
+def test_games_across_game_objects(tmp_path):
+    """测试同一牌桌编号的多个 Game 共用句柄,局数跨对局累计"""
+    profiler = Profiler(str(tmp_path), games=3)
+    for seed in range(6):
+        game = Game()
+        profiler.attach(game, 1)
+        assert game.profiling is profiler.table(1)
+        play_random(game, seed)
+        assert len(profiler.written) == (seed + 1) // 3
+    assert [os.path.basename(paths[0]) for paths in profiler.written] == \
+        [f'{os.getpid()}-table1-0000.pstats', f'{os.getpid()}-table1-0001.pstats']
+    assert not profiler._open
+    profiler.close()
+    assert len(profiler.written) == 2
+
+def test_release(tmp_path):
+    """测试释放牌桌时写出未凑满局数的数据并丢弃句柄"""
+    profiler = Profiler(str(tmp_path), games=5)
+    game = Game()
+    profiler.attach(game, 7)
+    play_random(game, 0)
+    assert profiler.release(7)[0].endswith('-table7-0000.pstats')
+    assert profiler.release(7) is None
+    assert profiler.table(7) is not game.profiling
+
+def test_table_selection():
+    """测试只剖析指定的牌桌,复制的对局不带剖析句柄"""
+    profiler = Profiler(tables=[2])
+    game = Game()
+    assert not profiler.attach(game, 1)
+    assert game.profiling is None
+    assert profiler.attach(game, 2)
+    assert game.fork().profiling is None
+    with pytest.raises(ValueError):
+        Profiler(mode='perf')
+
+def test_sample_mode(tmp_path):
+    """测试采样模式: 调用栈截取到引擎入口,文件可被 pstats 读取"""
+    profiler = Profiler(str(tmp_path), mode='sample', interval=0.0005)
+    game = Game()
+    profiler.attach(game, 3)
+    handle = game.profiling
+    handle.wrap(lambda: handle._session.sample())()  # 在入口内同步采样一次
+    play_random(game, seed=1)
+    stats_path, collapsed_path = profiler.written[0]
+    stacks = _read(collapsed_path)
+    assert sum(stacks.values()) >= 1
+    assert any(stack.startswith('<lambda> (test_profiling.py:') for stack in stacks)
+    assert not any('test_sample_mode' in stack for stack in stacks)
+    pstats.Stats(stats_path)
+
+def test_collapse_samples():
+    """测试采样调用栈的折叠与 pstats 统计"""
+    a, b, c = ('x.py', 1, 'a'), ('x.py', 5, 'b'), ('~', 0, "<built-in method len>")
+    stacks = {(a, b): 3, (a, b, c): 2, (a,): 1}
+    assert collapse_samples(stacks) == {'a (x.py:1);b (x.py:5)': 3,
+                                        'a (x.py:1);b (x.py:5);<built-in method len>': 2,
+                                        'a (x.py:1)': 1}
+    stats = samples_to_stats(stacks, 0.01)
+    assert stats[a][2:4] == pytest.approx((0.01, 0.06))
+    assert stats[b][2:4] == pytest.approx((0.03, 0.05))
+    assert stats[b][4][a] == pytest.approx((5, 5, 0.03, 0.05))
+
+def test_collapse_stats():
+    """测试由调用关系按耗时比例展开调用栈"""
+    a, b, c = ('x.py', 1, 'a'), ('x.py', 5, 'b'), ('y.py', 9, 'c')
+    stats = {
+        a: (1, 1, 0.001, 0.010, {}),
+        b: (2, 2, 0.002, 0.006, {a: (2, 2, 0.002, 0.006)}),
+        c: (4, 4, 0.006, 0.006, {a: (1, 1, 0.002, 0.002), b: (3, 3, 0.004, 0.004)}),
+    }
+    stacks = collapse_stats(stats)
+    assert stacks == {'a (x.py:1)': 1000, 'a (x.py:1);b (x.py:5)': 2000,
+                      'a (x.py:1);b (x.py:5);c (y.py:9)': 4000, 'a (x.py:1);c (y.py:9)': 2000}
+
+def test_environment(monkeypatch, tmp_path):
+    """测试通过环境变量开启剖析"""
+    monkeypatch.setattr(profiling.profiler, '_environment_read', False)
+    monkeypatch.setattr(profiling.profiler, '_environment', None)
+    monkeypatch.setenv('MAHJONG_PROFILE', 'sample')
+    monkeypatch.setenv('MAHJONG_PROFILE_DIR', str(tmp_path))
+    monkeypatch.setenv('MAHJONG_PROFILE_GAMES', '3')
+    profiler = profiling.from_environment()
+    assert profiler.mode == 'sample' and profiler.games == 3 and profiler.directory == str(tmp_path)
+    assert profiling.from_environment() is profiler
+    assert Game().profiling is not None and Game().profiling is profiler.table()
+    monkeypatch.setattr(profiling.profiler, '_environment_read', False)
+    monkeypatch.setattr(profiling.profiler, '_environment', None)
+    monkeypatch.delenv('MAHJONG_PROFILE')
+    assert profiling.from_environment() is None
+    assert Game().profiling is None
@@ -0,0 +1,93 @@
+import os
+import urllib.request
+from src.core.metrics import Histogram, MetricsExporter, MetricsRegistry, render
+from src.core.metrics.prometheus import CONTENT_TYPE, metric_name
+from src.server.host import HostStats
+from src.server.server import GameServer
+
+def _registry():
+    registry = MetricsRegistry()
+    registry.count('wall.exhausted', 3)
+    for value in (500, 2000, 40000):
+        registry.observe('hand.agari', value)
+    return registry
+
+def test_metric_name():
+    """测试指标名中的非法字符被替换"""
+    assert metric_name('mahjong', 'hand.agari') == 'mahjong_hand_agari'
+    assert metric_name('', 'a-b') == 'a_b'
+
+def test_render_format():
+    """测试计数器、仪表与直方图的文本格式"""
+    text = render(_registry().snapshot(), {'active_tables': 2, 'decisions_total': 7})
+    lines = text.splitlines()
+    assert '# TYPE mahjong_wall_exhausted_total counter' in lines
+    assert 'mahjong_wall_exhausted_total 3' in lines
+    assert '# TYPE mahjong_active_tables gauge' in lines
+    assert '# TYPE mahjong_decisions_total counter' in lines
+    assert '# TYPE mahjong_hand_agari_seconds histogram' in lines
+    assert 'mahjong_hand_agari_seconds_bucket{le="1e-06"} 1' in lines
+    assert 'mahjong_hand_agari_seconds_bucket{le="2.5e-06"} 2' in lines
+    assert 'mahjong_hand_agari_seconds_bucket{le="5e-05"} 3' in lines
+    assert 'mahjong_hand_agari_seconds_bucket{le="+Inf"} 3' in lines
+    assert 'mahjong_hand_agari_seconds_count 3' in lines
+    assert text.endswith('\n')
+
+def test_render_collected_histogram():
+    """测试采集函数给出的直方图"""
+    stats = HostStats()
+    stats.latency_histogram.record(3_000_000)
+    text = render(MetricsRegistry().snapshot(), stats.collect())
+    assert 'mahjong_decision_latency_seconds_bucket{le="0.0025"} 0' in text
+    assert 'mahjong_decision_latency_seconds_bucket{le="0.005"} 1' in text
+    assert 'mahjong_tables_started_total 0' in text
+
+def test_cumulative_buckets():
+    """测试累积桶单调不减"""
+    histogram = Histogram()
+    for value in range(1, 10_000_000, 9973):
+        histogram.record(value)
+    registry = MetricsRegistry()
+    text = render(registry.snapshot(), {'x': histogram})
+    counts = [int(line.rsplit(' ', 1)[1]) for line in text.splitlines() if '_bucket' in line]
+    assert counts == sorted(counts)
+    assert counts[-1] == histogram.count
+
+def test_payload_cached():
+    """测试 max_age 内重复抓取使用缓存"""
+    calls = []
+    exporter = MetricsExporter(MetricsRegistry(), [lambda: calls.append(1) or {'x': len(calls)}], max_age=60)
+    first = exporter.payload()
+    assert exporter.payload() is first
+    assert len(calls) == 1
+    exporter.max_age = 0
+    assert exporter.payload() != first
+
+def test_write_file(tmp_path):
+    """测试写入文件"""
+    path = str(tmp_path / 'mahjong.prom')
+    MetricsExporter(_registry()).write(path)
+    with open(path, encoding='utf-8') as f:
+        assert 'mahjong_wall_exhausted_total 3' in f.read()
+    assert not os.path.exists(path + '.tmp')
+
+def test_http_scrape():
+    """测试通过 HTTP 端点抓取"""
+    server = GameServer()
+    exporter = MetricsExporter(_registry(), [server.collect])
+    port = exporter.serve(port=0)
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as response:
+            assert response.headers['Content-Type'] == CONTENT_TYPE
+            body = response.read().decode('utf-8')
+        assert 'mahjong_hand_agari_seconds_count 3' in body
+        assert 'mahjong_connections 0' in body
+        assert 'mahjong_outbound_queue_depth 0' in body
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/other', timeout=5)
+            assert False
+        except urllib.error.HTTPError as error:
+            assert error.code == 404
+    finally:
+        exporter.close()
+    assert exporter.server is None
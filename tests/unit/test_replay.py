@@ -0,0 +1,105 @@
+import io
+import random
+import pytest
+from src.core.game import Game
+from src.core.game.snapshot import snapshot
+from src.core.replay import ReplayError, ReplayReader, ReplayStep, ReplayWriter
+from src.core.replay.format import read_profile, write_profile
+from src.core.rules import STANDARD
+from tests.conftest import play_random
+
+def _record(rounds, seed, keyframe_interval=64, close=True):
+    """随机策略进行多局并写入回放,返回(回放字节, 事件列表, 每个操作前的牌河)"""
+    random.seed(seed)
+    rng = random.Random(seed + 1)
+    game = Game()
+    stream = io.BytesIO()
+    writer = ReplayWriter(stream, game, keyframe_interval)
+    events = []
+    rivers = []
+    for _ in range(rounds):
+        play_random(game, rng=rng,
+                    on_decision=lambda request: rivers.append([list(p.discards) for p in game.players]),
+                    on_event=lambda event: events.append((event.name, event.args)))
+    if close:
+        writer.close()
+    else:
+        writer.detach()  # 模拟写入中断: 没有文件末尾的索引
+    return stream.getvalue(), events, rivers
+
+def test_profile_round_trip():
+    """测试规则写入文件头后能完整还原"""
+    profile = STANDARD.variant(aka_dora=True, kazoe_limit=1, uma=(20000, 10000, -10000, -20000))
+    stream = io.BytesIO()
+    write_profile(stream, profile)
+    stream.seek(0)
+    assert read_profile(stream) == profile
+
+def test_replay_reproduces_events():
+    """测试回放重新驱动出与原对局相同的事件序列"""
+    data, events, rivers = _record(rounds=8, seed=21, keyframe_interval=0)
+    assert len(data) < 4096  # 8局在几KB以内
+
+    reader = ReplayReader.from_bytes(data)
+    replayed = []
+    steps = 0
+    for item in reader.replay():
+        if isinstance(item, ReplayStep):
+            assert item.index == steps
+            steps += 1
+        else:
+            replayed.append((item.name, item.args))
+    assert replayed == events
+    assert steps == len(rivers)
+    assert len(list(reader.rounds())) == 8
+
+def test_seek():
+    """测试跳转到任意操作之前的状态"""
+    data, _, rivers = _record(rounds=2, seed=22)
+    reader = ReplayReader.from_bytes(data)
+    for index in (0, len(rivers) // 2, len(rivers) - 1):
+        game = reader.seek(index)
+        assert [list(p.discards) for p in game.players] == rivers[index]
+    with pytest.raises(IndexError):
+        reader.seek(len(rivers))
+
+def test_seek_from_keyframes():
+    """测试从关键帧跳转的状态与从头回放一致,且只重新模拟关键帧之后的操作"""
+    data, _, rivers = _record(rounds=3, seed=24, keyframe_interval=8)
+    reader = ReplayReader.from_bytes(data)
+    entries = reader.index()
+    keyframes = [e for e in entries if e.is_keyframe]
+    assert keyframes and len(entries) == 3 + len(keyframes)
+    # 文件末尾的索引与扫描全文件的结果一致
+    unindexed = ReplayReader.from_bytes(_record(rounds=3, seed=24, keyframe_interval=8, close=False)[0])
+    assert unindexed.index() == entries
+
+    for index in range(0, len(rivers), 11):
+        expected = Game(reader.profile)
+        steps = reader.replay(expected)
+        for item in steps:
+            if isinstance(item, ReplayStep) and item.index == index:
+                break
+        steps.close()
+
+        game = Game(reader.profile)
+        simulated = []
+        game.events.on("decision", lambda *args: simulated.append(args))
+        reader.seek(index, game)
+        assert snapshot(game) == snapshot(expected)
+        assert len(simulated) < 16  # 不超过两个关键帧间隔
+
+def test_truncated_and_corrupted():
+    """测试写入中断的回放可读到中断处,损坏的回放报错"""
+    data, _, rivers = _record(rounds=1, seed=23, close=False)
+    truncated = data[:len(data) - 20]
+    steps = [i for i in ReplayReader.from_bytes(truncated).replay() if isinstance(i, ReplayStep)]
+    assert len(steps) == len(rivers) - 9  # 去掉结束标记与9条操作记录
+    assert not next(ReplayReader.from_bytes(truncated).rounds()).complete
+
+    with pytest.raises(ReplayError):
+        ReplayReader.from_bytes(b'XXXX' + data[4:])
+    corrupted = bytearray(data)
+    corrupted[-4] = 0x0F  # 把最后一条操作的座位改为非法值
+    with pytest.raises(ReplayError):
+        list(ReplayReader.from_bytes(bytes(corrupted)).replay())
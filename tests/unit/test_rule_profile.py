@@ -0,0 +1,84 @@
+import pytest
+from src.core.common.config import CONFIG_DIRS, get_config, reload_config
+from src.core.game import Game, GameConfig
+from src.core.game.score import ScoreCalculator
+from src.core.player import Player
+from src.core.rules import RuleProfile, STANDARD, default_profile
+from src.core.tile import Tile, TileSuit
+from src.core.yaku.judger import YakuJudger
+
+def _red_five_hand():
+    """含赤5筒的门清和牌"""
+    return [
+        Tile(TileSuit.MAN, 1), Tile(TileSuit.MAN, 2), Tile(TileSuit.MAN, 3),
+        Tile(TileSuit.PIN, 4), Tile(TileSuit.PIN, 5, True), Tile(TileSuit.PIN, 6),
+        Tile(TileSuit.SOU, 7), Tile(TileSuit.SOU, 8), Tile(TileSuit.SOU, 9),
+        Tile(TileSuit.MAN, 2), Tile(TileSuit.MAN, 3), Tile(TileSuit.MAN, 4),
+        Tile(TileSuit.PIN, 9), Tile(TileSuit.PIN, 9),
+    ]
+
+def test_profiles_side_by_side():
+    """测试不同规则同时判定互不影响"""
+    aka = STANDARD.variant(aka_dora=True)
+    assert aka is STANDARD.variant(aka_dora=True)  # 相同修改只编译一次
+    assert aka.options.has_aka_dora and not STANDARD.options.has_aka_dora
+
+    tiles = _red_five_hand()
+    plain = YakuJudger().judge(tiles=tiles, win_tile=tiles[-1], is_tsumo=True)
+    red = YakuJudger(aka).judge(tiles=tiles, win_tile=tiles[-1], is_tsumo=True)
+    assert red["han"] == plain["han"] + 1
+    # 显式参数优先于规则
+    assert YakuJudger().judge(tiles=tiles, win_tile=tiles[-1], is_tsumo=True,
+                              has_aka_dora=True)["han"] == red["han"]
+
+def test_hand_config_template():
+    """测试判定配置基于模板复制"""
+    config = STANDARD.hand_config(player_wind=27, is_tsumo=True)
+    assert config.is_dealer and config.is_tsumo
+    assert config.options is STANDARD.options
+    assert config.yaku is STANDARD.hand_template.yaku
+    assert not STANDARD.hand_template.is_tsumo
+
+def test_profile_payments():
+    """测试立直棒、本场和顺位点"""
+    profile = RuleProfile(riichi_cost=500, honba_value=600, uma=(20000, 10000, -10000, -20000))
+    assert profile.honba_per_payer == 200
+    calculator = ScoreCalculator(profile)
+    calculator.riichi_sticks = 2
+    calculator.honba_sticks = 1
+    scores = calculator.calculate_win_score(2000, False, False, [Player("p")])
+    assert scores['total'] == 2000 + 1000 + 600
+
+    players = []
+    for i, points in enumerate([30000, 25000, 24000, 21000]):
+        player = Player(f"Player_{i}")
+        player.points = points
+        players.append(player)
+    results = calculator.calculate_final_scores(players)
+    assert results["Player_0"] == 50000
+    assert results["Player_3"] == 1000
+
+    with pytest.raises(ValueError):
+        RuleProfile(uma=(10000, -10000))
+
+def test_game_uses_profile():
+    """测试对局各组件共享规则配置"""
+    profile = RuleProfile(riichi_cost=2000)
+    game = Game(profile)
+    assert game.controller.profile is profile
+    assert game.flow.score_calculator.profile is profile
+    assert game.flow.yaku_judger.profile is profile
+    assert GameConfig().to_profile().uradora is False
+
+def test_default_profile_follows_config(tmp_path):
+    """测试默认规则随配置重新编译"""
+    profile = default_profile()
+    assert profile is default_profile()
+    assert profile.uma == get_config().uma_values
+    assert Game().profile is profile
+    try:
+        (tmp_path / 'game.json').write_text('{"riichi_cost": 1500}', encoding='utf-8')
+        reload_config([tmp_path])
+        assert default_profile().riichi_cost == 1500
+    finally:
+        reload_config(CONFIG_DIRS)
@@ -0,0 +1,108 @@
+import asyncio
+import random
+from src.core.game.driver import PASS, DecisionRequest
+from src.core.game.state import TurnPhase
+from src.core.tile import Tile, TileSuit
+from src.server.client import GameClient, random_policy, run_load_test
+from src.server.protocol import decode_tile, encode_tile
+from src.server.server import Connection, GameServer
+
+def test_tile_codes():
+    """测试牌的字符串编码"""
+    for tile in (Tile(TileSuit.MAN, 1), Tile(TileSuit.SOU, 5, True), Tile(TileSuit.HONOR, 7)):
+        assert decode_tile(encode_tile(tile)) == tile
+    assert encode_tile(Tile(TileSuit.PIN, 5, True)) == '0p'
+
+def test_load_test_with_connection_reuse():
+    """测试多客户端连续对局"""
+    random.seed(11)
+    report = asyncio.run(run_load_test(clients=8, games=2, seed=1))
+
+    assert report.decisions > 0
+    assert report.messages > report.decisions
+    assert report.timeouts == 0
+    assert report.p99_latency >= report.p50_latency
+
+def test_message_size_limit():
+    """测试超长消息返回错误并断开"""
+    async def scenario():
+        server = GameServer(max_message_size=1024)
+        await server.start()
+        client = GameClient(port=server.port)
+        await client.connect()
+        client.writer.write(b'{"op":"join","pad":"' + b'x' * 4096 + b'"}\n')
+        error = await client.receive()
+        closed = await client.receive()
+        await client.close()
+        await server.stop()
+        return error, closed
+
+    error, closed = asyncio.run(scenario())
+    assert error["op"] == "error"
+    assert closed is None
+
+def test_unknown_op():
+    """测试未知操作返回错误但保持连接"""
+    async def scenario():
+        server = GameServer()
+        await server.start()
+        client = GameClient(port=server.port, policy=random_policy(random.Random(0)))
+        await client.connect()
+        await client.send({"op": "bogus"})
+        error = await client.receive()
+        await client.send({"op": "observe", "table": 42})
+        error2 = await client.receive()
+        await client.close()
+        await server.stop()
+        return error, error2
+
+    error, error2 = asyncio.run(scenario())
+    assert error["op"] == "error"
+    assert error2["op"] == "error"
+
+class _DeadWriter:
+    """写任务已停止的连接: 出站队列不再被读取"""
+    def __init__(self):
+        self.transport = self
+        self.aborted = False
+
+    def abort(self):
+        self.aborted = True
+
+    def close(self):
+        pass
+
+def _dead_connection(server, queue_size):
+    return Connection(server, asyncio.StreamReader(), _DeadWriter(), queue_size)
+
+def test_full_queue_disconnects_instead_of_blocking():
+    """测试出站队列满时不等待: 断开连接、丢弃积压消息并唤醒等待中的决策"""
+    request = DecisionRequest(0, None, TurnPhase.RESPONSE, [PASS])
+
+    async def scenario():
+        connection = _dead_connection(GameServer(), queue_size=2)
+        pending = asyncio.ensure_future(connection.client.decide(request))
+        await asyncio.sleep(0)
+        assert not pending.done()
+        assert connection.send({"op": "a"})
+        assert not connection.send_raw(b"b\n")  # 队列已满
+        return connection, await asyncio.wait_for(pending, 1)
+
+    connection, action = asyncio.run(scenario())
+    assert connection.closed and connection.writer.aborted
+    assert connection.queue.empty()
+    assert action is None
+    assert not connection.send({"op": "late"})
+
+def test_table_finishes_with_dead_clients():
+    """测试玩家连接的写任务停止(队列写满)时牌桌仍能结束"""
+    async def scenario():
+        server = GameServer(think_time=1.0, response_time=1.0)
+        connections = [_dead_connection(server, queue_size=8) for _ in range(4)]
+        await asyncio.wait_for(server._run_table([c.client for c in connections]), 10)
+        return server, connections
+
+    random.seed(12)
+    server, connections = asyncio.run(scenario())
+    assert all(c.closed and c.queue.empty() for c in connections)
+    assert server.tables == {} and server.table_host.stats.tables_finished == 1
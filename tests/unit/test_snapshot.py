@@ -0,0 +1,57 @@
+import pytest
+from src.core.game import Game
+from tests.conftest import finish, play_random, play_until, resume
+
+@pytest.mark.parametrize("seed", range(6))
+def test_snapshot_round_trip(seed):
+    """测试在每个决策点编码后恢复到新对局,再次编码结果一致"""
+    game = Game()
+
+    def check(request):
+        data = game.snapshot()
+        assert len(data) < 512
+        copy = Game()
+        copy.restore(data)
+        assert copy.snapshot() == data
+        assert [p.hand.tiles for p in copy.players] == [p.hand.tiles for p in game.players]
+        assert list(copy.controller.machine.responders) == \
+            [copy.players[game.players.index(p)] for p in game.controller.machine.responders]
+
+    play_random(game, seed, on_decision=check)
+
+@pytest.mark.parametrize("decisions", [0, 7, 25, 40])
+def test_restored_game_continues_identically(decisions):
+    """测试恢复后的对局与原对局以相同操作继续时结果一致"""
+    game = Game()
+    gen, item = play_until(game, decisions, seed=decisions)
+    data = game.snapshot()
+
+    copy = Game()
+    copy.restore(data)
+    copy_gen, copy_item = resume(copy)
+    assert copy_item.seat == item.seat
+    assert copy_item.legal_actions == item.legal_actions
+
+    assert finish(copy_gen, copy_item, seed=1) == finish(gen, item, seed=1)
+
+def test_restore_is_independent():
+    """测试恢复出的对局与原对局互不影响,并可在原对局上回退"""
+    game = Game()
+    gen, item = play_until(game, 10, seed=3)
+    data = game.snapshot()
+    copy = Game()
+    copy.restore(data)
+
+    finish(gen, item, seed=2)
+    assert copy.snapshot() == data
+    game.restore(data)
+    assert game.snapshot() == data
+
+def test_restore_rejects_unknown_version():
+    """测试不支持的编码版本"""
+    game = Game()
+    game.initialize()
+    data = bytearray(game.snapshot())
+    data[0] = 0xFF
+    with pytest.raises(ValueError):
+        game.restore(bytes(data))
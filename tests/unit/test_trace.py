@@ -0,0 +1,70 @@
+import io
+import pytest
+from src.core.game import Game
+from src.core.trace import LatencyHistogram, Tracer, aggregate, format_report, read_trace
+from src.core.trace.tracer import RECORD_SIZE
+from tests.conftest import play_random
+
+def test_traced_game_matches_untraced():
+    """测试追踪不改变对局结果,并记录引擎各入口的耗时"""
+    stream = io.BytesIO()
+    tracer = Tracer(stream, tables=[7])
+    traced = Game()
+    assert tracer.attach(traced, 7)
+    result = play_random(traced, seed=3)
+    tracer.close()
+    assert play_random(Game(), seed=3) == result
+
+    stream.seek(0)
+    records = list(read_trace(stream))
+    assert len(records) == tracer.records > 0
+    assert {r.table_id for r in records} == {7}
+    assert {"step", "discard_actions", "handle_discard"} <= {r.function for r in records}
+    assert all(r.payload > 0 for r in records if r.function == "discard_actions")
+
+    stream.seek(0)
+    histograms = aggregate(stream)
+    assert sum(h.count for h in histograms.values()) == len(records)
+    assert "discard_actions" in format_report(histograms)
+
+def test_table_sampling():
+    """测试按比例采样: 同一牌桌的选择稳定,比例接近设定值"""
+    tracer = Tracer(io.BytesIO(), rate=0.01)
+    picked = [table for table in range(100000) if tracer.sampled(table)]
+    assert 800 < len(picked) < 1200
+    assert all(Tracer(io.BytesIO(), rate=0.01).sampled(table) for table in picked[:50])
+    game = Game()
+    assert not tracer.attach(game, next(t for t in range(100) if not tracer.sampled(t)))
+    assert game.trace is None
+    assert Tracer(io.BytesIO(), rate=0.0).table(1) is None
+
+def test_records_and_definitions():
+    """测试记录为定长格式,函数名在首次使用时定义,分表汇总"""
+    stream = io.BytesIO()
+    tracer = Tracer(stream, buffer_records=2)
+    for table, duration in ((1, 1000), (2, 5000), (1, 3000)):
+        tracer.table(table).record("判定", duration, payload=-3)
+    tracer.table(2).record("x" * 20, 70000)
+    tracer.close()
+    assert (len(stream.getvalue()) - 8) % RECORD_SIZE == 0
+    stream.seek(0)
+    records = list(read_trace(stream))
+    assert [r.function for r in records] == ["判定"] * 3 + ["x" * 20]
+    assert records[0].payload == -3
+    stream.seek(0)
+    histogram = aggregate(stream, table_id=1)["判定"]
+    assert (histogram.count, histogram.min, histogram.max) == (2, 1000, 3000)
+
+    with pytest.raises(ValueError):
+        list(read_trace(io.BytesIO(b"NOPE" + bytes(12))))
+    with pytest.raises(ValueError):
+        list(read_trace(io.BytesIO(stream.getvalue()[:-3])))
+
+def test_histogram_percentiles():
+    """测试直方图分位数为所在桶的上界且不超过最大值"""
+    histogram = LatencyHistogram()
+    for value in range(1, 101):
+        histogram.add(value * 1000)
+    assert histogram.mean == 50500
+    assert 50000 <= histogram.percentile(50) < 2 * 50000
+    assert histogram.percentile(100) == 100000
@@ -0,0 +1,91 @@
+import json
+import random
+import pytest
+from src.core.game import Game
+from src.server.protocol import encode_value
+from tests.conftest import play_random, resume
+
+def _expected(game, seat):
+    """直接从对局状态构建的观测"""
+    table = game.table
+    player = table.players[seat]
+    return {
+        'seat': seat,
+        'hand': tuple(player.hand.tiles),
+        'melds': tuple(tuple(meld) for meld in player.hand.melds),
+        'discards': tuple(tuple(p.discards) for p in table.players),
+        'riichi': tuple(p.is_riichi for p in table.players),
+        'scores': tuple(p.points for p in table.players),
+        'dora_indicators': tuple(table.wall.dora_indicators),
+        'remaining': table.wall.remaining_count,
+        'round_wind': table.round_wind,
+        'drawn': game.flow.last_drawn_tile if table.current_player_index == seat else None,
+    }
+
+def test_hidden_information_is_masked():
+    """测试其他座位的手牌、听牌与振听不可见,只公开张数"""
+    game = Game()
+    resume(game)
+    view = game.view(1)
+    assert view.me.hand == tuple(game.players[1].hand.tiles)
+    for other in view.players:
+        if other.seat != 1:
+            assert other.hand is None
+            assert other.waiting_tiles is None
+            assert other.is_furiten is None
+            assert other.hand_size == len(game.players[other.seat].hand.tiles)
+
+    encoded = json.dumps(encode_value(view), ensure_ascii=False)
+    assert set(json.loads(encoded)) == set(_expected(game, 1))
+
+@pytest.mark.parametrize("seed", range(3))
+def test_views_track_game(seed):
+    """测试缓存的视图在对局进行中始终与实时状态一致"""
+    random.seed(seed)
+    rng = random.Random(seed)
+    game = Game()
+    views = []
+
+    def check(request):
+        assert request.observation is game.view(request.seat)
+        current = [game.view(seat) for seat in range(4)]
+        if views:
+            assert all(a is b for a, b in zip(views[-1], current))  # 一局内复用同一视图
+        views.append(current)
+        for seat, view in enumerate(current):
+            assert dict(view) == _expected(game, seat)
+
+    play_random(game, rng=rng, on_decision=check)
+
+def test_restore_invalidates_views():
+    """测试恢复状态后视图反映恢复后的手牌"""
+    random.seed(5)
+    game = Game()
+    gen, item = resume(game)
+    seat = item.seat
+    data = game.snapshot()
+    hand = game.view(seat).hand
+    discard = next(a for a in item.legal_actions if a.type.name == 'DISCARD')
+    gen.send(discard)
+    assert game.view(seat).hand != hand
+    game.restore(data)
+    assert game.view(seat).hand == hand
+    assert dict(game.view(2)) == _expected(game, 2)
+
+def test_views_track_engine_without_driver():
+    """测试不经过 GameDriver 直接修改手牌、牌河与宝牌后视图仍是最新的"""
+    random.seed(7)
+    game = Game()
+    resume(game)
+    view = game.view(0)
+    player = game.players[0]
+    before = dict(view)
+    wall = game.table.wall
+    player.hand.add_tile(wall.draw())
+    player.add_discard(player.hand.discard_tile(0))
+    player.hand.add_meld(list(player.hand.tiles[:3]))
+    wall.add_dora_indicator()
+    assert dict(view) == _expected(game, 0)
+    assert view.hand != before['hand']
+    assert len(view.discards[0]) == len(before['discards'][0]) + 1
+    assert len(view.dora_indicators) == len(before['dora_indicators']) + 1
@@ -0,0 +1,104 @@
+import random
+import pytest
+from src.core.game import Game
+from src.core.hand import Hand
+from src.core.tile import Tile, TileSuit, zobrist
+from src.core.wall.dora import DoraManager
+from tests.conftest import play_random
+
+def _tiles(text, suit=TileSuit.MAN):
+    return [Tile(suit, int(c)) for c in text]
+
+def test_keys_are_stable():
+    """测试键由固定种子生成,跨进程一致"""
+    assert zobrist.HAND[0] == 0x476e445f006e6dc3
+    assert zobrist.PHASE[7] == 0xe80d60ce71a09b50
+
+def test_hand_hash_ignores_order():
+    """测试手牌哈希与摸牌顺序无关,打出后恢复原值"""
+    tiles = _tiles("1123456789") + _tiles("55", TileSuit.PIN)
+    a, b = Hand(), Hand()
+    for tile in tiles:
+        a.add_tile(tile)
+    for tile in reversed(tiles):
+        b.add_tile(tile)
+    assert a.zobrist == b.zobrist != 0
+
+    before = a.zobrist
+    a.add_tile(Tile(TileSuit.SOU, 3))
+    assert a.zobrist != before
+    a.discard_tile(Tile(TileSuit.SOU, 3))
+    assert a.zobrist == before
+
+    removed = a.discard_tile(0)
+    assert a.remove_tile(Tile(TileSuit.PIN, 5))
+    c = Hand()
+    c.tiles = list(a.tiles)
+    c.rehash()
+    assert c.zobrist == a.zobrist
+    a.add_tile(removed)
+    assert a.zobrist != before  # 还少一张5筒
+
+def test_red_five_differs():
+    """测试赤五与普通五的哈希不同"""
+    a, b = Hand(), Hand()
+    a.add_tile(Tile(TileSuit.PIN, 5))
+    b.add_tile(Tile(TileSuit.PIN, 5, True))
+    assert a.zobrist != b.zobrist
+
+def test_meld_hash():
+    """测试副露哈希: 与牌序无关,重复的相同副露不会相互抵消"""
+    a, b = Hand(), Hand()
+    a.add_meld(_tiles("123"))
+    b.add_meld(_tiles("312"))
+    assert a.zobrist == b.zobrist != 0
+    single = a.zobrist
+    a.add_meld(_tiles("123"))
+    assert a.zobrist not in (0, single)
+
+    c = Hand()
+    c.melds = [_tiles("123"), _tiles("231")]
+    c.invalidate()
+    assert c.zobrist == a.zobrist
+
+def test_dora_hash():
+    """测试宝牌指示牌与里宝牌翻开状态计入哈希"""
+    dora = DoraManager()
+    dora.add_dora_indicator(Tile(TileSuit.HONOR, 1))
+    first = dora.zobrist
+    dora.add_dora_indicator(Tile(TileSuit.SOU, 9))
+    dora.add_uradora_indicator(Tile(TileSuit.MAN, 2))
+    dora.reveal_uradora()
+    value = dora.zobrist
+    assert len({0, first, value}) == 3
+    dora.rehash()
+    assert dora.zobrist == value
+
+@pytest.mark.parametrize("seed", range(3))
+def test_table_hash_matches_recomputed(seed):
+    """测试对局中增量维护的哈希与从头计算的结果一致"""
+    random.seed(seed)
+    rng = random.Random(seed)
+    game = Game()
+    seen = set()
+
+    def check(request):
+        copy = Game()
+        copy.restore(game.snapshot())
+        assert copy.zobrist == game.zobrist
+        assert game.fork().zobrist == game.zobrist
+        seen.add(game.zobrist)
+
+    play_random(game, rng=rng, on_decision=check)
+    assert len(seen) > 10
+
+def test_fork_hash_is_independent():
+    """测试复制出的对局修改后哈希变化,原对局不变"""
+    game = Game()
+    game.initialize()
+    value = game.zobrist
+    clone = game.fork()
+    clone.players[0].hand.discard_tile(0)
+    assert clone.zobrist != value
+    assert game.zobrist == value
+    assert {value: 1}[game.zobrist] == 1